@@ -0,0 +1,178 @@
+"""Benchmark of HTTP connection reuse by KiteConnect objects, against a local
+stand-in of the Kite quote API.
+
+Compares a new KiteConnect object per call, a shared default KiteConnect
+object and a shared create_kite() object, called from a pool of threads, and
+reports the latency and the number of connections the server accepted.
+Pass --certfile and --keyfile to serve over TLS and include the handshakes.
+
+Usage:
+  python -m benchmarks.connection_benchmark [--threads N] [--calls N]
+                                            [--certfile F --keyfile F]
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import argparse
+import concurrent.futures
+import http.server
+import json
+import ssl
+import statistics
+import threading
+import time
+
+from kiteconnect import KiteConnect
+
+from framework.connection.client import create_kite
+
+# Response of the stand-in ltp endpoint.
+_LTP_RESPONSE = json.dumps({
+  "status": "success",
+  "data": {"NSE:INFY": {"instrument_token": 408065, "last_price": 1450.5}}
+}).encode()
+
+class _StandInServer(http.server.ThreadingHTTPServer):
+  """Threading HTTP server which optionally wraps connections with TLS.
+  """
+  daemon_threads = True
+  ssl_context = None
+
+  def get_request(self):
+    sock, address = self.socket.accept()
+    if self.ssl_context is not None:
+      sock = self.ssl_context.wrap_socket(sock, server_side=True,
+                                          do_handshake_on_connect=False)
+    return sock, address
+
+class _StandInHandler(http.server.BaseHTTPRequestHandler):
+  """Keep-alive handler which answers every GET with an ltp response.
+  """
+  protocol_version = "HTTP/1.1"
+  # Send headers and body in one segment, else delayed ACKs stall keep-alive
+  # connections.
+  wbufsize = 64 * 1024
+  disable_nagle_algorithm = True
+
+  def setup(self):
+    # Handshake in the connection's own thread, not in the accept loop.
+    if isinstance(self.request, ssl.SSLSocket):
+      self.request.do_handshake()
+    super(_StandInHandler, self).setup()
+    with self.server.lock:
+      self.server.connections += 1
+
+  def do_GET(self):
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(_LTP_RESPONSE)))
+    self.end_headers()
+    self.wfile.write(_LTP_RESPONSE)
+
+  def log_message(self, format, *args):
+    pass
+
+def _start_server(certfile=None, keyfile=None):
+  """Start the stand-in server on a free local port.
+
+  Args:
+    certfile(str): TLS certificate file.
+                   Default: None (plain HTTP)
+    keyfile(str): TLS private key file.
+                  Default: None
+
+  Returns:
+    (tuple): (server, root url)
+
+  """
+  server = _StandInServer(("127.0.0.1", 0), _StandInHandler)
+  server.lock = threading.Lock()
+  server.connections = 0
+  scheme = "http"
+  if certfile:
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certfile, keyfile)
+    server.ssl_context = context
+    scheme = "https"
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server, f"{scheme}://127.0.0.1:{server.server_address[1]}"
+
+def _run_case(server, get_kite, threads, calls):
+  """Call ltp from a pool of threads and measure each call.
+
+  Args:
+    server(ThreadingHTTPServer): Stand-in server.
+    get_kite(callable): Returns the KiteConnect object for a call.
+    threads(int): Number of calling threads.
+    calls(int): Calls per thread.
+
+  Returns:
+    (tuple): (list of latencies in seconds, wall seconds, connections)
+
+  """
+  server.connections = 0
+
+  def worker():
+    latencies = []
+    for _ in range(calls):
+      start = time.perf_counter()
+      get_kite().ltp(["NSE:INFY"])
+      latencies.append(time.perf_counter() - start)
+    return latencies
+
+  start = time.perf_counter()
+  with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+    futures = [executor.submit(worker) for _ in range(threads)]
+    latencies = [latency for future in futures for latency in future.result()]
+  return latencies, time.perf_counter() - start, server.connections
+
+def main(threads, calls, certfile=None, keyfile=None):
+  """Run the benchmark and print the results of each case.
+
+  Args:
+    threads(int): Number of calling threads.
+    calls(int): Calls per thread.
+    certfile(str): TLS certificate file.
+                   Default: None (plain HTTP)
+    keyfile(str): TLS private key file.
+                  Default: None
+  """
+  server, root = _start_server(certfile, keyfile)
+
+  def new_kite(factory):
+    kite = factory(api_key="benchmark", access_token="benchmark", root=root)
+    # The stand-in certificate is self-signed.
+    kite.disable_ssl = True
+    return kite
+
+  shared_default = new_kite(KiteConnect)
+  shared_pooled = new_kite(lambda **kwargs: create_kite(pool_maxsize=threads,
+                                                        **kwargs))
+  cases = [
+    ("new KiteConnect per call", lambda: new_kite(KiteConnect)),
+    ("shared default KiteConnect", lambda: shared_default),
+    ("shared create_kite()", lambda: shared_pooled),
+  ]
+  print(f"{threads} threads x {calls} calls against {root}")
+  for name, get_kite in cases:
+    latencies, wall, connections = _run_case(server, get_kite, threads, calls)
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:<28} {len(latencies) / wall:8.0f} calls/s  "
+          f"p50 {statistics.median(latencies) * 1e3:6.2f} ms  "
+          f"p99 {p99 * 1e3:6.2f} ms  {connections:5d} connections")
+  server.shutdown()
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--threads", type=int, default=16,
+                      help="calling threads")
+  parser.add_argument("--calls", type=int, default=200,
+                      help="calls per thread")
+  parser.add_argument("--certfile", default=None,
+                      help="TLS certificate to serve over https")
+  parser.add_argument("--keyfile", default=None,
+                      help="TLS private key of the certificate")
+  args = parser.parse_args()
+  main(args.threads, args.calls, args.certfile, args.keyfile)
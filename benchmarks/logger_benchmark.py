@@ -0,0 +1,77 @@
+"""Micro-benchmark of the per-call cost of the AutoKite logging functions.
+
+Usage:
+  python -m benchmarks.logger_benchmark [--calls N]
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import argparse
+import logging
+import os
+import threading
+import timeit
+import traceback
+
+from framework.logging import logger
+from framework.logging.logger import DEBUG, INFO
+
+def _legacy_info(msg):
+  """The logging path before the fast path, for comparison: the message is
+  formatted by the caller and the caller is looked up by formatting the whole
+  stack.
+
+  Args:
+    msg (str): The message to be logged.
+  """
+  autokite_logger = logging.autokite_logger
+  if str(threading.current_thread().name) != "MainThread":
+    msg = " : ".join(["PID-" + str(os.getpid()),
+                      threading.current_thread().name, msg])
+  frame = traceback.extract_stack()[-2]
+  autokite_logger.info(msg, extra={
+    'file_line': "%s:%s" % (frame[0].split("/")[-1], frame[1]),
+    'thread_prefix': ""})
+
+def _per_call_us(stmt, calls):
+  """Time a statement and get the best per-call cost.
+
+  Args:
+    stmt(callable): Statement to time.
+    calls(int): Number of calls per repeat.
+
+  Returns:
+    (float): Microseconds per call.
+
+  """
+  return min(timeit.repeat(stmt, number=calls, repeat=5)) / calls * 1e6
+
+def main(calls):
+  """Run the benchmark and print the per-call cost of each case.
+
+  Args:
+    calls(int): Number of calls per repeat.
+  """
+  logger.configure(console_only=True, level=logging.INFO)
+  # Emit into a null stream, so only the logging overhead is measured.
+  null_stream = open(os.devnull, "w")
+  for handler in logging.autokite_logger.handlers:
+    handler.stream = null_stream
+
+  payload = {"order_id": "151220000000000", "status": "COMPLETE",
+             "tradingsymbol": "INFY", "quantity": 1, "average_price": 1450.5}
+  cases = [
+    ("DEBUG disabled, lazy args", lambda: DEBUG("Order: %s", payload)),
+    ("DEBUG disabled, f-string", lambda: DEBUG(f"Order: {payload}")),
+    ("INFO enabled, lazy args", lambda: INFO("Order: %s", payload)),
+    ("INFO enabled, legacy path", lambda: _legacy_info(f"Order: {payload}")),
+  ]
+  for name, stmt in cases:
+    print(f"{name:<28} {_per_call_us(stmt, calls):8.2f} us/call")
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--calls", type=int, default=20000,
+                      help="calls per repeat")
+  main(parser.parse_args().calls)
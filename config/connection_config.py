@@ -0,0 +1,30 @@
+"""This file contains the config of the HTTP connections to Kite APIs.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+#####################connection pool settings################################
+# Number of hosts for which connection pools are kept.
+KITE_POOL_CONNECTIONS = 4
+# Maximum keep-alive connections per host, at least the number of threads
+# calling Kite APIs concurrently.
+KITE_POOL_MAXSIZE = 16
+# Whether threads wait for a free connection when the pool is exhausted,
+# instead of opening a connection which is closed after the call.
+KITE_POOL_BLOCK = True
+#############################################################################
+
+#####################timeout settings########################################
+# Seconds to wait for a connection to be established.
+KITE_CONNECT_TIMEOUT = 3.05
+# Seconds to wait for a response once connected.
+KITE_READ_TIMEOUT = 7
+#############################################################################
+
+#####################access token settings###################################
+# Local time at which access tokens expire, the day after login.
+TOKEN_EXPIRY_TIME = "06:00"
+# Maximum seconds to wait for the redirect to the app after login.
+LOGIN_REDIRECT_TIMEOUT = 30
+#############################################################################
@@ -0,0 +1,43 @@
+"""This file contains the exchange trading calendar config.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+#####################update session timings##################################
+# Session timings (HH:MM) of a regular trading day.
+PRE_OPEN_START = "09:00"
+PRE_OPEN_END = "09:08"
+MARKET_OPEN = "09:15"
+MARKET_CLOSE = "15:30"
+#############################################################################
+
+#####################update holiday list every year##########################
+# Trading holidays (yyyy-mm-dd) falling on weekdays, as per the NSE circular
+# of 2026 trading holidays. Holidays added by later circulars must be added
+# here, the scheduler streams on every weekday not listed.
+HOLIDAYS = [
+  "2026-01-26",  # Republic Day
+  "2026-03-03",  # Holi
+  "2026-03-26",  # Shri Ram Navami
+  "2026-03-31",  # Shri Mahavir Jayanti
+  "2026-04-03",  # Good Friday
+  "2026-04-14",  # Dr. Baba Saheb Ambedkar Jayanti
+  "2026-05-01",  # Maharashtra Day
+  "2026-05-28",  # Bakri Id
+  "2026-06-26",  # Muharram
+  "2026-09-14",  # Ganesh Chaturthi
+  "2026-10-02",  # Mahatma Gandhi Jayanti
+  "2026-10-20",  # Dussehra
+  "2026-11-10",  # Diwali Balipratipada
+  "2026-11-24",  # Prakash Gurpurb Sri Guru Nanak Dev
+  "2026-12-25",  # Christmas
+]
+#############################################################################
+
+#####################update special sessions#################################
+# Special sessions (e.g. Muhurat trading, budget day) which differ from the
+# regular timings or fall on weekends/holidays: {"yyyy-mm-dd": ("HH:MM",
+# "HH:MM")} as (open, close). Special sessions have no pre-open window.
+SPECIAL_SESSIONS = {}
+#############################################################################
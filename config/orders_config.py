@@ -0,0 +1,25 @@
+"""This file contains the config of order placement.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+#####################order rate settings#####################################
+# Order APIs allow 10 requests per second.
+ORDER_RATE_LIMIT = 10
+# Maximum orders of a basket in flight at once.
+BASKET_WORKERS = 10
+#############################################################################
+
+#####################freeze quantity settings################################
+# Maximum quantity of a single F&O order per underlying, larger orders are
+# rejected by the exchange. Update as per the exchange circulars.
+FREEZE_QUANTITIES = {
+  "NIFTY": 1800,
+  "BANKNIFTY": 900,
+  "FINNIFTY": 1800,
+  "MIDCPNIFTY": 2800,
+  "SENSEX": 1000,
+  "BANKEX": 900
+}
+#############################################################################
@@ -12,4 +12,62 @@ tickers = ["ZEEL","WIPRO","VEDL","ULTRACEMCO","UPL","TITAN","TECHM","TATASTEEL",
            "HEROMOTOCO","HDFCBANK","HCLTECH","GRASIM","GAIL","EICHERMOT","DRREDDY",
            "COALINDIA","CIPLA","BRITANNIA","INFRATEL","BHARTIARTL","BPCL","BAJAJFINSV",
            "BAJFINANCE","BAJAJ-AUTO","AXISBANK","ASIANPAINT","ADANIPORTS"]
-#############################################################################
\ No newline at end of file
+#############################################################################
+
+#####################session settings#######################################
+# Whether to start streaming at start of pre-open window instead of open.
+STREAM_PRE_OPEN = False
+# Whether to decode ticks into compact Tick objects instead of dicts.
+COMPACT_TICKS = False
+#############################################################################
+
+#####################tick writer settings####################################
+# Maximum number of ticks buffered in memory before new ticks are dropped.
+TICK_QUEUE_SIZE = 100000
+# Number of buffered ticks which triggers a flush to db.
+TICK_FLUSH_BATCH_SIZE = 5000
+# Maximum seconds between two flushes to db.
+TICK_FLUSH_INTERVAL = 1.0
+#############################################################################
+
+#####################tick store settings#####################################
+# Tick storage backend, either "sqlite" or "columnar"(requires pyarrow).
+TICK_STORE_BACKEND = "sqlite"
+# Size in bytes after which a columnar segment file is rolled.
+COLUMNAR_SEGMENT_SIZE = 64 * 1024 * 1024
+#############################################################################
+
+#####################ticker sharding settings################################
+# Number of websocket connections the tokens are partitioned across.
+TICKER_SHARDS = 1
+# Whether every connection runs in its own worker process.
+TICKER_PROCESSES = False
+# Maximum tokens subscribed on one connection and connections per API key.
+TICKER_MAX_TOKENS = 3000
+TICKER_MAX_CONNECTIONS = 3
+# Maximum tick batches buffered between worker processes and the parent.
+TICKER_QUEUE_SIZE = 10000
+#############################################################################
+
+#####################shared memory fan-out settings##########################
+# Whether the streamer publishes the ticks to shared memory for local
+# strategy processes.
+SHM_FANOUT = False
+# Name of the shared-memory tick segment.
+SHM_NAME = "autokite_ticks"
+# Number of tick events kept in the shared-memory ring buffer.
+SHM_RING_SIZE = 65536
+# Attempts of a subscriber to read a tick being written before giving up, a
+# publisher which died mid-write leaves its tick locked.
+SHM_READ_RETRIES = 10000
+#############################################################################
+
+#####################gap recovery settings###################################
+# Whether the minutes missed while the ticker was disconnected are backfilled
+# from historical data.
+GAP_BACKFILL = True
+# Seconds before connecting again once the ticker gives up reconnecting,
+# doubled on every attempt up to the maximum.
+RECONNECT_BACKOFF_START = 1
+RECONNECT_BACKOFF_MAX = 60
+#############################################################################
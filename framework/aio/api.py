@@ -0,0 +1,259 @@
+"""This modules contains asyncio versions of the framework wrappers.
+
+The coroutines mirror place_mis_market_order, get_orders, get_positions,
+get_holdings, get_ltp and fetch_historical_ohlc with the same arguments,
+return values and errors, taking an AsyncKite instead of a KiteConnect
+object, so that independent calls can be fanned out with asyncio.gather:
+
+  async with AsyncKite.from_kite(kite) as akite:
+    ltp, positions, orders = await asyncio.gather(
+      get_ltp(akite, "NSE:INFY"), get_positions(akite), get_orders(akite))
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import asyncio
+import datetime as dt
+import time
+
+from kiteconnect import KiteConnect
+
+from framework.common.metrics import measure
+from framework.common.rate_limiter import is_rate_limit_error
+from framework.historical import historical_data
+from framework.logging.events import EVENT
+from framework.logging.logger import DEBUG, ERROR, INFO, WARN
+from framework.orders.orders import EXCHANGE_MAP, TRANSACTION_TYPE_MAP
+
+async def place_mis_market_order(kite, instrument, type, quantity,
+                                 exchange="NSE"):
+  """Places an intraday market order.
+
+  Args:
+    kite(AsyncKite): Asyncio Kite client.
+    instrument(str): Symbol of stock.
+    type(str): Either "buy" or "sell"
+    quantity(int): Number of shares to buy.
+    exchange(str): Market exchange("NSE", "BSE").
+                   Default: "NSE"
+
+  Returns:
+      (int): order_id if successful else -1.
+
+  """
+  # Get constants.
+  type = TRANSACTION_TYPE_MAP[type]
+  exchange = EXCHANGE_MAP[exchange]
+
+  # Place market order.
+  start = time.perf_counter()
+  try:
+    with measure("place_order"):
+      order_id = await kite.place_order(
+        KiteConnect.VARIETY_REGULAR, tradingsymbol=instrument,
+        exchange=exchange, transaction_type=type, quantity=quantity,
+        order_type=KiteConnect.ORDER_TYPE_MARKET,
+        product=KiteConnect.PRODUCT_MIS)
+  except Exception as ex:
+    # If any exception occurred, catch it and return an error response.
+    ERROR("Error while placing order for %s: %s", instrument, ex)
+    EVENT("order_failed", instrument=f"{exchange}:{instrument}",
+          latency_ms=(time.perf_counter() - start) * 1000, error=str(ex))
+    return -1
+
+  INFO("Order placed successfully: Instrument:%s:%s, Type:%s, Quantity:%s",
+       exchange, instrument, type, quantity)
+  EVENT("order_placed", instrument=f"{exchange}:{instrument}",
+        order_id=order_id, latency_ms=(time.perf_counter() - start) * 1000,
+        type=type, quantity=quantity)
+  return order_id
+
+async def get_orders(kite):
+  """get current orders.
+
+  Args:
+    kite(AsyncKite): Asyncio Kite client.
+
+  Returns:
+    (list): list of dicts with orders info.
+
+  """
+  orders = await _retry(kite.orders, "orders")
+  INFO("Got %s current orders", len(orders))
+  DEBUG("Current orders are: %s", orders)
+  return orders
+
+async def get_positions(kite):
+  """get current positions.
+
+  Args:
+    kite(AsyncKite): Asyncio Kite client.
+
+  Returns:
+    (dict): net and day positions.
+
+  """
+  positions = await _retry(kite.positions, "positions")
+  INFO("Current positions are: %s", positions)
+  return positions
+
+async def get_holdings(kite):
+  """get current holdings.
+
+  Args:
+    kite(AsyncKite): Asyncio Kite client.
+
+  Returns:
+    (list): list of dicts with holdings info.
+
+  """
+  holdings = await _retry(kite.holdings, "holdings")
+  INFO("Current holdings are: %s", holdings)
+  return holdings
+
+async def get_ltp(kite, instrument):
+  """Get last traded price for an instrument.
+
+  Args:
+    kite(AsyncKite): Asyncio Kite client.
+    instrument(str): Instrument in format "Exchange:Symbol"("NSE:INFY").
+
+  Returns:
+    (float): Last traded price.
+
+  """
+  data = await _retry(kite.ltp, "ltp", [instrument])
+  INFO("LTP for %s:%s", instrument, data[instrument]['last_price'])
+  return data[instrument]['last_price']
+
+async def fetch_historical_ohlc(kite, instrument, start_date, interval,
+                                end_date=None, use_cache=True):
+  """Fetch historical data for given instrument from start_date to present
+  date for given interval. All chunks are requested concurrently within the
+  historical data rate limit shared with the blocking fetches.
+
+  Args:
+    kite(AsyncKite): Asyncio Kite client.
+    instrument(int): instrument_token of instrument.
+    start_date(str): date in format (dd-mm-yyyy).
+    interval(str): interval between consecutive data rows.
+    end_date(str): last date in format (dd-mm-yyyy).
+                   Default: None (present date)
+    use_cache(bool): Whether to fetch only the candles missing in the on-disk
+                     cache and update it.
+                     Default: True
+
+  Returns:
+    (DataFrame): DataFrame with (time, open, high, low, close, volume) columns.
+
+  """
+  INFO("Getting historical data for %s from %s with interval %s", instrument,
+       start_date, interval)
+  from_date = dt.datetime.strptime(start_date, '%d-%m-%Y')
+  if end_date:
+    to_date = (dt.datetime.strptime(end_date, '%d-%m-%Y') +
+               dt.timedelta(days=1, seconds=-1))
+  else:
+    to_date = dt.datetime.now()
+
+  cache = historical_data._cache
+  cached = cache.load(instrument, interval) if use_cache else None
+  chunks = [chunk
+            for range_start, range_end in historical_data._missing_ranges(
+              cached, from_date, to_date)
+            for chunk in historical_data._date_chunks(range_start, range_end,
+                                                      interval)]
+  frames = await asyncio.gather(*[
+    _fetch_chunk(kite, instrument, chunk_start, chunk_end, interval)
+    for chunk_start, chunk_end in chunks])
+
+  data = historical_data._concat_candles(frames)
+  if use_cache:
+    # Persisting the cache is blocking file I/O.
+    data = await asyncio.to_thread(cache.append, instrument, interval, data,
+                                   from_date=from_date, to_date=to_date)
+  return historical_data._slice_candles(data, from_date, to_date)
+
+async def _fetch_chunk(kite, instrument, from_date, to_date, interval,
+                       tries=5, delay=0.5, max_delay=8.0):
+  """Fetch the candles of a chunk under the shared rate limiter, retrying
+  with backoff if the request is throttled.
+
+  Args:
+    kite(AsyncKite): Asyncio Kite client.
+    instrument(int): instrument_token of instrument.
+    from_date(datetime): Start of chunk.
+    to_date(datetime): End of chunk.
+    interval(str): interval between consecutive data rows.
+    tries(int): Maximum number of attempts.
+                Default: 5
+    delay(float): Seconds to wait before the first retry, doubled on every
+                  retry.
+                  Default: 0.5
+    max_delay(float): Maximum seconds to wait between attempts.
+                      Default: 8.0
+
+  Returns:
+    (list): list of candle dicts.
+
+  """
+  DEBUG("Loop start-end date:%s-%s", from_date.strftime('%d-%m-%Y'),
+        to_date.strftime('%d-%m-%Y'))
+  for attempt in range(1, tries + 1):
+    await acquire(historical_data._limiter)
+    try:
+      with measure("historical_data"):
+        return await kite.historical_data(instrument, from_date, to_date,
+                                          interval)
+    except Exception as ex:
+      if attempt == tries or not is_rate_limit_error(ex):
+        raise
+      WARN("Rate limited, retrying in %ss: %s", delay, ex)
+      await asyncio.sleep(delay)
+      delay = min(delay * 2, max_delay)
+
+async def acquire(limiter):
+  """Wait till a request is allowed by a rate limiter without blocking the
+  event loop.
+
+  Args:
+    limiter(RateLimiter): Rate limiter shared with the blocking callers.
+
+  Returns:
+    (float): Seconds waited.
+
+  """
+  waited = 0.0
+  wait = limiter.try_acquire()
+  while wait > 0:
+    await asyncio.sleep(wait)
+    waited += wait
+    wait = limiter.try_acquire()
+  return waited
+
+async def _retry(func, endpoint, *args, tries=3, delay=5):
+  """Await an API call, retrying on any error like @retry(tries=3, delay=5)
+  of the blocking wrappers.
+
+  Args:
+    func(callable): Coroutine function of AsyncKite.
+    endpoint(str): Endpoint name for the metrics.
+    tries(int): Maximum number of attempts.
+                Default: 3
+    delay(float): Seconds to wait between attempts.
+                  Default: 5
+
+  Returns:
+    Return value of func.
+
+  """
+  for attempt in range(1, tries + 1):
+    try:
+      with measure(endpoint):
+        return await func(*args)
+    except Exception as ex:
+      ERROR("Error occurred while getting %s:%s", endpoint, ex)
+      if attempt == tries:
+        raise
+      await asyncio.sleep(delay)
@@ -0,0 +1,338 @@
+"""This modules contains an asyncio-native Kite Connect client.
+
+AsyncKite speaks the same REST API as KiteConnect over an aiohttp session, so
+many calls can be in flight on one event loop. Responses are unwrapped and
+errors are raised as the same kiteconnect exceptions KiteConnect raises.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+
+import dateutil.parser
+
+try:
+  import aiohttp
+except ImportError:
+  aiohttp = None
+
+from kiteconnect import KiteConnect
+from kiteconnect import exceptions as kite_exceptions
+
+from config.connection_config import (KITE_POOL_MAXSIZE, KITE_CONNECT_TIMEOUT,
+                                      KITE_READ_TIMEOUT)
+
+class AsyncKite(object):
+  """Asyncio Kite Connect client with a keep-alive connection pool.
+
+  The aiohttp session is created on first request, inside the running event
+  loop. Use it as an async context manager or call close() when done.
+  """
+  def __init__(self, api_key, access_token=None, root=None,
+               pool_maxsize=KITE_POOL_MAXSIZE,
+               timeout=(KITE_CONNECT_TIMEOUT, KITE_READ_TIMEOUT)):
+    """Initialize AsyncKite object.
+
+    Args:
+      api_key(str): Kite app api key.
+      access_token(str): Access token of the trading session.
+                         Default: None
+      root(str): API root url.
+                 Default: None (Kite API)
+      pool_maxsize(int): Maximum keep-alive connections.
+                         Default: KITE_POOL_MAXSIZE
+      timeout(tuple): (connect, read) timeouts in seconds.
+                      Default: (KITE_CONNECT_TIMEOUT, KITE_READ_TIMEOUT)
+    """
+    if aiohttp is None:
+      raise ImportError("aiohttp is required for the asyncio Kite client, "
+                        "install it with: pip install aiohttp")
+    self.api_key = api_key
+    self.access_token = access_token
+    self.root = root or KiteConnect._default_root_uri
+    self.pool_maxsize = pool_maxsize
+    self.timeout = timeout
+    self._session = None
+
+  @classmethod
+  def from_kite(cls, kite, **kwargs):
+    """Create an AsyncKite for the trading session of a KiteConnect object.
+
+    Args:
+      kite(obj): Logged in KiteConnect object.
+      kwargs: Other arguments of AsyncKite.
+
+    Returns:
+      (AsyncKite): Asyncio client.
+
+    """
+    return cls(kite.api_key, kite.access_token, root=kite.root, **kwargs)
+
+  def set_access_token(self, access_token):
+    """Set the access token of the trading session.
+
+    Args:
+      access_token(str): Access token.
+    """
+    self.access_token = access_token
+
+  async def close(self):
+    """Close the connections of the client.
+    """
+    if self._session is not None:
+      await self._session.close()
+      self._session = None
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *exc_info):
+    await self.close()
+
+  async def profile(self):
+    """Get the user profile.
+
+    Returns:
+      (dict): User profile.
+
+    """
+    return await self._request("user.profile", "GET")
+
+  async def orders(self):
+    """Get the orders of the day.
+
+    Returns:
+      (list): list of dicts with orders info.
+
+    """
+    return await self._request("orders", "GET")
+
+  async def order_history(self, order_id):
+    """Get the status history of an order.
+
+    Args:
+      order_id(str): Order id.
+
+    Returns:
+      (list): list of dicts with order states.
+
+    """
+    return await self._request("order.info", "GET",
+                               url_args={"order_id": order_id})
+
+  async def positions(self):
+    """Get the positions.
+
+    Returns:
+      (dict): Net and day positions.
+
+    """
+    return await self._request("portfolio.positions", "GET")
+
+  async def holdings(self):
+    """Get the holdings.
+
+    Returns:
+      (list): list of dicts with holdings info.
+
+    """
+    return await self._request("portfolio.holdings", "GET")
+
+  async def ltp(self, instruments):
+    """Get last traded prices of instruments.
+
+    Args:
+      instruments(list): Instruments in format "Exchange:Symbol"("NSE:INFY").
+
+    Returns:
+      (dict): Quote data. (instrument:quote)
+
+    """
+    return await self._request("market.quote.ltp", "GET",
+                               params={"i": _as_list(instruments)})
+
+  async def ohlc(self, instruments):
+    """Get OHLC quotes of instruments.
+
+    Args:
+      instruments(list): Instruments in format "Exchange:Symbol"("NSE:INFY").
+
+    Returns:
+      (dict): Quote data. (instrument:quote)
+
+    """
+    return await self._request("market.quote.ohlc", "GET",
+                               params={"i": _as_list(instruments)})
+
+  async def quote(self, instruments):
+    """Get full quotes of instruments.
+
+    Args:
+      instruments(list): Instruments in format "Exchange:Symbol"("NSE:INFY").
+
+    Returns:
+      (dict): Quote data. (instrument:quote)
+
+    """
+    return await self._request("market.quote", "GET",
+                               params={"i": _as_list(instruments)})
+
+  async def place_order(self, variety, **params):
+    """Place an order, with the same parameters as KiteConnect.place_order.
+
+    Args:
+      variety(str): Order variety(regular, amo, co, iceberg, auction).
+      params: Order parameters, None values are left out.
+
+    Returns:
+      (str): order_id.
+
+    """
+    params = {key: value for key, value in params.items() if value is not None}
+    data = await self._request("order.place", "POST",
+                               url_args={"variety": variety}, params=params)
+    return data["order_id"]
+
+  async def cancel_order(self, variety, order_id):
+    """Cancel an order.
+
+    Args:
+      variety(str): Order variety.
+      order_id(str): Order id.
+
+    Returns:
+      (str): order_id.
+
+    """
+    data = await self._request("order.cancel", "DELETE",
+                               url_args={"variety": variety,
+                                         "order_id": order_id})
+    return data["order_id"]
+
+  async def historical_data(self, instrument_token, from_date, to_date,
+                            interval, continuous=False, oi=False):
+    """Get historical candles of an instrument.
+
+    Args:
+      instrument_token(int): instrument_token of instrument.
+      from_date(datetime): Start of the candles.
+      to_date(datetime): End of the candles.
+      interval(str): Candle interval(minute, day, 5minute etc.).
+      continuous(bool): Whether to get continuous data of futures/options.
+                        Default: False
+      oi(bool): Whether to get open interest.
+                Default: False
+
+    Returns:
+      (list): list of candle dicts, same as KiteConnect.historical_data.
+
+    """
+    data = await self._request(
+      "market.historical", "GET",
+      url_args={"instrument_token": instrument_token, "interval": interval},
+      params={"from": _date_text(from_date), "to": _date_text(to_date),
+              "interval": interval, "continuous": 1 if continuous else 0,
+              "oi": 1 if oi else 0})
+    candles = []
+    for candle in data["candles"]:
+      record = {"date": dateutil.parser.parse(candle[0]), "open": candle[1],
+                "high": candle[2], "low": candle[3], "close": candle[4],
+                "volume": candle[5]}
+      if len(candle) == 7:
+        record["oi"] = candle[6]
+      candles.append(record)
+    return candles
+
+  async def _request(self, route, method, url_args=None, params=None):
+    """Make an API request and unwrap the response.
+
+    Args:
+      route(str): Route name of KiteConnect._routes.
+      method(str): HTTP method.
+      url_args(dict): Arguments of the route url.
+                      Default: None
+      params(dict): Query parameters of GET/DELETE, form of POST/PUT.
+                    Default: None
+
+    Returns:
+      Data of the response.
+
+    """
+    uri = KiteConnect._routes[route]
+    if url_args:
+      uri = uri.format(**url_args)
+    headers = {"X-Kite-Version": KiteConnect.kite_header_version}
+    if self.api_key and self.access_token:
+      headers["Authorization"] = f"token {self.api_key}:{self.access_token}"
+
+    # Repeated keys(i=NSE:INFY&i=NSE:TCS) are sent as a list of pairs.
+    pairs = []
+    for key, value in (params or {}).items():
+      for item in (value if isinstance(value, list) else [value]):
+        pairs.append((key, str(item)))
+    query, form = (pairs, None) if method in ("GET", "DELETE") else (None, pairs)
+
+    session = self._get_session()
+    async with session.request(method, self.root.rstrip("/") + uri,
+                               params=query, data=form,
+                               headers=headers) as resp:
+      content_type = resp.headers.get("content-type", "")
+      if "json" not in content_type:
+        raise kite_exceptions.DataException(
+          f"Unknown Content-Type ({content_type}) with response: "
+          f"{await resp.text()}")
+      try:
+        data = await resp.json(content_type=None)
+      except ValueError:
+        raise kite_exceptions.DataException(
+          "Couldn't parse the JSON response received from the server: "
+          f"{await resp.text()}")
+      status = resp.status
+
+    if data.get("status") == "error" or data.get("error_type"):
+      error = getattr(kite_exceptions, data.get("error_type") or "",
+                      kite_exceptions.GeneralException)
+      raise error(data["message"], code=status)
+    return data["data"]
+
+  def _get_session(self):
+    """Get the aiohttp session, creating it in the running event loop.
+
+    Returns:
+      (aiohttp.ClientSession): Session.
+
+    """
+    if self._session is None or self._session.closed:
+      connect_timeout, read_timeout = self.timeout
+      self._session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+        timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout,
+                                      sock_read=read_timeout))
+    return self._session
+
+def _as_list(instruments):
+  """Get the instruments as a list.
+
+  Args:
+    instruments(list|str): Instrument or instruments.
+
+  Returns:
+    (list): Instruments.
+
+  """
+  return [instruments] if isinstance(instruments, str) else list(instruments)
+
+def _date_text(value):
+  """Format a date parameter of the historical data API.
+
+  Args:
+    value(datetime|str): Date.
+
+  Returns:
+    (str): Date in format yyyy-mm-dd HH:MM:SS.
+
+  """
+  if isinstance(value, datetime.datetime):
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+  return value
@@ -0,0 +1,128 @@
+"""This modules bridges the KiteTicker websocket into an asyncio event loop.
+
+KiteTicker runs on the Twisted reactor, which kiteconnect starts on its own
+thread, so it can't share the asyncio loop directly. AsyncTicker hands every
+callback over to the loop, so that a strategy consumes ticks and order
+updates and awaits AsyncKite calls from one event loop:
+
+  async for ticks in ticker.ticks():
+    ltp, orders = await asyncio.gather(get_ltp(akite, ins), get_orders(akite))
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import asyncio
+
+from framework.logging.logger import INFO
+
+# Marks the end of a stream.
+_CLOSED = object()
+
+class AsyncTicker(object):
+  """Hands the ticks and order updates of a KiteTicker over to asyncio
+  queues.
+  """
+  def __init__(self, kws, max_queue=10000):
+    """Initialize AsyncTicker object.
+
+    Args:
+      kws(KiteTicker): Ticker, its on_connect callback is left to the caller.
+      max_queue(int): Maximum tick batches buffered, the oldest batch is
+                      dropped when the consumer falls behind.
+                      Default: 10000
+    """
+    self.kws = kws
+    self.max_queue = max_queue
+    self.dropped = 0
+    self._loop = None
+    self._ticks = None
+    self._order_updates = None
+
+  def start(self):
+    """Connect the ticker on its own thread. Must be called from the event
+    loop which consumes the ticks.
+    """
+    self._loop = asyncio.get_running_loop()
+    self._ticks = asyncio.Queue(maxsize=self.max_queue)
+    self._order_updates = asyncio.Queue()
+    self.kws.on_ticks = self._on_ticks
+    self.kws.on_order_update = self._on_order_update
+    self.kws.connect(threaded=True)
+    INFO("Started asyncio ticker bridge")
+
+  def stop(self):
+    """Close the ticker connection and end the streams.
+    """
+    self.kws.close()
+    self._close_streams()
+
+  async def ticks(self):
+    """Iterate over the tick batches as they arrive.
+
+    Yields:
+      (list): Ticks of one on_ticks callback.
+    """
+    while True:
+      ticks = await self._ticks.get()
+      if ticks is _CLOSED:
+        return
+      yield ticks
+
+  async def order_updates(self):
+    """Iterate over the order updates as they arrive.
+
+    Yields:
+      (dict): Order update.
+    """
+    while True:
+      update = await self._order_updates.get()
+      if update is _CLOSED:
+        return
+      yield update
+
+  def _on_ticks(self, ws, ticks):
+    """Ticker thread callback, hands the ticks over to the event loop.
+    """
+    self._hand_over(self._put_ticks, ticks)
+
+  def _on_order_update(self, ws, data):
+    """Ticker thread callback, hands the order update over to the event loop.
+    """
+    self._hand_over(self._order_updates.put_nowait, data)
+
+  def _hand_over(self, callback, data):
+    """Schedule a callback in the event loop, ignored once the loop is closed.
+
+    Args:
+      callback(callable): Called with data in the event loop.
+      data(object): Ticks or order update.
+    """
+    try:
+      self._loop.call_soon_threadsafe(callback, data)
+    except RuntimeError:
+      # Callbacks in flight while the consumer shut down the loop.
+      pass
+
+  def _put_ticks(self, ticks):
+    """Queue a tick batch, dropping the oldest one if the queue is full. Runs
+    in the event loop.
+
+    Args:
+      ticks(list): Ticks of one callback.
+    """
+    if self._ticks.full():
+      self._ticks.get_nowait()
+      self.dropped += 1
+    self._ticks.put_nowait(ticks)
+
+  def _close_streams(self):
+    """End the iterators of ticks and order updates.
+    """
+    def close(data):
+      if self._ticks.full():
+        self._ticks.get_nowait()
+      self._ticks.put_nowait(_CLOSED)
+      self._order_updates.put_nowait(_CLOSED)
+    if self._loop is not None:
+      self._hand_over(close, None)
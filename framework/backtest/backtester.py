@@ -0,0 +1,564 @@
+"""This modules contains the backtesting of strategies on stored ticks.
+
+Event-driven backtests run a strategy unchanged on a ReplayTicker, with
+SimulatedKite standing in for KiteConnect. Orders placed with the
+place_mis_* functions are filled against the replayed prices, order updates
+are passed to on_order_update as the ticker would and the MIS positions are
+squared off when the replay ends:
+
+  kite = SimulatedKite(tokens, slippage_bps=2)
+  kws = ReplayTicker(db_file, start=day_start, end=day_end, speed=None)
+  kws.on_connect = lambda ws, response: ws.subscribe(tokens.values())
+  kws.on_ticks = strategy.on_ticks
+  kite.attach(kws)
+  kws.connect()
+  get_positions(kite)
+
+Vectorized backtests evaluate signals over whole price arrays instead:
+
+  prices = load_prices(db_file, tokens.values(), start, end, freq="1min")
+  signals = np.sign(prices - prices.rolling(20).mean())
+  result = backtest_signals(prices, signals, quantity=10)
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import itertools
+import threading
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from kiteconnect import KiteConnect
+
+from config.streaming_config import TICK_STORE_BACKEND
+from framework.logging.logger import ERROR, INFO
+from framework.orders.orders import VARIETY_BO
+from framework.streaming.columnar_store import read_columnar_ticks
+from framework.streaming.tick_store import read_ticks
+
+# Result of a vectorized backtest. pnl and positions are DataFrames shaped as
+# the prices, trades has a row per fill and summary a row per instrument.
+BacktestResult = namedtuple("BacktestResult", ["pnl", "positions", "trades",
+                                               "summary"])
+
+# Statuses of orders waiting for a fill.
+_OPEN_STATUSES = ("OPEN", "TRIGGER PENDING")
+
+class SimulatedKite(object):
+  """KiteConnect stand-in which fills orders against replayed ticks.
+
+  Market orders fill at the last traded price plus slippage. Limit orders
+  fill once the price crosses the limit, at the better of the two. Bracket
+  orders place a target and a stoploss leg once the entry fills; the first
+  leg filled cancels the other and the stoploss trails the price in steps
+  of trailing_stoploss points.
+  """
+  def __init__(self, instruments, slippage_bps=0.0):
+    """Initialize SimulatedKite object.
+
+    Args:
+      instruments(dict): {tradingsymbol: instrument_token} of the tradable
+                         instruments, e.g. from get_instrument_tokens().
+      slippage_bps(float): Slippage of market and stoploss fills in basis
+                           points of the price.
+                           Default: 0.0
+    """
+    self.instruments = {symbol: int(token)
+                        for symbol, token in instruments.items()}
+    self.slippage_bps = slippage_bps
+    self.now = None
+    self._symbols = {token: symbol
+                     for symbol, token in self.instruments.items()}
+    self._last_price = {}
+    self._orders = {}
+    # Open order ids of every token.
+    self._open = {}
+    self._positions = {}
+    # Other leg of every bracket order leg.
+    self._siblings = {}
+    # [entry price, stoploss points, trailing points, best price] of every
+    # trailing stoploss leg.
+    self._trails = {}
+    self._order_ids = itertools.count(1)
+    self._kws = None
+    self._lock = threading.RLock()
+
+  def attach(self, kws):
+    """Fill orders on the ticks of a ticker before they reach its on_ticks,
+    pass order updates to its on_order_update and square off when it closes.
+    Callbacks already set on the ticker are still called.
+
+    Args:
+      kws(ReplayTicker): Ticker replaying the ticks.
+    """
+    on_ticks, on_close = kws.on_ticks, kws.on_close
+
+    def ticks(ws, ticks):
+      self.on_ticks(ticks)
+      if on_ticks:
+        on_ticks(ws, ticks)
+
+    def close(ws, code, reason):
+      self.square_off()
+      if on_close:
+        on_close(ws, code, reason)
+
+    kws.on_ticks = ticks
+    kws.on_close = close
+    self._kws = kws
+
+  def on_ticks(self, ticks):
+    """Update the last prices and fill the open orders they reach.
+
+    Args:
+      ticks(list): Tick dicts of KiteTicker or Ticks of CompactTicker.
+    """
+    updates = []
+    with self._lock:
+      for tick in ticks:
+        if isinstance(tick, dict):
+          token, price = tick["instrument_token"], tick["last_price"]
+          ts = tick.get("exchange_timestamp")
+        else:
+          token, price, ts = tick.token, tick.price, tick.ts
+        if price is None:
+          continue
+        self._last_price[token] = price
+        if ts is not None:
+          self.now = ts
+        if self._open.get(token):
+          self._match(token, price, updates)
+    self._send(updates)
+
+  def place_order(self, variety, exchange, tradingsymbol, transaction_type,
+                  quantity, product, order_type, price=None, validity=None,
+                  disclosed_quantity=None, trigger_price=None,
+                  squareoff=None, stoploss=None, trailing_stoploss=None,
+                  tag=None):
+    """Place an order, as KiteConnect.place_order.
+
+    Returns:
+      (dict): Response with the order_id in data, or an error.
+
+    """
+    token = self.instruments.get(tradingsymbol)
+    if token is None:
+      return _error(f"Unknown instrument {exchange}:{tradingsymbol}")
+    if order_type != KiteConnect.ORDER_TYPE_MARKET and price is None and (
+        trigger_price is None):
+      return _error(f"Price required for {order_type} order")
+    if variety == VARIETY_BO and (squareoff is None or stoploss is None):
+      return _error("Bracket order requires squareoff and stoploss")
+
+    updates = []
+    with self._lock:
+      if (order_type == KiteConnect.ORDER_TYPE_MARKET and
+          token not in self._last_price):
+        return _error(f"No price of {exchange}:{tradingsymbol} yet")
+      order = self._new_order(token, variety, exchange, transaction_type,
+                              quantity, product, order_type, price,
+                              trigger_price, tag)
+      if variety == VARIETY_BO:
+        order["squareoff"] = squareoff
+        order["stoploss"] = stoploss
+        order["trailing_stoploss"] = trailing_stoploss or 0
+      updates.append(dict(order))
+      if token in self._last_price:
+        self._match(token, self._last_price[token], updates)
+    self._send(updates)
+    return {"status": "success", "data": {"order_id": order["order_id"]}}
+
+  def cancel_order(self, variety, order_id, parent_order_id=None):
+    """Cancel an open order, as KiteConnect.cancel_order.
+
+    Returns:
+      (dict): Response with the order_id in data, or an error.
+
+    """
+    updates = []
+    with self._lock:
+      order = self._orders.get(order_id)
+      if order is None or order["status"] not in _OPEN_STATUSES:
+        return _error(f"Order {order_id} isn't open")
+      self._cancel(order, updates)
+    self._send(updates)
+    return {"status": "success", "data": {"order_id": order_id}}
+
+  def orders(self):
+    """Get the orders of the day, as KiteConnect.orders.
+
+    Returns:
+      (dict): Response with the list of orders in data.
+
+    """
+    with self._lock:
+      return {"status": "success",
+              "data": [dict(order) for order in self._orders.values()]}
+
+  def positions(self):
+    """Get the positions, as KiteConnect.positions. All positions are MIS
+    positions of the day.
+
+    Returns:
+      (dict): Response with the net and day positions in data.
+
+    """
+    with self._lock:
+      positions = []
+      for token, position in self._positions.items():
+        position = dict(position)
+        last_price = self._last_price.get(token, 0.0)
+        quantity = position["quantity"]
+        position["last_price"] = last_price
+        position["pnl"] = (position["sell_value"] - position["buy_value"] +
+                           quantity * last_price)
+        position["m2m"] = position["pnl"]
+        if quantity > 0:
+          position["average_price"] = (position["buy_value"] /
+                                       position["buy_quantity"])
+        elif quantity < 0:
+          position["average_price"] = (position["sell_value"] /
+                                       position["sell_quantity"])
+        positions.append(position)
+    return {"status": "success",
+            "data": {"net": positions, "day": [dict(position)
+                                               for position in positions]}}
+
+  def holdings(self):
+    """Get the holdings, as KiteConnect.holdings. The simulation only has
+    intraday positions.
+
+    Returns:
+      (dict): Response with an empty list in data.
+
+    """
+    return {"status": "success", "data": []}
+
+  def square_off(self):
+    """Cancel the open orders and close the open positions at market, as the
+    broker does with MIS positions at the end of the day.
+
+    Returns:
+      (int): Number of positions closed.
+
+    """
+    updates = []
+    closed = 0
+    with self._lock:
+      for order in list(self._orders.values()):
+        if order["status"] in _OPEN_STATUSES:
+          self._cancel(order, updates)
+      for token, position in self._positions.items():
+        quantity = position["quantity"]
+        if quantity == 0 or token not in self._last_price:
+          continue
+        transaction_type = (KiteConnect.TRANSACTION_TYPE_SELL if quantity > 0
+                            else KiteConnect.TRANSACTION_TYPE_BUY)
+        order = self._new_order(token, KiteConnect.VARIETY_REGULAR,
+                                position["exchange"], transaction_type,
+                                abs(quantity), KiteConnect.PRODUCT_MIS,
+                                KiteConnect.ORDER_TYPE_MARKET, None, None,
+                                "squareoff")
+        self._fill(order, self._last_price[token], updates)
+        closed += 1
+    self._send(updates)
+    if closed:
+      INFO("Squared off %s positions", closed)
+    return closed
+
+  def _new_order(self, token, variety, exchange, transaction_type, quantity,
+                 product, order_type, price, trigger_price, tag,
+                 parent_order_id=None):
+    """Create an open order.
+
+    Returns:
+      (dict): Order details.
+
+    """
+    order_id = str(next(self._order_ids))
+    status = ("TRIGGER PENDING" if order_type in (
+      KiteConnect.ORDER_TYPE_SL, KiteConnect.ORDER_TYPE_SLM) else "OPEN")
+    order = {
+      "order_id": order_id, "parent_order_id": parent_order_id,
+      "exchange": exchange, "tradingsymbol": self._symbols[token],
+      "instrument_token": token, "transaction_type": transaction_type,
+      "variety": variety, "product": product, "order_type": order_type,
+      "status": status, "quantity": quantity, "price": price or 0.0,
+      "trigger_price": trigger_price or 0.0, "filled_quantity": 0,
+      "pending_quantity": quantity, "cancelled_quantity": 0,
+      "average_price": 0.0, "order_timestamp": self.now,
+      "exchange_timestamp": None, "tag": tag}
+    self._orders[order_id] = order
+    self._open.setdefault(token, []).append(order_id)
+    return order
+
+  def _match(self, token, price, updates):
+    """Fill the open orders of a token which the price reaches and trail
+    their stoploss legs.
+
+    Args:
+      token(int): instrument token.
+      price(float): Last traded price.
+      updates(list): Order updates to send.
+    """
+    for order_id in list(self._open[token]):
+      order = self._orders[order_id]
+      if order["status"] not in _OPEN_STATUSES:
+        continue
+      buy = order["transaction_type"] == KiteConnect.TRANSACTION_TYPE_BUY
+      order_type = order["order_type"]
+      if order_type == KiteConnect.ORDER_TYPE_MARKET:
+        self._fill(order, price, updates)
+      elif order_type == KiteConnect.ORDER_TYPE_LIMIT:
+        limit = order["price"]
+        if price <= limit if buy else price >= limit:
+          self._fill(order, min(price, limit) if buy else max(price, limit),
+                     updates)
+      else:
+        if order_id in self._trails:
+          self._trail(order, price)
+        trigger = order["trigger_price"]
+        if price >= trigger if buy else price <= trigger:
+          self._fill(order, price, updates)
+
+  def _trail(self, order, price):
+    """Move the trigger of a trailing stoploss leg with the price.
+
+    Args:
+      order(dict): Stoploss leg.
+      price(float): Last traded price.
+    """
+    trail = self._trails[order["order_id"]]
+    entry, stoploss, step, best = trail
+    # The stoploss leg of a long entry sells.
+    if order["transaction_type"] == KiteConnect.TRANSACTION_TYPE_SELL:
+      trail[3] = best = max(best, price)
+      steps = int((best - entry) // step)
+      order["trigger_price"] = max(order["trigger_price"],
+                                   entry - stoploss + steps * step)
+    else:
+      trail[3] = best = min(best, price)
+      steps = int((entry - best) // step)
+      order["trigger_price"] = min(order["trigger_price"],
+                                   entry + stoploss - steps * step)
+
+  def _fill(self, order, price, updates):
+    """Fill an order completely and update the position.
+
+    Args:
+      order(dict): Open order.
+      price(float): Fill price before slippage.
+      updates(list): Order updates to send.
+    """
+    buy = order["transaction_type"] == KiteConnect.TRANSACTION_TYPE_BUY
+    if order["order_type"] != KiteConnect.ORDER_TYPE_LIMIT:
+      slippage = price * self.slippage_bps / 10000
+      price = price + slippage if buy else price - slippage
+    token, quantity = order["instrument_token"], order["quantity"]
+    order.update({"status": "COMPLETE", "filled_quantity": quantity,
+                  "pending_quantity": 0, "average_price": price,
+                  "exchange_timestamp": self.now})
+    self._open[token].remove(order["order_id"])
+    updates.append(dict(order))
+
+    position = self._positions.get(token)
+    if position is None:
+      position = self._positions[token] = {
+        "tradingsymbol": order["tradingsymbol"], "exchange": order["exchange"],
+        "instrument_token": token, "product": KiteConnect.PRODUCT_MIS,
+        "quantity": 0, "multiplier": 1, "average_price": 0.0,
+        "buy_quantity": 0, "buy_value": 0.0, "sell_quantity": 0,
+        "sell_value": 0.0}
+    side = "buy" if buy else "sell"
+    position[f"{side}_quantity"] += quantity
+    position[f"{side}_value"] += quantity * price
+    position["quantity"] = position["buy_quantity"] - position["sell_quantity"]
+
+    if order["variety"] != VARIETY_BO:
+      return
+    if order["parent_order_id"] is None:
+      self._place_legs(order, price)
+    else:
+      sibling = self._orders[self._siblings.pop(order["order_id"])]
+      self._siblings.pop(sibling["order_id"], None)
+      self._trails.pop(sibling["order_id"], None)
+      self._trails.pop(order["order_id"], None)
+      if sibling["status"] in _OPEN_STATUSES:
+        self._cancel(sibling, updates)
+
+  def _place_legs(self, entry, price):
+    """Place the target and stoploss legs of a filled bracket order.
+
+    Args:
+      entry(dict): Filled entry order.
+      price(float): Entry price.
+    """
+    buy = entry["transaction_type"] == KiteConnect.TRANSACTION_TYPE_BUY
+    exit_type = (KiteConnect.TRANSACTION_TYPE_SELL if buy
+                 else KiteConnect.TRANSACTION_TYPE_BUY)
+    sign = 1 if buy else -1
+    args = (entry["instrument_token"], VARIETY_BO,
+            entry["exchange"], exit_type, entry["quantity"], entry["product"])
+    target = self._new_order(*args, KiteConnect.ORDER_TYPE_LIMIT,
+                             price + sign * entry["squareoff"], None,
+                             entry["tag"], entry["order_id"])
+    stoploss = self._new_order(*args, KiteConnect.ORDER_TYPE_SLM, None,
+                               price - sign * entry["stoploss"],
+                               entry["tag"], entry["order_id"])
+    self._siblings[target["order_id"]] = stoploss["order_id"]
+    self._siblings[stoploss["order_id"]] = target["order_id"]
+    if entry["trailing_stoploss"]:
+      self._trails[stoploss["order_id"]] = [
+        price, entry["stoploss"], entry["trailing_stoploss"], price]
+
+  def _cancel(self, order, updates):
+    """Cancel an open order.
+
+    Args:
+      order(dict): Open order.
+      updates(list): Order updates to send.
+    """
+    order.update({"status": "CANCELLED",
+                  "cancelled_quantity": order["pending_quantity"],
+                  "pending_quantity": 0})
+    self._open[order["instrument_token"]].remove(order["order_id"])
+    self._siblings.pop(order["order_id"], None)
+    self._trails.pop(order["order_id"], None)
+    updates.append(dict(order))
+
+  def _send(self, updates):
+    """Pass order updates to on_order_update of the attached ticker.
+
+    Args:
+      updates(list): Order updates.
+    """
+    if self._kws is None or not updates:
+      return
+    on_order_update = self._kws.on_order_update
+    if not on_order_update:
+      return
+    for order in updates:
+      try:
+        on_order_update(self._kws, order)
+      except Exception as ex:
+        ERROR("Error in order update callback for %s: %s", order["order_id"],
+              ex)
+
+def _error(message):
+  """Create an error response of the order API.
+
+  Args:
+    message(str): Error message.
+
+  Returns:
+    (dict): Response.
+
+  """
+  return {"status": "error", "error_type": "InputException",
+          "message": message, "data": None}
+
+def load_prices(db_file, tokens=None, start=None, end=None, freq="1s",
+                backend=TICK_STORE_BACKEND):
+  """Load the stored last traded prices into a matrix of time by token.
+
+  Args:
+    db_file(str): Path of the sqlite tick database or root directory of the
+                  columnar tick store.
+    tokens(list): instrument tokens.
+                  Default: None (all tokens)
+    start(datetime): Inclusive start time.
+                     Default: None (from the first tick)
+    end(datetime): Exclusive end time.
+                   Default: None (till the last tick)
+    freq(str): Sampling frequency, the last price of every period is taken.
+               None keeps every tick time.
+               Default: "1s"
+    backend(str): Tick storage backend("sqlite", "columnar").
+                  Default: TICK_STORE_BACKEND
+
+  Returns:
+    (DataFrame): Prices indexed by time with a column per token, carried
+                 forward over the periods without ticks.
+
+  """
+  reader = read_columnar_ticks if backend == "columnar" else read_ticks
+  data = reader(db_file, tokens=list(tokens) if tokens else None,
+                start=start, end=end, columns=["price"])
+  prices = data.drop_duplicates(["ts", "token"], keep="last").pivot(
+    index="ts", columns="token", values="price")
+  if freq:
+    # Periods without any tick, e.g. nights, are dropped rather than filled.
+    prices = prices.resample(freq).last().dropna(how="all")
+  return prices.ffill()
+
+def backtest_signals(prices, signals, quantity=1, slippage_bps=0.0,
+                     cost_bps=0.0):
+  """Backtest target position signals over whole price arrays.
+
+  The position decided on a period is taken with a market order at the price
+  of the next period and, as for MIS orders, every position is closed at the
+  last price of the day.
+
+  Args:
+    prices(DataFrame): Prices indexed by time with a column per instrument,
+                       e.g. from load_prices().
+    signals(DataFrame): Target positions in lots, e.g. 1 long, -1 short and
+                        0 flat, aligned with the prices.
+    quantity(int): Shares per lot, a scalar or a Series per instrument.
+                   Default: 1
+    slippage_bps(float): Slippage of every fill in basis points.
+                         Default: 0.0
+    cost_bps(float): Brokerage and charges in basis points of the turnover.
+                     Default: 0.0
+
+  Returns:
+    (BacktestResult): P&L and positions over time, fills and per instrument
+                      summary.
+
+  """
+  signals = signals.reindex(index=prices.index, columns=prices.columns)
+  price = prices.values.astype(np.float64)
+  missing = np.isnan(price)
+  if isinstance(quantity, pd.Series):
+    quantity = quantity.reindex(prices.columns).fillna(0).values
+
+  # Positions held from every period, flat on the first and last period of
+  # every day.
+  positions = np.zeros(price.shape)
+  positions[1:] = np.nan_to_num(signals.values[:-1].astype(np.float64))
+  days = prices.index.normalize()
+  day_change = np.asarray(days[1:] != days[:-1])
+  first = np.concatenate(([True], day_change))
+  last = np.concatenate((day_change, [True]))
+  positions[first | last] = 0.0
+  positions[missing] = 0.0
+  positions *= quantity
+  price = np.where(missing, 0.0, price)
+
+  trades = np.diff(positions, axis=0, prepend=0.0)
+  fill_price = price * (1 + np.sign(trades) * slippage_bps / 10000)
+  cash = -np.cumsum(trades * fill_price + np.abs(trades) * price *
+                    cost_bps / 10000, axis=0)
+  pnl = cash + positions * price
+
+  rows, columns = np.nonzero(trades)
+  fills = pd.DataFrame({"date": prices.index[rows],
+                        "token": prices.columns[columns],
+                        "quantity": trades[rows, columns],
+                        "price": fill_price[rows, columns]})
+  drawdown = np.maximum.accumulate(pnl, axis=0) - pnl
+  summary = pd.DataFrame({
+    "pnl": pnl[-1] if len(pnl) else 0.0,
+    "trades": np.count_nonzero(trades, axis=0),
+    "turnover": np.abs(trades * fill_price).sum(axis=0),
+    "max_drawdown": drawdown.max(axis=0) if len(pnl) else 0.0},
+    index=prices.columns)
+  return BacktestResult(pd.DataFrame(pnl, index=prices.index,
+                                     columns=prices.columns),
+                        pd.DataFrame(positions, index=prices.index,
+                                     columns=prices.columns),
+                        fills, summary)
@@ -4,16 +4,37 @@ Date Created: 6-Sept-2020
 Author: Nikunj Soni (nks141197@gmail.com)
 """
 
+import concurrent.futures
+
 import pandas as pd
 
 from retry import retry
+from retry.api import retry_call
 
+from framework.common.instruments import get_instrument_master
+from framework.common.metrics import METRICS, instrumented, measure
+from framework.common.rate_limiter import RateLimiter
 from framework.connection.connect import generate_session
-from framework.logging.logger import ERROR, INFO
+from framework.logging.logger import DEBUG, ERROR, INFO
+
+# Maximum instruments per request of each quote endpoint.
+QUOTE_BATCH_SIZE = {
+  "ltp": 1000,
+  "ohlc": 1000,
+  "full": 500
+}
+
+# Quote APIs allow 1 request per second.
+QUOTE_RATE_LIMIT = 1
+
+# Rate limiter shared by all quote requests.
+_quote_limiter = RateLimiter(QUOTE_RATE_LIMIT)
+METRICS.register_limiter("quote", _quote_limiter)
 
 @retry(tries=3, delay=5)
 def get_instrument_tokens(kite, instruments, exchange="NSE"):
   """Get instrument tokens for given instrument symbols of exchange.
+  The instruments dump is downloaded once per day and cached.
 
   Args:
     kite(obj): KiteConnect object.
@@ -26,20 +47,18 @@ def get_instrument_tokens(kite, instruments, exchange="NSE"):
             (symbol:token)
 
   """
-  instruments_dump = kite.instruments(exchange)
-  instruments_df = pd.DataFrame(instruments_dump)
+  master = get_instrument_master(kite, (exchange,))
   instrument_tokens = {}
 
-  INFO(f"Instruments list:{instruments}")
+  INFO("Instruments list:%s", instruments)
   for symbol in instruments:
     try:
-      token = instruments_df[instruments_df.tradingsymbol==symbol].instrument_token.values[0]
-      instrument_tokens[symbol] = int(token)
-    except:
-      ERROR(f"Error occurred during lookup token for symbol:{symbol}")
+      instrument_tokens[symbol] = master.token(symbol, exchange)
+    except KeyError:
+      ERROR("Error occurred during lookup token for symbol:%s", symbol)
       raise
 
-  INFO(f"Instrument-token dict:{instrument_tokens}")
+  INFO("Instrument-token dict:%s", instrument_tokens)
   return instrument_tokens
 
 @retry(tries=3, delay=10)
@@ -53,6 +72,7 @@ def get_trading_session():
   return generate_session()
 
 @retry(tries=3, delay=5)
+@instrumented("ltp")
 def get_ltp(kite, instrument):
   """Get last traded price for an instrument.
 
@@ -66,16 +86,17 @@ def get_ltp(kite, instrument):
   """
   resp = kite.ltp(instrument)
   if resp['status'] == "success":
-    INFO(f"LTP for {instrument}:{resp['data'][instrument]['last_price']}")
+    INFO("LTP for %s:%s", instrument, resp['data'][instrument]['last_price'])
   else:
     # Log error details and retry.
     ERROR("Error occurred while getting ltp-")
-    ERROR(f"Status:{resp['status']}, Error:{resp['error_type']}, "
-          f"Error Message:{resp['message']}")
+    ERROR("Status:%s, Error:%s, Error Message:%s", resp['status'],
+          resp['error_type'], resp['message'])
     raise
   return resp['data'][instrument]['last_price']
 
 @retry(tries=3, delay=5)
+@instrumented("quote")
 def get_quote(kite, instrument):
   """Get quote for an instrument.
   Warning: It may return a bulk object consuming lot of memory, hence avoid
@@ -91,11 +112,107 @@ def get_quote(kite, instrument):
   """
   resp = kite.quote(instrument)
   if resp['status'] == "success":
-    INFO(f"Quote for {instrument}: {resp['data']}")
+    INFO("Quote for %s: %s", instrument, resp['data'])
   else:
     # Log error details and retry.
     ERROR("Error occurred while getting quote-")
-    ERROR(f"Status:{resp['status']}, Error:{resp['error_type']}, "
-          f"Error Message:{resp['message']}")
+    ERROR("Status:%s, Error:%s, Error Message:%s", resp['status'],
+          resp['error_type'], resp['message'])
     raise
   return resp['data']
+
+def get_ltps(kite, instruments):
+  """Get last traded prices for many instruments in as few requests as
+  possible.
+
+  Args:
+    kite(obj): KiteConnect object.
+    instruments(list): Instruments in format "Exchange:Symbol"("NSE:INFY").
+
+  Returns:
+    (dict): Last traded prices. (instrument:price)
+
+  """
+  data = _get_quotes_batched(kite, instruments, "ltp")
+  return {instrument: quote['last_price'] for instrument, quote in data.items()}
+
+def get_quotes(kite, instruments, mode="full"):
+  """Get quotes for many instruments in as few requests as possible.
+
+  Args:
+    kite(obj): KiteConnect object.
+    instruments(list): Instruments in format "Exchange:Symbol"("NSE:INFY").
+    mode(str): Quote mode("ltp", "ohlc", "full").
+               Default: "full"
+
+  Returns:
+    (DataFrame): Quotes indexed by instrument, nested fields flattened
+                 (ohlc.open -> open).
+
+  """
+  data = _get_quotes_batched(kite, instruments, mode)
+  quotes = pd.json_normalize(list(data.values()))
+  quotes.index = pd.Index(list(data.keys()), name="instrument")
+  quotes.columns = [column.replace("ohlc.", "") for column in quotes.columns]
+  return quotes
+
+def _get_quotes_batched(kite, instruments, mode):
+  """Get quotes of instruments split into the endpoint's batch size, batches
+  are requested concurrently within the quote rate limit.
+
+  Args:
+    kite(obj): KiteConnect object.
+    instruments(list): Instruments in format "Exchange:Symbol"("NSE:INFY").
+    mode(str): Quote mode("ltp", "ohlc", "full").
+
+  Returns:
+    (dict): Quote data. (instrument:quote)
+
+  """
+  batch_size = QUOTE_BATCH_SIZE[mode]
+  batches = [list(instruments[i:i + batch_size])
+             for i in range(0, len(instruments), batch_size)]
+  if not batches:
+    return {}
+
+  data = {}
+  with concurrent.futures.ThreadPoolExecutor(
+      max_workers=min(len(batches), 4)) as executor:
+    # Each batch is retried on its own.
+    futures = [executor.submit(retry_call, _get_quote_batch,
+                               fargs=[kite, batch, mode], tries=3, delay=1,
+                               backoff=2)
+               for batch in batches]
+    for future in futures:
+      data.update(future.result())
+  INFO("Got %s quotes for %s of %s instruments in %s requests", mode, len(data),
+       len(instruments), len(batches))
+  return data
+
+def _get_quote_batch(kite, batch, mode):
+  """Get quotes of a batch of instruments.
+
+  Args:
+    kite(obj): KiteConnect object.
+    batch(list): Instruments in format "Exchange:Symbol"("NSE:INFY").
+    mode(str): Quote mode("ltp", "ohlc", "full").
+
+  Returns:
+    (dict): Quote data. (instrument:quote)
+
+  """
+  _quote_limiter.acquire()
+  endpoint = {"ltp": kite.ltp, "ohlc": kite.ohlc, "full": kite.quote}[mode]
+  with measure(f"quote_batch_{mode}"):
+    resp = endpoint(batch)
+
+  # Unwrap the response if the client returns the status envelope.
+  if isinstance(resp, dict) and "status" in resp:
+    if resp['status'] != "success":
+      ERROR("Error occurred while getting %s quotes-", mode)
+      raise Exception(f"Status:{resp['status']}, "
+                      f"Error:{resp['error_type']}, "
+                      f"Error Message:{resp['message']}")
+    resp = resp['data']
+  DEBUG("Got %s quotes for batch of %s instruments", mode, len(batch))
+  return resp
@@ -0,0 +1,257 @@
+"""This modules contains the cached instrument master.
+
+The instruments dump of an exchange is downloaded once per day and persisted
+under $AUTOKITE_PATH/cache/instruments as a pickled DataFrame keyed by date.
+Lookups by (exchange, tradingsymbol), by token and by derivative contract
+(name, expiry, strike, instrument_type) are dict lookups.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import glob
+import os
+import threading
+
+import pandas as pd
+
+from framework.logging.logger import DEBUG, ERROR, INFO
+
+class InstrumentMaster(object):
+  """Instrument master of one or more exchanges with hash indexes.
+  """
+  def __init__(self, cache_dir=None):
+    """Initialize InstrumentMaster object.
+
+    Args:
+      cache_dir(str): Directory to persist the daily instruments dumps.
+                      Default: $AUTOKITE_PATH/cache/instruments
+    """
+    self.cache_dir = cache_dir
+    self._lock = threading.Lock()
+    # Loaded (exchange, date) dumps.
+    self._loaded = set()
+    self._frames = []
+    self.instruments = pd.DataFrame()
+    self._tokens = []
+    self._by_symbol = {}
+    self._by_token = {}
+    self._by_contract = {}
+
+  def load(self, kite, exchanges=("NSE",), day=None):
+    """Load the instruments of given exchanges for the day.
+
+    The dump is read from the cache if present, else downloaded and cached.
+
+    Args:
+      kite(obj): KiteConnect object.
+      exchanges(list): Market Exchanges.(BFO, BSE, NSE, NFO, MCX, CDS)
+                       Default: ("NSE",)
+      day(date): Day of the instruments dump.
+                 Default: None (today)
+
+    Returns:
+      (InstrumentMaster): self.
+
+    """
+    day = day or datetime.date.today()
+    with self._lock:
+      pending = [exchange for exchange in exchanges
+                 if (exchange, day) not in self._loaded]
+      if not pending:
+        return self
+      # Dumps of another day are stale, start over.
+      if any(loaded_day != day for _, loaded_day in self._loaded):
+        self._loaded, self._frames = set(), []
+
+      for exchange in pending:
+        self._frames.append(self._load_exchange(kite, exchange, day))
+        self._loaded.add((exchange, day))
+      self.instruments = pd.concat(self._frames, ignore_index=True)
+      self._build_indexes()
+    return self
+
+  def token(self, symbol, exchange="NSE"):
+    """Get the instrument token of a symbol.
+
+    Args:
+      symbol(str): Trading symbol.
+      exchange(str): Market Exchange.
+                     Default: "NSE"
+
+    Returns:
+      (int): instrument token.
+
+    """
+    return self._tokens[self._by_symbol[(exchange, symbol)]]
+
+  def tokens(self, symbols, exchange="NSE"):
+    """Get the instrument tokens of symbols.
+
+    Args:
+      symbols(list): Trading symbols.
+      exchange(str): Market Exchange.
+                     Default: "NSE"
+
+    Returns:
+      (dict): instrument tokens corresponding to symbols. (symbol:token)
+
+    """
+    by_symbol, tokens = self._by_symbol, self._tokens
+    return {symbol: tokens[by_symbol[(exchange, symbol)]] for symbol in symbols}
+
+  def by_token(self, token):
+    """Get the instrument details of a token.
+
+    Args:
+      token(int): instrument token.
+
+    Returns:
+      (dict): Instrument details as in the instruments dump.
+
+    """
+    return self._row(self._by_token[int(token)])
+
+  def by_symbol(self, symbol, exchange="NSE"):
+    """Get the instrument details of a symbol.
+
+    Args:
+      symbol(str): Trading symbol.
+      exchange(str): Market Exchange.
+                     Default: "NSE"
+
+    Returns:
+      (dict): Instrument details as in the instruments dump.
+
+    """
+    return self._row(self._by_symbol[(exchange, symbol)])
+
+  def contract(self, name, expiry, strike=0.0, instrument_type="FUT"):
+    """Get the instrument details of a derivative contract.
+
+    Args:
+      name(str): Underlying name ("NIFTY", "INFY").
+      expiry(date): Expiry date.
+      strike(float): Strike price, 0 for futures.
+                     Default: 0.0
+      instrument_type(str): "FUT", "CE" or "PE".
+                            Default: "FUT"
+
+    Returns:
+      (dict): Instrument details as in the instruments dump.
+
+    """
+    return self._row(self._by_contract[(name, expiry, float(strike),
+                                        instrument_type)])
+
+  def contract_tokens(self, contracts):
+    """Get the instrument tokens of derivative contracts.
+
+    Args:
+      contracts(list): (name, expiry, strike, instrument_type) tuples.
+
+    Returns:
+      (dict): instrument tokens corresponding to contracts.
+              (contract:token)
+
+    """
+    by_contract, tokens = self._by_contract, self._tokens
+    return {contract: tokens[by_contract[(contract[0], contract[1],
+                                          float(contract[2]), contract[3])]]
+            for contract in contracts}
+
+  def _row(self, position):
+    """Get the instrument details at a position.
+
+    Args:
+      position(int): Row position in instruments DataFrame.
+
+    Returns:
+      (dict): Instrument details.
+
+    """
+    return self.instruments.iloc[position].to_dict()
+
+  def _build_indexes(self):
+    """Build the hash indexes over the instruments DataFrame.
+    """
+    data = self.instruments
+    positions = range(len(data))
+    self._tokens = data["instrument_token"].astype("int64").tolist()
+    self._by_symbol = dict(zip(zip(data["exchange"].tolist(),
+                                   data["tradingsymbol"].tolist()), positions))
+    self._by_token = dict(zip(self._tokens, positions))
+
+    derivatives = data[data["instrument_type"].isin(["FUT", "CE", "PE"])]
+    self._by_contract = dict(zip(
+      zip(derivatives["name"].tolist(), derivatives["expiry"].tolist(),
+          derivatives["strike"].astype("float64").tolist(),
+          derivatives["instrument_type"].tolist()),
+      derivatives.index.tolist()))
+    DEBUG("Indexed %s instruments, %s derivative contracts", len(data),
+          len(self._by_contract))
+
+  def _load_exchange(self, kite, exchange, day):
+    """Load the instruments dump of an exchange from cache or download it.
+
+    Args:
+      kite(obj): KiteConnect object.
+      exchange(str): Market Exchange.
+      day(date): Day of the instruments dump.
+
+    Returns:
+      (DataFrame): Instruments of the exchange.
+
+    """
+    cache_dir = self._get_cache_dir()
+    cache_file = os.path.join(cache_dir, f"{exchange}-{day.isoformat()}.pkl")
+    if os.path.exists(cache_file):
+      DEBUG("Loading %s instruments from %s", exchange, cache_file)
+      return pd.read_pickle(cache_file)
+
+    INFO("Downloading %s instruments dump", exchange)
+    try:
+      data = pd.DataFrame(kite.instruments(exchange))
+    except Exception as ex:
+      ERROR("Error occurred while downloading %s instruments:%s", exchange, ex)
+      raise
+
+    # Remove the dumps of earlier days and cache today's.
+    for stale in glob.glob(os.path.join(cache_dir, f"{exchange}-*.pkl")):
+      os.remove(stale)
+    data.to_pickle(cache_file)
+    return data
+
+  def _get_cache_dir(self):
+    """Get the cache directory, creating it if required.
+
+    Returns:
+      (str): Cache directory path.
+
+    """
+    if not self.cache_dir:
+      try:
+        self.cache_dir = os.path.join(os.environ.get('AUTOKITE_PATH'),
+                                      'cache', 'instruments')
+      except Exception:
+        raise Exception("AUTOKITE_PATH environment variable is not defined")
+    os.makedirs(self.cache_dir, exist_ok=True)
+    return self.cache_dir
+
+# Instrument master shared by the framework.
+_master = InstrumentMaster()
+
+def get_instrument_master(kite, exchanges=("NSE",)):
+  """Get the shared instrument master loaded with given exchanges.
+
+  Args:
+    kite(obj): KiteConnect object.
+    exchanges(list): Market Exchanges.(BFO, BSE, NSE, NFO, MCX, CDS)
+                     Default: ("NSE",)
+
+  Returns:
+    (InstrumentMaster): Shared instrument master.
+
+  """
+  return _master.load(kite, exchanges)
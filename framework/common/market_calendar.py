@@ -0,0 +1,154 @@
+"""This modules contains the exchange trading calendar.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import collections
+import datetime
+
+from config import market_calendar_config as calendar_config
+
+# Timings of a trading session. pre_open is None for special sessions.
+Session = collections.namedtuple("Session", ["pre_open", "open", "close"])
+
+class TradingCalendar(object):
+  """Exchange trading calendar aware of holidays, special sessions and the
+  pre-open window.
+  """
+  def __init__(self, holidays=(), special_sessions=None,
+               pre_open=("09:00", "09:08"), market_hours=("09:15", "15:30")):
+    """Initialize TradingCalendar object.
+
+    Args:
+      holidays(list): Trading holidays in format (yyyy-mm-dd).
+      special_sessions(dict): {"yyyy-mm-dd": ("HH:MM", "HH:MM")} as
+                              (open, close) of special sessions.
+                              Default: None
+      pre_open(tuple): (start, end) of pre-open window in format (HH:MM).
+                       Default: ("09:00", "09:08")
+      market_hours(tuple): (open, close) of regular session in format
+                           (HH:MM).
+                           Default: ("09:15", "15:30")
+    """
+    self.holidays = {_to_date(day) for day in holidays}
+    self.special_sessions = {
+      _to_date(day): (_to_time(open_time), _to_time(close_time))
+      for day, (open_time, close_time) in (special_sessions or {}).items()
+    }
+    self.pre_open = _to_time(pre_open[0])
+    self.open_time, self.close_time = (_to_time(market_hours[0]),
+                                       _to_time(market_hours[1]))
+
+  @classmethod
+  def from_config(cls):
+    """Create the calendar from config/market_calendar_config.py.
+
+    Returns:
+      (TradingCalendar): Exchange trading calendar.
+
+    """
+    return cls(holidays=calendar_config.HOLIDAYS,
+               special_sessions=calendar_config.SPECIAL_SESSIONS,
+               pre_open=(calendar_config.PRE_OPEN_START,
+                         calendar_config.PRE_OPEN_END),
+               market_hours=(calendar_config.MARKET_OPEN,
+                             calendar_config.MARKET_CLOSE))
+
+  def is_trading_day(self, day):
+    """Check whether market is open on given day.
+
+    Args:
+      day(date): Date to check.
+
+    Returns:
+      (bool): True if there is a trading session on given day.
+
+    """
+    if day in self.special_sessions:
+      return True
+    return day.weekday() < 5 and day not in self.holidays
+
+  def session(self, day):
+    """Get the trading session timings of given day.
+
+    Args:
+      day(date): Trading day.
+
+    Returns:
+      (Session): Session timings or None if market is closed on given day.
+
+    """
+    if day in self.special_sessions:
+      open_time, close_time = self.special_sessions[day]
+      return Session(None, datetime.datetime.combine(day, open_time),
+                     datetime.datetime.combine(day, close_time))
+    if not self.is_trading_day(day):
+      return None
+    return Session(datetime.datetime.combine(day, self.pre_open),
+                   datetime.datetime.combine(day, self.open_time),
+                   datetime.datetime.combine(day, self.close_time))
+
+  def next_session(self, now=None):
+    """Get the session which is in progress or the next one.
+
+    Args:
+      now(datetime): Current time.
+                     Default: None (datetime.now())
+
+    Returns:
+      (Session): Session timings.
+
+    """
+    now = now or datetime.datetime.now()
+    day = now.date()
+    # A year without a trading day means a broken calendar.
+    for _ in range(366):
+      session = self.session(day)
+      if session is not None and session.close > now:
+        return session
+      day += datetime.timedelta(days=1)
+    raise Exception(f"No trading session found within a year of {now}")
+
+  def previous_trading_day(self, day):
+    """Get the last trading day before given day.
+
+    Args:
+      day(date): Date.
+
+    Returns:
+      (date): Previous trading day.
+
+    """
+    day -= datetime.timedelta(days=1)
+    while not self.is_trading_day(day):
+      day -= datetime.timedelta(days=1)
+    return day
+
+def _to_date(day):
+  """Convert a date string to date.
+
+  Args:
+    day(str|date): Date in format (yyyy-mm-dd).
+
+  Returns:
+    (date): Date.
+
+  """
+  if isinstance(day, datetime.date):
+    return day
+  return datetime.datetime.strptime(day, "%Y-%m-%d").date()
+
+def _to_time(value):
+  """Convert a time string to time.
+
+  Args:
+    value(str|time): Time in format (HH:MM).
+
+  Returns:
+    (time): Time.
+
+  """
+  if isinstance(value, datetime.time):
+    return value
+  return datetime.datetime.strptime(value, "%H:%M").time()
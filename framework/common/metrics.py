@@ -0,0 +1,445 @@
+"""This modules contains the in-process metrics of Kite API calls.
+
+Every instrumented endpoint keeps a latency histogram and call, error, retry
+and rate limit counters. Rate limiters are exported as headroom gauges. The
+metrics can be scraped from a local Prometheus text endpoint or written to a
+snapshot file periodically:
+
+  @retry(tries=3, delay=5)
+  @instrumented("orders")
+  def get_orders(kite): ...
+
+  with measure("place_order"):
+    kite.place_order(...)
+
+  start_metrics_server()    # http://127.0.0.1:9108/metrics
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import functools
+import http.server
+import json
+import os
+import threading
+import time
+
+from contextlib import contextmanager
+
+from framework.common.rate_limiter import is_rate_limit_error
+from framework.logging.logger import ERROR, INFO
+
+# Default port of the Prometheus text endpoint.
+METRICS_PORT = 9108
+
+# Default seconds between metrics snapshots.
+METRICS_SNAPSHOT_INTERVAL = 60
+
+# Quantiles exported for every latency histogram.
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+# Sub-buckets per power of two of the latency histogram, ~6% precision.
+_SUB_BUCKETS = 16
+_SUB_BITS = 4
+# Latencies are recorded in microseconds and clamped to ~35 minutes.
+_MAX_MICROS = (1 << 31) - 1
+_NUM_BUCKETS = (31 - _SUB_BITS + 2) * _SUB_BUCKETS
+
+class LatencyHistogram(object):
+  """HDR-style latency histogram with log-linear buckets of fixed relative
+  precision. Recording is O(1) and needs no allocation.
+  """
+  def __init__(self):
+    """Initialize LatencyHistogram object.
+    """
+    self._counts = [0] * _NUM_BUCKETS
+    self.count = 0
+    self.total = 0.0
+    self.max = 0.0
+    self._lock = threading.Lock()
+
+  def record(self, seconds):
+    """Record a latency.
+
+    Args:
+      seconds(float): Latency in seconds.
+    """
+    micros = min(max(int(seconds * 1e6), 0), _MAX_MICROS)
+    with self._lock:
+      self._counts[_bucket_index(micros)] += 1
+      self.count += 1
+      self.total += seconds
+      if seconds > self.max:
+        self.max = seconds
+
+  def percentile(self, quantile):
+    """Get the latency at a quantile.
+
+    Args:
+      quantile(float): Quantile between 0 and 1.
+
+    Returns:
+      (float): Latency in seconds, upper bound of the bucket.
+
+    """
+    with self._lock:
+      if not self.count:
+        return 0.0
+      rank = max(1, int(round(quantile * self.count)))
+      seen = 0
+      for index, count in enumerate(self._counts):
+        seen += count
+        if seen >= rank:
+          return min(_bucket_upper(index) / 1e6, self.max)
+    return self.max
+
+  def snapshot(self):
+    """Get the summary of recorded latencies.
+
+    Returns:
+      (dict): count, sum, max and quantiles in seconds.
+
+    """
+    summary = {"count": self.count, "sum": self.total, "max": self.max}
+    for quantile in QUANTILES:
+      summary[f"p{quantile * 100:g}"] = self.percentile(quantile)
+    return summary
+
+class MetricsRegistry(object):
+  """Thread-safe registry of per-endpoint histograms and counters and of
+  gauges.
+  """
+  # Counters kept for every endpoint.
+  COUNTERS = ("calls", "errors", "retries", "rate_limited")
+
+  def __init__(self):
+    """Initialize MetricsRegistry object.
+    """
+    self._latency = {}
+    self._counters = {}
+    self._gauges = {}
+    self._lock = threading.Lock()
+    # Endpoints whose last call failed, per thread, to count retries.
+    self._failed = threading.local()
+
+  def record(self, endpoint, seconds, error=None):
+    """Record a call of an endpoint.
+
+    A call made by a thread right after its previous call of the same
+    endpoint failed is counted as a retry, which covers @retry as well as
+    call_with_backoff() without hooking into them.
+
+    Args:
+      endpoint(str): Endpoint name.
+      seconds(float): Latency in seconds.
+      error(Exception): Error raised by the call.
+                        Default: None
+    """
+    histogram, counters = self._endpoint(endpoint)
+    histogram.record(seconds)
+
+    failed = getattr(self._failed, "endpoints", None)
+    if failed is None:
+      failed = self._failed.endpoints = set()
+    with self._lock:
+      counters["calls"] += 1
+      if endpoint in failed:
+        counters["retries"] += 1
+      if error is not None:
+        counters["errors"] += 1
+        if is_rate_limit_error(error):
+          counters["rate_limited"] += 1
+    if error is not None:
+      failed.add(endpoint)
+    else:
+      failed.discard(endpoint)
+
+  def register_gauge(self, name, func, **labels):
+    """Register a gauge, read when the metrics are exported.
+
+    Args:
+      name(str): Gauge name.
+      func(callable): Returns the current value of the gauge.
+      labels: Labels of the gauge.
+    """
+    key = (name, tuple(sorted(labels.items())))
+    with self._lock:
+      self._gauges[key] = func
+
+  def register_limiter(self, name, limiter):
+    """Export the headroom of a rate limiter as a gauge.
+
+    Args:
+      name(str): Name of the rate limited endpoint.
+      limiter(RateLimiter): Rate limiter.
+    """
+    self.register_gauge("rate_limit_headroom", limiter.headroom, limiter=name)
+
+  def snapshot(self):
+    """Get the current value of all metrics.
+
+    Returns:
+      (dict): {"endpoints": {endpoint: {counters..., "latency": {...}}},
+               "gauges": {name: [{"labels": {...}, "value": value}]}}
+
+    """
+    with self._lock:
+      endpoints = {endpoint: dict(counters)
+                   for endpoint, counters in self._counters.items()}
+      histograms = dict(self._latency)
+      gauges = dict(self._gauges)
+
+    for endpoint, histogram in histograms.items():
+      endpoints[endpoint]["latency"] = histogram.snapshot()
+    gauge_values = {}
+    for (name, labels), func in gauges.items():
+      try:
+        value = func()
+      except Exception as ex:
+        ERROR("Error occurred while reading gauge %s: %s", name, ex)
+        continue
+      gauge_values.setdefault(name, []).append({"labels": dict(labels),
+                                                "value": value})
+    return {"endpoints": endpoints, "gauges": gauge_values}
+
+  def render_prometheus(self):
+    """Render all metrics in Prometheus text exposition format.
+
+    Returns:
+      (str): Metrics text.
+
+    """
+    snapshot = self.snapshot()
+    lines = []
+    endpoints = snapshot["endpoints"]
+    for counter in self.COUNTERS:
+      name = f"autokite_api_{counter}_total"
+      lines.append(f"# TYPE {name} counter")
+      for endpoint, values in sorted(endpoints.items()):
+        lines.append(f'{name}{{endpoint="{endpoint}"}} {values[counter]}')
+
+    name = "autokite_api_latency_seconds"
+    lines.append(f"# TYPE {name} summary")
+    for endpoint, values in sorted(endpoints.items()):
+      latency = values["latency"]
+      for quantile in QUANTILES:
+        lines.append(f'{name}{{endpoint="{endpoint}",quantile="{quantile}"}} '
+                     f'{latency[f"p{quantile * 100:g}"]:.6f}')
+      lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {latency["sum"]:.6f}')
+      lines.append(f'{name}_count{{endpoint="{endpoint}"}} {latency["count"]}')
+
+    for gauge, values in sorted(snapshot["gauges"].items()):
+      name = f"autokite_{gauge}"
+      lines.append(f"# TYPE {name} gauge")
+      for value in values:
+        labels = ",".join(f'{key}="{label}"'
+                          for key, label in sorted(value["labels"].items()))
+        lines.append(f"{name}{{{labels}}} {value['value']:.6f}")
+    return "\n".join(lines) + "\n"
+
+  def reset(self):
+    """Remove all recorded histograms and counters, gauges are kept.
+    """
+    with self._lock:
+      self._latency = {}
+      self._counters = {}
+
+  def _endpoint(self, endpoint):
+    """Get the histogram and counters of an endpoint, created on first use.
+
+    Args:
+      endpoint(str): Endpoint name.
+
+    Returns:
+      (tuple): (LatencyHistogram, dict of counters)
+
+    """
+    histogram = self._latency.get(endpoint)
+    if histogram is None:
+      with self._lock:
+        if endpoint not in self._latency:
+          self._counters[endpoint] = dict.fromkeys(self.COUNTERS, 0)
+          self._latency[endpoint] = LatencyHistogram()
+        histogram = self._latency[endpoint]
+    return histogram, self._counters[endpoint]
+
+# Process wide metrics registry.
+METRICS = MetricsRegistry()
+
+@contextmanager
+def measure(endpoint, registry=METRICS):
+  """Context manager which records the latency and outcome of a call.
+
+  Args:
+    endpoint(str): Endpoint name.
+    registry(MetricsRegistry): Registry to record into.
+                               Default: METRICS
+  """
+  start = time.perf_counter()
+  try:
+    yield
+  except Exception as ex:
+    registry.record(endpoint, time.perf_counter() - start, ex)
+    raise
+  registry.record(endpoint, time.perf_counter() - start)
+
+def instrumented(endpoint, registry=METRICS):
+  """Decorator which records the latency and outcome of every call of the
+  function. Place it below @retry so that every attempt is recorded.
+
+  Args:
+    endpoint(str): Endpoint name.
+    registry(MetricsRegistry): Registry to record into.
+                               Default: METRICS
+  """
+  def decorator(func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      start = time.perf_counter()
+      try:
+        result = func(*args, **kwargs)
+      except Exception as ex:
+        registry.record(endpoint, time.perf_counter() - start, ex)
+        raise
+      registry.record(endpoint, time.perf_counter() - start)
+      return result
+    return wrapper
+  return decorator
+
+def start_metrics_server(port=METRICS_PORT, host="127.0.0.1",
+                         registry=METRICS):
+  """Serve the metrics in Prometheus text format from a daemon thread.
+
+  Args:
+    port(int): Port to listen on, 0 picks a free port.
+               Default: METRICS_PORT
+    host(str): Address to listen on.
+               Default: "127.0.0.1"
+    registry(MetricsRegistry): Registry to export.
+                               Default: METRICS
+
+  Returns:
+    (ThreadingHTTPServer): Server, call shutdown() to stop it.
+
+  """
+  class Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+      if self.path.split("?")[0] not in ("/", "/metrics"):
+        self.send_error(404)
+        return
+      body = registry.render_prometheus().encode()
+      self.send_response(200)
+      self.send_header("Content-Type", "text/plain; version=0.0.4")
+      self.send_header("Content-Length", str(len(body)))
+      self.end_headers()
+      self.wfile.write(body)
+
+    def log_message(self, format, *args):
+      # Scrapes are not worth a log line each.
+      pass
+
+  server = http.server.ThreadingHTTPServer((host, port), Handler)
+  threading.Thread(target=server.serve_forever, name="MetricsServer",
+                   daemon=True).start()
+  INFO("Serving metrics at http://%s:%s/metrics", host,
+       server.server_address[1])
+  return server
+
+class SnapshotWriter(object):
+  """Daemon thread which writes the metrics snapshot as JSON periodically.
+  """
+  def __init__(self, path=None, interval=METRICS_SNAPSHOT_INTERVAL,
+               registry=METRICS):
+    """Initialize SnapshotWriter object.
+
+    Args:
+      path(str): Snapshot file path.
+                 Default: None ($AUTOKITE_PATH/logs/metrics.json)
+      interval(float): Seconds between snapshots.
+                       Default: METRICS_SNAPSHOT_INTERVAL
+      registry(MetricsRegistry): Registry to export.
+                                 Default: METRICS
+    """
+    if path is None:
+      try:
+        path = os.path.join(os.environ.get('AUTOKITE_PATH'), 'logs',
+                            'metrics.json')
+      except Exception:
+        raise Exception("AUTOKITE_PATH environment variable is not defined")
+    self.path = path
+    self.interval = interval
+    self.registry = registry
+    self._stop_event = threading.Event()
+    self._thread = None
+
+  def start(self):
+    """Start writing snapshots.
+    """
+    self._thread = threading.Thread(target=self._run, name="MetricsSnapshot",
+                                    daemon=True)
+    self._thread.start()
+
+  def stop(self):
+    """Write a last snapshot and stop.
+    """
+    self._stop_event.set()
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+
+  def write(self):
+    """Write the current snapshot, replacing the file atomically.
+    """
+    snapshot = self.registry.snapshot()
+    snapshot["time"] = time.time()
+    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+    tmp_path = self.path + ".tmp"
+    with open(tmp_path, "w") as f:
+      json.dump(snapshot, f, indent=1)
+    os.replace(tmp_path, self.path)
+
+  def _run(self):
+    """Snapshot thread loop.
+    """
+    while not self._stop_event.wait(self.interval):
+      self._write_safely()
+    self._write_safely()
+
+  def _write_safely(self):
+    """Write the snapshot, logging instead of raising errors.
+    """
+    try:
+      self.write()
+    except Exception as ex:
+      ERROR("Error occurred while writing metrics snapshot: %s", ex)
+
+def _bucket_index(micros):
+  """Get the histogram bucket of a latency.
+
+  Args:
+    micros(int): Latency in microseconds.
+
+  Returns:
+    (int): Bucket index.
+
+  """
+  if micros < 2 * _SUB_BUCKETS:
+    return micros
+  shift = micros.bit_length() - _SUB_BITS - 1
+  return shift * _SUB_BUCKETS + (micros >> shift)
+
+def _bucket_upper(index):
+  """Get the exclusive upper bound of a histogram bucket.
+
+  Args:
+    index(int): Bucket index.
+
+  Returns:
+    (int): Upper bound in microseconds.
+
+  """
+  if index < 2 * _SUB_BUCKETS:
+    return index + 1
+  shift = index // _SUB_BUCKETS - 1
+  return (index % _SUB_BUCKETS + _SUB_BUCKETS + 1) << shift
@@ -0,0 +1,121 @@
+"""This modules contains a thread-safe token bucket rate limiter for Kite APIs.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import threading
+import time
+
+from framework.logging.logger import WARN
+
+class RateLimiter(object):
+  """Token bucket rate limiter shared by all threads calling an API.
+  """
+  def __init__(self, rate, capacity=None):
+    """Initialize RateLimiter object.
+
+    Args:
+      rate(float): Requests allowed per second.
+      capacity(int): Maximum burst of requests.
+                     Default: None (same as rate)
+    """
+    self.rate = float(rate)
+    self.capacity = float(capacity or rate)
+    self._tokens = self.capacity
+    self._updated_at = time.monotonic()
+    self._lock = threading.Lock()
+
+  def acquire(self):
+    """Block till a request is allowed.
+
+    Returns:
+      (float): Seconds waited.
+
+    """
+    waited = 0.0
+    while True:
+      with self._lock:
+        self._refill()
+        if self._tokens >= 1:
+          self._tokens -= 1
+          return waited
+        wait = (1 - self._tokens) / self.rate
+      time.sleep(wait)
+      waited += wait
+
+  def try_acquire(self):
+    """Take a request if allowed right now, without blocking. Used by asyncio
+    callers which wait with asyncio.sleep() instead.
+
+    Returns:
+      (float): 0 if the request was allowed, else seconds till it may be.
+
+    """
+    with self._lock:
+      self._refill()
+      if self._tokens >= 1:
+        self._tokens -= 1
+        return 0.0
+      return (1 - self._tokens) / self.rate
+
+  def headroom(self):
+    """Get the fraction of the burst capacity available right now.
+
+    Returns:
+      (float): Available tokens / capacity, between 0 and 1.
+
+    """
+    with self._lock:
+      self._refill()
+      return self._tokens / self.capacity
+
+  def _refill(self):
+    """Add the tokens earned since the last update. Caller holds the lock.
+    """
+    now = time.monotonic()
+    self._tokens = min(self.capacity,
+                       self._tokens + (now - self._updated_at) * self.rate)
+    self._updated_at = now
+
+def is_rate_limit_error(ex):
+  """Check whether an exception is a rate limit (HTTP 429) error of Kite.
+
+  Args:
+    ex(Exception): Exception raised by a KiteConnect call.
+
+  Returns:
+    (bool): True if the request was throttled.
+
+  """
+  return (getattr(ex, "code", None) == 429 or
+          "too many requests" in str(ex).lower())
+
+def call_with_backoff(func, *args, tries=5, delay=0.5, max_delay=8.0,
+                      **kwargs):
+  """Call a function, retrying with exponential backoff on rate limit errors
+  only. Any other error is raised immediately.
+
+  Args:
+    func(callable): Function to call.
+    tries(int): Maximum number of attempts.
+                Default: 5
+    delay(float): Seconds to wait before the first retry, doubled on every
+                  retry.
+                  Default: 0.5
+    max_delay(float): Maximum seconds to wait between attempts.
+                      Default: 8.0
+
+  Returns:
+    Return value of func.
+
+  """
+  for attempt in range(1, tries + 1):
+    try:
+      return func(*args, **kwargs)
+    except Exception as ex:
+      if attempt == tries or not is_rate_limit_error(ex):
+        raise
+      WARN("Rate limited, retrying in %ss: %s", delay, ex)
+      time.sleep(delay)
+      delay = min(delay * 2, max_delay)
@@ -0,0 +1,131 @@
+"""This modules contains the factory of connection-pooled KiteConnect objects
+and a thread-safe handle to share one of them across worker threads.
+
+All HTTP calls of a KiteConnect object go through its requests session, so
+sizing the session's connection pool to the number of worker threads keeps
+the connections alive between calls instead of paying a TCP and TLS handshake
+on every burst.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import threading
+
+import requests
+
+from kiteconnect import KiteConnect
+
+from config.connection_config import (KITE_POOL_CONNECTIONS, KITE_POOL_MAXSIZE,
+                                      KITE_POOL_BLOCK, KITE_CONNECT_TIMEOUT,
+                                      KITE_READ_TIMEOUT)
+from framework.connection.credentials import CREDENTIALS
+from framework.logging.logger import INFO
+
+def create_kite(api_key=None, access_token=None, root=None,
+                pool_maxsize=KITE_POOL_MAXSIZE,
+                timeout=(KITE_CONNECT_TIMEOUT, KITE_READ_TIMEOUT)):
+  """Create a KiteConnect object with a sized keep-alive connection pool.
+
+  Args:
+    api_key(str): Kite app api key.
+                  Default: None (CREDENTIALS['api_key'])
+    access_token(str): Access token of the trading session.
+                       Default: None (set later with set_access_token())
+    root(str): API root url, e.g. of a local stand-in server.
+               Default: None (Kite API)
+    pool_maxsize(int): Maximum keep-alive connections per host.
+                       Default: KITE_POOL_MAXSIZE
+    timeout(tuple): (connect, read) timeouts in seconds.
+                    Default: (KITE_CONNECT_TIMEOUT, KITE_READ_TIMEOUT)
+
+  Returns:
+    (obj): KiteConnect object.
+
+  """
+  kite = KiteConnect(api_key=api_key or CREDENTIALS['api_key'],
+                     access_token=access_token, root=root, timeout=timeout)
+
+  # Failed calls are retried by the framework wrappers, not by the adapter.
+  adapter = requests.adapters.HTTPAdapter(pool_connections=KITE_POOL_CONNECTIONS,
+                                          pool_maxsize=pool_maxsize,
+                                          pool_block=KITE_POOL_BLOCK,
+                                          max_retries=0)
+  session = requests.Session()
+  session.mount("https://", adapter)
+  session.mount("http://", adapter)
+  session.headers["Connection"] = "keep-alive"
+  kite.reqsession = session
+  return kite
+
+class KiteClient(object):
+  """Thread-safe handle of a shared, connection-pooled KiteConnect object.
+
+  The KiteConnect object is created on first use and can be passed wherever
+  the framework expects a kite object, as the handle forwards attribute
+  access to it.
+  """
+  def __init__(self, factory=None):
+    """Initialize KiteClient object.
+
+    Args:
+      factory(callable): Returns a logged in KiteConnect object.
+                         Default: None (generate_session)
+    """
+    self._factory = factory
+    self._kite = None
+    self._lock = threading.Lock()
+
+  def get(self):
+    """Get the shared KiteConnect object, logging in on first use.
+
+    Returns:
+      (obj): KiteConnect object.
+
+    """
+    kite = self._kite
+    if kite is None:
+      with self._lock:
+        if self._kite is None:
+          if self._factory is None:
+            # Imported here as connect imports this module.
+            from framework.connection.connect import generate_session
+            self._factory = generate_session
+          self._kite = self._factory()
+          INFO("Created shared Kite client")
+        kite = self._kite
+    return kite
+
+  def reset(self):
+    """Drop the shared KiteConnect object, e.g. after its access token
+    expired, so that the next call logs in again.
+    """
+    with self._lock:
+      kite, self._kite = self._kite, None
+    if kite is not None:
+      kite.reqsession.close()
+
+  def __getattr__(self, name):
+    """Forward attribute access to the shared KiteConnect object.
+
+    Args:
+      name(str): Attribute name.
+
+    Returns:
+      Attribute of the KiteConnect object.
+
+    """
+    if name.startswith("_"):
+      raise AttributeError(name)
+    return getattr(self.get(), name)
+
+_client = KiteClient()
+
+def get_kite_client():
+  """Get the process wide handle of the shared Kite client.
+
+  Returns:
+    (KiteClient): Kite client handle.
+
+  """
+  return _client
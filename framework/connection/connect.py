@@ -5,36 +5,100 @@ Author: Nikunj Soni (nks141197@gmail.com)
 """
 
 import os
-import time
+
+from urllib.parse import parse_qs, urlparse
 
 from kiteconnect import KiteConnect
-from selenium import webdriver
+from kiteconnect.exceptions import TokenException
 
+from config.connection_config import LOGIN_REDIRECT_TIMEOUT
+from framework.connection.client import create_kite
 from framework.connection.credentials import CREDENTIALS
 from framework.connection.html_attributes import CSS
+from framework.connection.token_cache import TokenCache
 from framework.logging.logger import DEBUG,INFO
 
-def generate_session():
+def generate_session(use_cache=True):
   """Generates a kite trading session.
-  
+
+  The access token cached by an earlier login is reused while it's valid, the
+  browser login is done only if there is no valid cached token.
+
+  Args:
+    use_cache(bool): Whether to reuse and cache the access token.
+                     Default: True
+
   Returns:
-    (obj): KiteConnect object.
+    (obj): KiteConnect object with a keep-alive connection pool.
+  """
+  # Create connection-pooled Kite object.
+  kite = create_kite()
+  if not use_cache:
+    return _login(kite)
+
+  cache = TokenCache(CREDENTIALS['api_key'])
+  if _use_cached_token(kite, cache):
+    return kite
+
+  # Only one process logs in at a time, the others reuse its token.
+  with cache.login_lock():
+    if _use_cached_token(kite, cache):
+      return kite
+    _login(kite, cache)
+  return kite
+
+def _use_cached_token(kite, cache):
+  """Set the cached access token on kite object if it's still valid.
+
+  Args:
+    kite(obj): KiteConnect object.
+    cache(TokenCache): Access token cache.
+
+  Returns:
+    (bool): True if a valid cached token was set.
+  """
+  access_token = cache.load()
+  if not access_token:
+    return False
+
+  # A cheap call to check that the token wasn't invalidated before expiry.
+  kite.set_access_token(access_token)
+  try:
+    profile = kite.profile()
+  except TokenException as ex:
+    INFO("Cached access token is invalid: %s", ex)
+    cache.clear()
+    kite.set_access_token(None)
+    return False
+  INFO("Reusing cached access token of user %s", profile.get('user_id'))
+  return True
+
+def _login(kite, cache=None):
+  """Login through the browser and generate kite trading session.
+
+  Args:
+    kite(obj): KiteConnect object.
+    cache(TokenCache): Access token cache to save the token in.
+                       Default: None (token is not cached)
+
+  Returns:
+    (obj): kite object with the access token set.
   """
   # Get request_token.
   request_token = _get_request_token()
-  INFO(f"Request token:{request_token}")
-  
+  DEBUG("Request token:%s", request_token)
+
   INFO("Generating trading session")
-  # Create Kite object and then generate kite trading session.
-  kite = KiteConnect(api_key=CREDENTIALS['api_key'])
-  data = kite.generate_session(request_token, 
+  data = kite.generate_session(request_token,
                                api_secret=CREDENTIALS['api_secret'])
-  
+
   # The access_token is vaild till 6am the next day.
-  INFO(f"Access token:{data['access_token']}")
+  INFO("Access token:%s...", data['access_token'][:4])
   kite.set_access_token(data["access_token"])
+  if cache is not None:
+    cache.save(data["access_token"], data.get("user_id"))
   return kite
-   
+
 def _get_request_token():
   """
   This method logins to the app created and returns the request_token from the 
@@ -43,6 +107,10 @@ def _get_request_token():
   Returns:
     (str): request_token.  
   """
+  # Selenium is imported only when a browser login is required.
+  from selenium import webdriver
+  from selenium.webdriver.support.ui import WebDriverWait
+
   kite = KiteConnect(api_key=CREDENTIALS['api_key'])
   # Start browser object.
   INFO("Starting browser")
@@ -72,12 +140,15 @@ def _get_request_token():
   pin = driver.find_element_by_css_selector(CSS['pin'])
   pin.send_keys(CREDENTIALS['pin'])
   driver.find_element_by_css_selector(CSS['login']).click()
-  time.sleep(10)
-  
+
+  # Wait till the browser is redirected to the app with the request token.
+  WebDriverWait(driver, LOGIN_REDIRECT_TIMEOUT).until(
+    lambda d: "request_token=" in d.current_url)
+
   # Get request token from redirect_url.
-  # The request_token is valid for few minutes only, hence generate trading 
+  # The request_token is valid for few minutes only, hence generate trading
   # session immediately after getting the request_token.
-  request_token=driver.current_url.split('=')[1].split('&action')[0]
+  query = parse_qs(urlparse(driver.current_url).query)
+  request_token = query["request_token"][0]
   driver.quit()
   return request_token
-  
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""This modules contains the on-disk cache of the Kite access token.
+
+The access token is valid till 6 AM the next day, so it's persisted with its
+expiry under $AUTOKITE_PATH/cache/token.json, readable by the owner only, and
+reused by every process started before it expires. A file lock serializes the
+browser logins of concurrent processes.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import json
+import os
+import threading
+
+from contextlib import contextmanager
+
+try:
+  import fcntl
+except ImportError:
+  # Not available on Windows, logins are then serialized per process only.
+  fcntl = None
+
+from config.connection_config import TOKEN_EXPIRY_TIME
+from framework.logging.logger import DEBUG, INFO, WARN
+
+class TokenCache(object):
+  """Persisted access token of a Kite app with its expiry.
+  """
+  def __init__(self, api_key, cache_dir=None):
+    """Initialize TokenCache object.
+
+    Args:
+      api_key(str): Kite app api key the token belongs to.
+      cache_dir(str): Directory of the token file.
+                      Default: $AUTOKITE_PATH/cache
+    """
+    if not cache_dir:
+      try:
+        cache_dir = os.path.join(os.environ.get('AUTOKITE_PATH'), 'cache')
+      except Exception:
+        raise Exception("AUTOKITE_PATH environment variable is not defined")
+    self.api_key = api_key
+    self.path = os.path.join(cache_dir, "token.json")
+    self._lock_path = os.path.join(cache_dir, "token.lock")
+    self._thread_lock = threading.Lock()
+
+  def load(self):
+    """Get the cached access token if it's not expired.
+
+    Returns:
+      (str): Access token, None if missing, expired or of another app.
+
+    """
+    try:
+      with open(self.path) as f:
+        data = json.load(f)
+    except FileNotFoundError:
+      return None
+    except Exception as ex:
+      WARN("Ignoring unreadable token cache %s: %s", self.path, ex)
+      return None
+
+    if data.get("api_key") != self.api_key:
+      DEBUG("Cached token belongs to another api key")
+      return None
+    expiry = datetime.datetime.fromisoformat(data["expiry"])
+    if datetime.datetime.now() >= expiry:
+      INFO("Cached access token expired at %s", expiry)
+      return None
+    return data["access_token"]
+
+  def save(self, access_token, user_id=None, login_time=None):
+    """Persist an access token, readable and writable by the owner only.
+
+    Args:
+      access_token(str): Access token of the trading session.
+      user_id(str): Kite user id.
+                    Default: None
+      login_time(datetime): Time the token was generated.
+                            Default: None (now)
+    """
+    expiry = token_expiry(login_time)
+    data = {"api_key": self.api_key, "user_id": user_id,
+            "access_token": access_token, "expiry": expiry.isoformat()}
+    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+    tmp_path = self.path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+      json.dump(data, f)
+    os.replace(tmp_path, self.path)
+    INFO("Cached access token valid till %s", expiry)
+
+  def clear(self):
+    """Remove the cached access token.
+    """
+    try:
+      os.remove(self.path)
+    except FileNotFoundError:
+      pass
+
+  @contextmanager
+  def login_lock(self):
+    """Context manager held while logging in, so that concurrent processes
+    don't log in at the same time.
+    """
+    with self._thread_lock:
+      if fcntl is None:
+        yield
+        return
+      os.makedirs(os.path.dirname(self._lock_path), exist_ok=True)
+      with open(self._lock_path, "a") as lock_file:
+        DEBUG("Waiting for login lock %s", self._lock_path)
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+          yield
+        finally:
+          fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def token_expiry(login_time=None):
+  """Get the expiry of an access token, TOKEN_EXPIRY_TIME after login.
+
+  Args:
+    login_time(datetime): Time the token was generated.
+                          Default: None (now)
+
+  Returns:
+    (datetime): Expiry time.
+
+  """
+  login_time = login_time or datetime.datetime.now()
+  expiry = datetime.datetime.combine(
+    login_time.date(), datetime.time.fromisoformat(TOKEN_EXPIRY_TIME))
+  if expiry <= login_time:
+    expiry += datetime.timedelta(days=1)
+  return expiry
@@ -0,0 +1,156 @@
+"""This modules contains the on-disk cache of historical candles.
+
+Candles are persisted per (token, interval) under
+$AUTOKITE_PATH/cache/candles/<interval>/<token>.pkl as a DataFrame indexed by
+date, in the format returned by fetch_historical_ohlc().
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import os
+import threading
+
+import pandas as pd
+
+from framework.logging.logger import DEBUG
+
+class CandleCache(object):
+  """On-disk cache of candles per (token, interval).
+  """
+  def __init__(self, cache_dir=None):
+    """Initialize CandleCache object.
+
+    Args:
+      cache_dir(str): Directory to persist the candles.
+                      Default: $AUTOKITE_PATH/cache/candles
+    """
+    self.cache_dir = cache_dir
+    self._lock = threading.RLock()
+
+  def load(self, token, interval):
+    """Load the cached candles of a token.
+
+    Args:
+      token(int): instrument_token of instrument.
+      interval(str): Candle interval.
+
+    Returns:
+      (DataFrame): Cached candles indexed by date or None if not cached.
+
+    """
+    path = self._path(token, interval)
+    if not os.path.exists(path):
+      return None
+    return pd.read_pickle(path)
+
+  def save(self, token, interval, data):
+    """Replace the cached candles of a token.
+
+    Args:
+      token(int): instrument_token of instrument.
+      interval(str): Candle interval.
+      data(DataFrame): Candles indexed by date.
+
+    """
+    path = self._path(token, interval)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # Write to a temporary file first, so readers never see a partial file.
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    data.to_pickle(tmp_path)
+    with self._lock:
+      os.replace(tmp_path, path)
+    DEBUG("Cached %s %s candles of %s", len(data), interval, token)
+
+  def append(self, token, interval, data, from_date=None, to_date=None):
+    """Merge candles into the cache, newer rows replacing cached ones.
+
+    Args:
+      token(int): instrument_token of instrument.
+      interval(str): Candle interval.
+      data(DataFrame): Candles indexed by date.
+      from_date(datetime): Start date the candles were fetched from.
+                           Default: None
+      to_date(datetime): End date the candles were fetched till. The range
+                         is kept in attrs["ranges"] so that neither a gap
+                         between fetches is taken as cached nor a range
+                         without candles (e.g. before listing) is fetched
+                         again.
+                         Default: None
+
+    Returns:
+      (DataFrame): All cached candles of the token.
+
+    """
+    with self._lock:
+      cached = self.load(token, interval)
+      ranges = covered_ranges(cached)
+      if cached is not None and not cached.empty:
+        data = pd.concat([cached, data])
+        data = data[~data.index.duplicated(keep="last")].sort_index()
+      if from_date is not None and to_date is not None:
+        ranges = _merge_ranges(ranges + [(from_date, to_date)])
+      data.attrs = {"ranges": ranges} if ranges else {}
+      self.save(token, interval, data)
+    return data
+
+  def _path(self, token, interval):
+    """Get the cache file path of a token.
+
+    Args:
+      token(int): instrument_token of instrument.
+      interval(str): Candle interval.
+
+    Returns:
+      (str): Cache file path.
+
+    """
+    if not self.cache_dir:
+      try:
+        self.cache_dir = os.path.join(os.environ.get('AUTOKITE_PATH'),
+                                      'cache', 'candles')
+      except Exception:
+        raise Exception("AUTOKITE_PATH environment variable is not defined")
+    return os.path.join(self.cache_dir, interval, f"{int(token)}.pkl")
+
+def covered_ranges(cached):
+  """Get the date ranges fetched into cached candles.
+
+  Args:
+    cached(DataFrame): Cached candles indexed by date or None.
+
+  Returns:
+    (list): Sorted, non-overlapping (start, end) datetime tuples.
+
+  """
+  if cached is None:
+    return []
+  if "ranges" in cached.attrs:
+    return list(cached.attrs["ranges"])
+  if cached.empty:
+    return []
+  # Caches written before the ranges were kept cover a single range.
+  first = pd.Timestamp(cached.index[0]).tz_localize(None).to_pydatetime()
+  last = pd.Timestamp(cached.index[-1]).tz_localize(None).to_pydatetime()
+  return [(cached.attrs.get("from_date", first), last)]
+
+def _merge_ranges(ranges):
+  """Merge overlapping and adjacent date ranges.
+
+  Args:
+    ranges(list): (start, end) datetime tuples.
+
+  Returns:
+    (list): Sorted, non-overlapping (start, end) datetime tuples.
+
+  """
+  merged = []
+  for start, end in sorted(ranges):
+    # Consecutive fetch chunks are a second apart.
+    if merged and start <= merged[-1][1] + datetime.timedelta(seconds=1):
+      merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+    else:
+      merged.append((start, end))
+  return merged
@@ -1,15 +1,47 @@
 """This modules contains methods to get historical data.
 
+The requested range is split into chunks allowed by the historical data API
+for the interval, chunks are fetched concurrently under a shared rate limiter
+and candles are cached on disk, so later calls only fetch the missing part.
+
 Date Created: 6-Sept-2020
 Author: Nikunj Soni (nks141197@gmail.com)
 """
 
+import concurrent.futures
 import datetime as dt
 import pandas as pd
 
-from framework.logging.logger import DEBUG, INFO
+from framework.common.metrics import METRICS, measure
+from framework.common.rate_limiter import RateLimiter, call_with_backoff
+from framework.historical.candle_cache import CandleCache, covered_ranges
+from framework.logging.logger import DEBUG, ERROR, INFO
+
+# Maximum days of candles per historical data request for each interval.
+MAX_DAYS_PER_REQUEST = {
+  "minute": 60,
+  "3minute": 100,
+  "5minute": 100,
+  "10minute": 100,
+  "15minute": 200,
+  "30minute": 200,
+  "60minute": 400,
+  "day": 2000
+}
+
+# Historical data API allows 3 requests per second.
+HISTORICAL_RATE_LIMIT = 3
 
-def fetch_historical_ohlc(kite, instrument, start_date, interval):
+CANDLE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+# Rate limiter and candle cache shared by all historical data requests.
+_limiter = RateLimiter(HISTORICAL_RATE_LIMIT)
+METRICS.register_limiter("historical", _limiter)
+_cache = CandleCache()
+
+def fetch_historical_ohlc(kite, instrument, start_date, interval,
+                          end_date=None, use_cache=True,
+                          workers=HISTORICAL_RATE_LIMIT):
   """
   Fetch historical data for given instrument from start_date to present date
   for given interval.
@@ -17,38 +49,281 @@ def fetch_historical_ohlc(kite, instrument, start_date, interval):
   Args:
     kite(obj): KiteConnect object.
     instrument(int): instrument_token of instrument.
-    start_date(str): date in format (dd-mm-yyyy).
+    start_date(str|datetime): date in format (dd-mm-yyyy), or the time of
+                              the first candle.
     interval(str): interval between consecutive data rows.
+    end_date(str|datetime): last date in format (dd-mm-yyyy), or the time of
+                            the last candle.
+                            Default: None (present date)
+    use_cache(bool): Whether to fetch only the candles missing in the on-disk
+                     cache and update it.
+                     Default: True
+    workers(int): Number of chunks fetched concurrently.
+                  Default: HISTORICAL_RATE_LIMIT
 
   Returns:
     (DataFrame): DataFrame with (time, open, high, low, close, volume) columns.
 
   """
-  INFO(f"Getting historical data for {instrument} from {start_date} with "
-       f"interval {interval}")
-  from_date = dt.datetime.strptime(start_date, '%d-%m-%Y')
-  data = pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume'])
-
-  while True:
-    if from_date.date() >= (dt.date.today() - dt.timedelta(100)):
-      to_date = dt.date.today()
-      DEBUG(f"Loop start-end date:{from_date.strftime('%d-%m-%Y')}-"
-            f"{to_date.strftime('%d-%m-%Y')}")
-      data = data.append(pd.DataFrame(kite.historical_data(instrument,
-                                                           from_date,
-                                                           to_date,
-                                                           interval)),
-                         ignore_index=True)
+  INFO("Getting historical data for %s from %s with interval %s", instrument,
+       start_date, interval)
+  results, errors = _fetch_bulk(kite, [instrument], start_date, end_date,
+                                interval, use_cache, workers)
+  if errors:
+    raise errors[instrument]
+  return results[instrument]
+
+def fetch_historical_ohlc_bulk(kite, instruments, start_date, interval,
+                               end_date=None, use_cache=True, as_long=False,
+                               workers=2 * HISTORICAL_RATE_LIMIT):
+  """
+  Fetch historical data for many instruments from start_date to end_date for
+  given interval. Requests of all (instrument, chunk) pairs share the global
+  historical data rate limiter, so throughput is bounded by the API quota.
+
+  Args:
+    kite(obj): KiteConnect object.
+    instruments(list): instrument_tokens of instruments.
+    start_date(str|datetime): date in format (dd-mm-yyyy), or the time of
+                              the first candle.
+    interval(str): interval between consecutive data rows.
+    end_date(str|datetime): last date in format (dd-mm-yyyy), or the time of
+                            the last candle.
+                            Default: None (present date)
+    use_cache(bool): Whether to fetch only the candles missing in the on-disk
+                     cache and update it.
+                     Default: True
+    as_long(bool): Whether to return a single long-format DataFrame.
+                   Default: False
+    workers(int): Number of requests in flight.
+                  Default: 2 * HISTORICAL_RATE_LIMIT
+
+  Returns:
+    (dict|DataFrame): {instrument: DataFrame} with (time, open, high, low,
+                      close, volume) columns or, if as_long, a single
+                      DataFrame with an additional instrument column.
+                      Instruments which failed are logged and left out.
+
+  """
+  INFO("Getting historical data for %s instruments from %s with interval %s",
+       len(instruments), start_date, interval)
+  results, errors = _fetch_bulk(kite, instruments, start_date, end_date,
+                                interval, use_cache, workers)
+  for instrument, ex in errors.items():
+    ERROR("Error occurred while getting historical data for %s:%s", instrument,
+          ex)
+
+  if not as_long:
+    return results
+  frames = [data.assign(instrument=instrument)
+            for instrument, data in results.items()]
+  if not frames:
+    return pd.DataFrame(columns=CANDLE_COLUMNS + ['instrument'])
+  return pd.concat(frames).reset_index()
+
+def _fetch_bulk(kite, instruments, start_date, end_date, interval, use_cache,
+                workers):
+  """Fetch the candles of instruments, scheduling all chunks on one pool.
+
+  Args:
+    kite(obj): KiteConnect object.
+    instruments(list): instrument_tokens of instruments.
+    start_date(str|datetime): date in format (dd-mm-yyyy) or first time.
+    end_date(str|datetime): last date in format (dd-mm-yyyy), last time or
+                            None.
+    interval(str): interval between consecutive data rows.
+    use_cache(bool): Whether to use and update the on-disk cache.
+    workers(int): Number of requests in flight.
+
+  Returns:
+    (tuple): ({instrument: DataFrame}, {instrument: Exception}).
+
+  """
+  from_date = _to_datetime(start_date)
+  if isinstance(end_date, dt.datetime):
+    to_date = end_date
+  elif end_date:
+    to_date = _to_datetime(end_date) + dt.timedelta(days=1, seconds=-1)
+  else:
+    to_date = dt.datetime.now()
+
+  results, errors = {}, {}
+  with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+    futures = {}
+    for instrument in instruments:
+      cached = _cache.load(instrument, interval) if use_cache else None
+      futures[instrument] = [
+        executor.submit(_fetch_chunk, kite, instrument, chunk_start,
+                        chunk_end, interval)
+        for range_start, range_end in _missing_ranges(cached, from_date,
+                                                      to_date)
+        for chunk_start, chunk_end in _date_chunks(range_start, range_end,
+                                                   interval)]
+
+    for instrument, chunk_futures in futures.items():
+      try:
+        data = _concat_candles([future.result() for future in chunk_futures])
+      except Exception as ex:
+        errors[instrument] = ex
+        continue
+      if use_cache:
+        data = _cache.append(instrument, interval, data, from_date=from_date,
+                             to_date=to_date)
+      results[instrument] = _slice_candles(data, from_date, to_date)
+  return results, errors
+
+def _to_datetime(date):
+  """Parse a date argument.
+
+  Args:
+    date(str|datetime): date in format (dd-mm-yyyy) or a datetime.
+
+  Returns:
+    (datetime): Start of the date, or the datetime itself.
+
+  """
+  if isinstance(date, dt.datetime):
+    return date
+  return dt.datetime.strptime(date, '%d-%m-%Y')
+
+def _missing_ranges(cached, from_date, to_date):
+  """Get the date ranges not covered by the cached candles.
+
+  The last cached candle is fetched again as it may have been incomplete.
+
+  Args:
+    cached(DataFrame): Cached candles indexed by date or None.
+    from_date(datetime): Start of requested range.
+    to_date(datetime): End of requested range.
+
+  Returns:
+    (list): (start, end) datetime tuples.
+
+  """
+  covered = covered_ranges(cached)
+  if cached is not None and not cached.empty:
+    last = _naive(cached.index[-1])
+    covered = [(start, min(end, last)) if start <= last <= end else
+               (start, end) for start, end in covered]
+
+  ranges = []
+  start = from_date
+  for covered_start, covered_end in covered:
+    if covered_end < start:
+      continue
+    if covered_start >= to_date:
       break
-    else:
-      to_date = from_date + dt.timedelta(100)
-      DEBUG(f"Loop start-end date:{from_date.strftime('%d-%m-%Y')}-"
-            f"{to_date.strftime('%d-%m-%Y')}")
-      data = data.append(pd.DataFrame(kite.historical_data(instrument,
-                                                           from_date,
-                                                           to_date,
-                                                           interval)),
-                         ignore_index=True)
-      from_date = to_date
+    if start < covered_start:
+      ranges.append((start, covered_start))
+    start = max(start, covered_end)
+  if start < to_date:
+    ranges.append((start, to_date))
+  return ranges
+
+def _date_chunks(from_date, to_date, interval):
+  """Split a date range into chunks allowed per request for the interval.
+
+  Args:
+    from_date(datetime): Start of range.
+    to_date(datetime): End of range.
+    interval(str): interval between consecutive data rows.
+
+  Returns:
+    (list): (start, end) datetime tuples.
+
+  """
+  max_days = dt.timedelta(days=MAX_DAYS_PER_REQUEST.get(interval, 60))
+  chunks = []
+  while from_date < to_date:
+    chunk_end = min(from_date + max_days, to_date)
+    chunks.append((from_date, chunk_end))
+    from_date = chunk_end + dt.timedelta(seconds=1)
+  return chunks
+
+def _fetch_chunk(kite, instrument, from_date, to_date, interval):
+  """Fetch the candles of a chunk under the shared rate limiter, retrying
+  with backoff if the request is throttled.
+
+  Args:
+    kite(obj): KiteConnect object.
+    instrument(int): instrument_token of instrument.
+    from_date(datetime): Start of chunk.
+    to_date(datetime): End of chunk.
+    interval(str): interval between consecutive data rows.
+
+  Returns:
+    (list): list of candle dicts.
+
+  """
+  DEBUG("Loop start-end date:%s-%s", from_date.strftime('%d-%m-%Y'),
+        to_date.strftime('%d-%m-%Y'))
+  return call_with_backoff(_limited_historical_data, kite, instrument,
+                           from_date, to_date, interval)
+
+def _limited_historical_data(kite, instrument, from_date, to_date, interval):
+  """Call the historical data API once a request is allowed by the shared
+  rate limiter.
+
+  Args:
+    kite(obj): KiteConnect object.
+    instrument(int): instrument_token of instrument.
+    from_date(datetime): Start of chunk.
+    to_date(datetime): End of chunk.
+    interval(str): interval between consecutive data rows.
+
+  Returns:
+    (list): list of candle dicts.
+
+  """
+  _limiter.acquire()
+  # Time the request only, not the wait for the rate limiter.
+  with measure("historical_data"):
+    return kite.historical_data(instrument, from_date, to_date, interval)
+
+def _concat_candles(frames):
+  """Build a single DataFrame out of fetched chunks.
+
+  Args:
+    frames(list): list of lists of candle dicts.
+
+  Returns:
+    (DataFrame): Candles indexed by date.
+
+  """
+  rows = [candle for frame in frames for candle in frame]
+  data = pd.DataFrame(rows, columns=CANDLE_COLUMNS)
+  data = data.drop_duplicates(subset="date", keep="last")
   data.set_index("date", inplace=True)
-  return data
+  return data.sort_index()
+
+def _slice_candles(data, from_date, to_date):
+  """Get the candles between from_date and to_date.
+
+  Args:
+    data(DataFrame): Candles indexed by date.
+    from_date(datetime): Start of range.
+    to_date(datetime): End of range.
+
+  Returns:
+    (DataFrame): Candles in range.
+
+  """
+  if data.empty:
+    return data
+  tz = getattr(data.index, "tz", None)
+  start, end = pd.Timestamp(from_date), pd.Timestamp(to_date)
+  if tz is not None:
+    start, end = start.tz_localize(tz), end.tz_localize(tz)
+  return data.loc[start:end]
+
+def _naive(ts):
+  """Convert a candle timestamp to naive local datetime.
+
+  Args:
+    ts(Timestamp): Candle timestamp, exchange timezone aware.
+
+  Returns:
+    (datetime): Naive datetime.
+
+  """
+  return pd.Timestamp(ts).tz_localize(None).to_pydatetime()
@@ -0,0 +1,271 @@
+"""This modules contains the asynchronous logging handler and listener.
+
+Logging threads only push records into a bounded queue, a background listener
+thread formats them and writes them in batches to the log file (rotated on
+size and time) and the console. When the queue fills up, records are dropped
+as per the overflow policy instead of blocking the logging thread.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import glob
+import logging
+import os
+import queue
+import threading
+import time
+
+# Overflow policies of BoundedQueueHandler.
+# drop_debug: DEBUG records are dropped once the queue is past its high water
+#             mark, any record is dropped once it is full.
+# drop_new: Any record is dropped once the queue is full.
+# block: Logging threads wait for space in the queue.
+OVERFLOW_POLICIES = ("drop_debug", "drop_new", "block")
+
+class BoundedQueueHandler(logging.Handler):
+  """Logging handler which pushes records into a bounded queue.
+  """
+  def __init__(self, log_queue, overflow="drop_debug", high_water=0.8):
+    """Initialize BoundedQueueHandler object.
+
+    Args:
+      log_queue(queue.Queue): Bounded queue drained by AsyncLogListener.
+      overflow(str): Overflow policy, one of OVERFLOW_POLICIES.
+                     Default: "drop_debug"
+      high_water(float): Fraction of the queue after which DEBUG records are
+                         dropped with "drop_debug" policy.
+                         Default: 0.8
+    """
+    super(BoundedQueueHandler, self).__init__()
+    if overflow not in OVERFLOW_POLICIES:
+      raise Exception(f"Unknown overflow policy:{overflow}")
+    self.queue = log_queue
+    self.overflow = overflow
+    self._debug_limit = int(log_queue.maxsize * high_water)
+    # Dropped records per level name.
+    self.dropped = {}
+
+  def emit(self, record):
+    """Push a record into the queue without blocking.
+
+    Args:
+      record(logging.LogRecord): Record to be logged.
+    """
+    if (self.overflow == "drop_debug" and record.levelno <= logging.DEBUG and
+        self.queue.qsize() >= self._debug_limit):
+      self._drop(record)
+      return
+
+    try:
+      # Merge the args now, they may be mutated by the caller later.
+      record.msg = record.getMessage()
+      record.args = None
+      if record.exc_info:
+        record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+      if self.overflow == "block":
+        self.queue.put(record)
+      else:
+        self.queue.put_nowait(record)
+    except queue.Full:
+      self._drop(record)
+    except Exception:
+      self.handleError(record)
+
+  def _drop(self, record):
+    """Count a dropped record.
+
+    Args:
+      record(logging.LogRecord): Dropped record.
+    """
+    self.dropped[record.levelname] = self.dropped.get(record.levelname, 0) + 1
+
+class QueueStream(object):
+  """File-like object which pushes raw text into the log queue, used to tee
+  stderr into the log file.
+  """
+  closed = False
+
+  def __init__(self, log_queue):
+    """Initialize QueueStream object.
+
+    Args:
+      log_queue(queue.Queue): Bounded queue drained by AsyncLogListener.
+    """
+    self.queue = log_queue
+
+  def write(self, msg):
+    """Push the text into the queue, dropped if the queue is full.
+
+    Args:
+      msg(str): Text to be written.
+    """
+    try:
+      self.queue.put_nowait(msg)
+    except queue.Full:
+      pass
+
+  def flush(self):
+    """Nothing to flush, the listener writes the text.
+    """
+
+class AsyncLogListener(object):
+  """Background thread which writes queued records in batches.
+  """
+  def __init__(self, log_queue, formatter, log_path=None, console_stream=None,
+               batch_size=512, flush_interval=0.5, max_bytes=100 * 1024 * 1024,
+               rotate_interval=86400, backup_count=10):
+    """Initialize AsyncLogListener object.
+
+    Args:
+      log_queue(queue.Queue): Queue filled by BoundedQueueHandler.
+      formatter(logging.Formatter): Formatter of the records.
+      log_path(str): Log file to write to.
+                     Default: None (no log file)
+      console_stream(object): Stream to echo the records to.
+                              Default: None (no console)
+      batch_size(int): Maximum records written at once.
+                       Default: 512
+      flush_interval(float): Maximum seconds a record waits to be written.
+                             Default: 0.5
+      max_bytes(int): Log file size after which it's rotated.
+                      Default: 100MB
+      rotate_interval(int): Seconds after which the log file is rotated, 86400
+                            rotates it at midnight.
+                            Default: 86400
+      backup_count(int): Number of rotated log files kept.
+                         Default: 10
+    """
+    self.queue = log_queue
+    self.formatter = formatter
+    self.log_path = log_path
+    self.console_stream = console_stream
+    self.batch_size = batch_size
+    self.flush_interval = flush_interval
+    self.max_bytes = max_bytes
+    self.rotate_interval = rotate_interval
+    self.backup_count = backup_count
+    self._file = None
+    self._rollover_at = None
+    self._stop_event = threading.Event()
+    self._thread = None
+
+  def start(self):
+    """Open the log file and start the listener thread.
+    """
+    if self.log_path:
+      self._open()
+    self._thread = threading.Thread(target=self._run, name="AsyncLogListener",
+                                    daemon=True)
+    self._thread.start()
+
+  def stop(self):
+    """Write the queued records and stop the listener thread.
+    """
+    if self._thread is None:
+      return
+    self._stop_event.set()
+    self._thread.join()
+    self._thread = None
+    if self._file is not None:
+      self._file.close()
+      self._file = None
+
+  def _run(self):
+    """Listener thread loop.
+    """
+    while True:
+      batch = self._collect_batch()
+      if batch:
+        self._write(batch)
+      elif self._stop_event.is_set():
+        break
+
+  def _collect_batch(self):
+    """Collect queued items till batch size or flush interval.
+
+    Returns:
+      (list): list of LogRecords and raw text.
+
+    """
+    batch = []
+    deadline = time.monotonic() + self.flush_interval
+    while len(batch) < self.batch_size:
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        break
+      try:
+        if self._stop_event.is_set():
+          batch.append(self.queue.get_nowait())
+        else:
+          batch.append(self.queue.get(timeout=remaining))
+      except queue.Empty:
+        break
+    return batch
+
+  def _write(self, batch):
+    """Format a batch and write it with a single write per stream.
+
+    Args:
+      batch(list): list of LogRecords and raw text.
+    """
+    lines = []
+    for item in batch:
+      if isinstance(item, str):
+        lines.append(item)
+      else:
+        try:
+          lines.append(self.formatter.format(item) + "\n")
+        except Exception:
+          lines.append(f"Unformattable log record:{item.msg}\n")
+    text = "".join(lines)
+
+    if self.console_stream is not None:
+      self.console_stream.write(text)
+      self.console_stream.flush()
+    if self._file is not None:
+      if self._should_rotate():
+        self._rotate()
+      self._file.write(text)
+      self._file.flush()
+
+  def _open(self):
+    """Open the log file for appending and schedule the next time rotation.
+    """
+    self._file = open(self.log_path, "a")
+    now = datetime.datetime.now()
+    if self.rotate_interval == 86400:
+      self._rollover_at = datetime.datetime.combine(
+        now.date() + datetime.timedelta(days=1), datetime.time())
+    else:
+      self._rollover_at = now + datetime.timedelta(seconds=self.rotate_interval)
+
+  def _should_rotate(self):
+    """Check whether the log file is due for rotation.
+
+    Returns:
+      (bool): True if the size or time limit is reached.
+
+    """
+    return (self._file.tell() >= self.max_bytes or
+            datetime.datetime.now() >= self._rollover_at)
+
+  def _rotate(self):
+    """Rename the log file with a timestamp suffix, reopen it and remove
+    the oldest backups.
+    """
+    self._file.close()
+    # Microseconds keep apart the backups of rotations within a second.
+    suffix = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    backup_path = f"{self.log_path}.{suffix}"
+    count = 0
+    while os.path.exists(backup_path):
+      count += 1
+      backup_path = f"{self.log_path}.{suffix}-{count}"
+    os.replace(self.log_path, backup_path)
+    backups = sorted(glob.glob(f"{glob.escape(self.log_path)}.*"))
+    for backup in backups[:max(0, len(backups) - self.backup_count)]:
+      os.remove(backup)
+    self._open()
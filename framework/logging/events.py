@@ -0,0 +1,229 @@
+"""This modules contains the structured event log of AutoKite.
+
+Events are written as compact JSON lines with typed fields alongside the text
+log, one file per day under $AUTOKITE_PATH/logs/events, so that latencies can
+be analysed without parsing the text log:
+
+  EVENT("order_placed", instrument="NSE:INFY", order_id=oid, latency_ms=12.3)
+  events = read_events()    # Today's events as a DataFrame.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import atexit
+import datetime
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+from framework.logging.logger import ERROR
+
+# Typed fields of every event, extra keyword fields are written as given.
+EVENT_FIELDS = ("ts", "event", "instrument", "order_id", "latency_ms",
+                "thread")
+
+# Bytes buffered before the events are written to the file.
+EVENT_BUFFER_SIZE = 64 * 1024
+
+_encoder = json.JSONEncoder(separators=(",", ":"), default=str)
+
+class EventLog(object):
+  """Thread-safe writer of JSON-lines event files, rolled over daily.
+  """
+  def __init__(self, log_dir=None, buffer_size=EVENT_BUFFER_SIZE):
+    """Initialize EventLog object. The file is opened on first event.
+
+    Args:
+      log_dir(str): Directory of the event files.
+                    Default: None ($AUTOKITE_PATH/logs/events)
+      buffer_size(int): Bytes buffered before writing to the file.
+                        Default: EVENT_BUFFER_SIZE
+    """
+    self.log_dir = log_dir or _default_event_dir()
+    self.buffer_size = buffer_size
+    self._file = None
+    self._day = None
+    self._lock = threading.Lock()
+
+  def emit(self, event, instrument=None, order_id=None, latency_ms=None,
+           **fields):
+    """Write an event. Fields which are None are left out.
+
+    Args:
+      event(str): Event name.
+      instrument(str): Instrument of the event.
+                       Default: None
+      order_id(str): Order id of the event.
+                     Default: None
+      latency_ms(float): Latency of the call in milliseconds.
+                         Default: None
+      fields: Extra fields of the event.
+    """
+    now = time.time()
+    record = {"ts": round(now, 6), "event": event,
+              "thread": threading.current_thread().name}
+    if instrument is not None:
+      record["instrument"] = instrument
+    if order_id is not None:
+      record["order_id"] = order_id
+    if latency_ms is not None:
+      record["latency_ms"] = round(latency_ms, 3)
+    if fields:
+      record.update(fields)
+    line = _encoder.encode(record) + "\n"
+
+    with self._lock:
+      day = datetime.date.fromtimestamp(now)
+      if day != self._day:
+        self._open(day)
+      self._file.write(line)
+
+  def flush(self):
+    """Write the buffered events to the file.
+    """
+    with self._lock:
+      if self._file is not None:
+        self._file.flush()
+
+  def close(self):
+    """Flush and close the event file.
+    """
+    with self._lock:
+      if self._file is not None:
+        self._file.close()
+        self._file = None
+        self._day = None
+
+  def _open(self, day):
+    """Open the event file of a day for appending. Caller holds the lock.
+
+    Args:
+      day(date): Day of the events.
+    """
+    if self._file is not None:
+      self._file.close()
+    if not os.path.exists(self.log_dir):
+      os.makedirs(self.log_dir)
+    self._file = open(event_file(day, self.log_dir), "a",
+                      buffering=self.buffer_size)
+    self._day = day
+
+_event_log = None
+_event_log_lock = threading.Lock()
+
+def get_event_log():
+  """Get the process wide event log, created on first use. Events are
+  disabled if AUTOKITE_PATH environment variable is not defined.
+
+  Returns:
+    (EventLog): Event log, None if events are disabled.
+
+  """
+  global _event_log
+  if _event_log is None and os.environ.get('AUTOKITE_PATH'):
+    with _event_log_lock:
+      if _event_log is None:
+        _event_log = EventLog()
+  return _event_log
+
+def EVENT(event, instrument=None, order_id=None, latency_ms=None, **fields):
+  """Write an event to the process wide event log.
+
+  Args:
+    event(str): Event name.
+    instrument(str): Instrument of the event.
+                     Default: None
+    order_id(str): Order id of the event.
+                   Default: None
+    latency_ms(float): Latency of the call in milliseconds.
+                       Default: None
+    fields: Extra fields of the event.
+  """
+  # Events are diagnostics, a failure to write them (e.g. a full disk) must
+  # never fail the caller, such as an order which was already placed.
+  try:
+    event_log = get_event_log()
+    if event_log is not None:
+      event_log.emit(event, instrument, order_id, latency_ms, **fields)
+  except Exception as ex:
+    ERROR("Error while writing event %s: %s", event, ex)
+
+def close_event_log():
+  """Flush and close the process wide event log, if open.
+  """
+  if _event_log is not None:
+    _event_log.close()
+
+def event_file(day=None, log_dir=None):
+  """Get the event file path of a day.
+
+  Args:
+    day(date): Day of the events.
+               Default: None (today)
+    log_dir(str): Directory of the event files.
+                  Default: None ($AUTOKITE_PATH/logs/events)
+
+  Returns:
+    (str): Event file path.
+
+  """
+  day = day or datetime.date.today()
+  return os.path.join(log_dir or _default_event_dir(),
+                      f"events-{day.isoformat()}.jsonl")
+
+def read_events(day=None, log_dir=None, events=None):
+  """Load the events of a day into a DataFrame.
+
+  Args:
+    day(date): Day of the events.
+               Default: None (today)
+    log_dir(str): Directory of the event files.
+                  Default: None ($AUTOKITE_PATH/logs/events)
+    events(list): Event names to keep.
+                  Default: None (all events)
+
+  Returns:
+    (DataFrame): Events with a local time "ts" column, at least the
+                 EVENT_FIELDS columns.
+
+  """
+  if isinstance(day, str):
+    day = datetime.date.fromisoformat(day)
+  path = event_file(day, log_dir)
+  # Events of this process may still be buffered.
+  if _event_log is not None:
+    _event_log.flush()
+  if not os.path.exists(path) or os.path.getsize(path) == 0:
+    return pd.DataFrame(columns=list(EVENT_FIELDS))
+
+  data = pd.read_json(path, lines=True, dtype={"order_id": str},
+                      convert_dates=False)
+  for field in EVENT_FIELDS:
+    if field not in data.columns:
+      data[field] = None
+  if events is not None:
+    data = data[data["event"].isin(events)]
+  # Epoch seconds to naive local time, same as the text log.
+  data["ts"] = (pd.to_datetime(data["ts"], unit="s", utc=True)
+                .dt.tz_convert(datetime.datetime.now().astimezone().tzinfo)
+                .dt.tz_localize(None))
+  return data.reset_index(drop=True)
+
+def _default_event_dir():
+  """Get the default event directory under $AUTOKITE_PATH.
+
+  Returns:
+    (str): Event directory.
+
+  """
+  try:
+    return os.path.join(os.environ.get('AUTOKITE_PATH'), 'logs', 'events')
+  except Exception:
+    raise Exception("AUTOKITE_PATH environment variable is not defined")
+
+# Write the buffered events before exit.
+atexit.register(close_event_log)
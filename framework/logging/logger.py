@@ -1,17 +1,30 @@
 """This is a customized logger module for AutoKite.
 
+The logging functions only do a level check when the level is disabled. When
+enabled, the caller is found with a single frame hop and messages are
+formatted lazily, so pass arguments %-style: INFO("LTP for %s:%s", ins, ltp).
+
+sublogger_name is keyword-only: INFO("Placed", sublogger_name="orders"). The
+old positional form INFO("Placed", "orders") still logs through the
+sub-logger when the message has no % placeholder, with a DeprecationWarning.
+
 Date Created: 2-Sept-2020
 Author: Nikunj Soni (nks141197@gmail.com)
 """
 
+import atexit
 import os
+import queue
 import sys
 import threading
-import traceback
+import warnings
 
 import logging
 import logging.config
 
+from framework.logging.async_handler import (AsyncLogListener,
+                                             BoundedQueueHandler, QueueStream)
+
 logging.addLevelName(logging.WARNING, 'WARN')
 
 def concat_thread_name(msg):
@@ -24,79 +37,96 @@ def concat_thread_name(msg):
   Returns:
     msg (str): Concatenated message.
   """
-  try:
-    if str(threading.current_thread().name) != "MainThread":
-      msg = " : ".join(["PID-"+str(os.getpid()),
-                        threading.current_thread().name,
-                        msg]).encode('utf-8')
-  except Exception:
+  thread = threading.current_thread()
+  if thread is threading.main_thread():
     return msg
-  return msg
+  return "PID-%d : %s : %s" % (os.getpid(), thread.name, msg)
 
-def ERROR(msg, sublogger_name=None):
+def ERROR(msg, *args, sublogger_name=None):
   """Logs an error message.
 
   Args:
     msg (str): The message to be logged.
-    sublogger_name (str): Name of the sub-logger to log through. If not
-      provided, the AutoKite logger will be used directly.
+    args: Arguments merged into msg using the % operator.
+    sublogger_name (str): Keyword-only name of the sub-logger to log
+      through. If not provided, the AutoKite logger will be used directly.
   """
-  logger = (logging.autokite_logger if sublogger_name is None
-            else _get_sublogger(name=sublogger_name))
-  logger.error(concat_thread_name(msg), extra=__extra())
+  if len(args) == 1:
+    args, sublogger_name = _positional_sublogger(msg, args, sublogger_name)
+  logger = _get_logger(sublogger_name)
+  if logger.isEnabledFor(logging.ERROR):
+    logger.error(msg, *args, extra=__extra())
 
-def WARN(msg, sublogger_name=None):
+def WARN(msg, *args, sublogger_name=None):
   """Logs a warning message.
 
   Args:
     msg (str): The message to be logged.
-    sublogger_name (str): Name of the sub-logger to log through. If not
-      provided, the AutoKite logger will be used directly.
+    args: Arguments merged into msg using the % operator.
+    sublogger_name (str): Keyword-only name of the sub-logger to log
+      through. If not provided, the AutoKite logger will be used directly.
   """
-  logger = (logging.autokite_logger if sublogger_name is None
-            else _get_sublogger(name=sublogger_name))
-  logger.warning(concat_thread_name(msg), extra=__extra())
+  if len(args) == 1:
+    args, sublogger_name = _positional_sublogger(msg, args, sublogger_name)
+  logger = _get_logger(sublogger_name)
+  if logger.isEnabledFor(logging.WARNING):
+    logger.warning(msg, *args, extra=__extra())
 
-def INFO(msg, sublogger_name=None):
+def INFO(msg, *args, sublogger_name=None):
   """Logs an info message.
 
   Args:
     msg (str): The message to be logged.
-    sublogger_name (str): Name of the sub-logger to log through. If not
-      provided, the AutoKite logger will be used directly.
+    args: Arguments merged into msg using the % operator.
+    sublogger_name (str): Keyword-only name of the sub-logger to log
+      through. If not provided, the AutoKite logger will be used directly.
   """
-  logger = (logging.autokite_logger if sublogger_name is None
-            else _get_sublogger(name=sublogger_name))
-  logger.info(concat_thread_name(msg), extra=__extra())
+  if len(args) == 1:
+    args, sublogger_name = _positional_sublogger(msg, args, sublogger_name)
+  logger = _get_logger(sublogger_name)
+  if logger.isEnabledFor(logging.INFO):
+    logger.info(msg, *args, extra=__extra())
 
-def DEBUG(msg, sublogger_name=None):
+def DEBUG(msg, *args, sublogger_name=None):
   """Logs a debug message.
 
   Args:
     msg (str): The message to be logged.
-    sublogger_name (str): Name of the sub-logger to log through. If not
-      provided, the AutoKite logger will be used directly.
+    args: Arguments merged into msg using the % operator.
+    sublogger_name (str): Keyword-only name of the sub-logger to log
+      through. If not provided, the AutoKite logger will be used directly.
   """
-  logger = (logging.autokite_logger if sublogger_name is None
-            else _get_sublogger(name=sublogger_name))
-  logger.debug(concat_thread_name(msg), extra=__extra())
+  if len(args) == 1:
+    args, sublogger_name = _positional_sublogger(msg, args, sublogger_name)
+  logger = _get_logger(sublogger_name)
+  if logger.isEnabledFor(logging.DEBUG):
+    logger.debug(msg, *args, extra=__extra())
 
-def CRITICAL(msg, sublogger_name=None):
+def CRITICAL(msg, *args, sublogger_name=None):
   """Logs a critical message.
 
   Args:
     msg (str): The message to be logged.
-    sublogger_name (str): Name of the sub-logger to log through. If not
-      provided, the AutoKite logger will be used directly.
+    args: Arguments merged into msg using the % operator.
+    sublogger_name (str): Keyword-only name of the sub-logger to log
+      through. If not provided, the AutoKite logger will be used directly.
   """
-  logger = (logging.autokite_logger if sublogger_name is None
-            else _get_sublogger(name=sublogger_name))
-  logger.critical(concat_thread_name(msg), extra=__extra())
+  if len(args) == 1:
+    args, sublogger_name = _positional_sublogger(msg, args, sublogger_name)
+  logger = _get_logger(sublogger_name)
+  if logger.isEnabledFor(logging.CRITICAL):
+    logger.critical(msg, *args, extra=__extra())
 
 def configure(log_dir=None, log_file='autokite.log',
-              console_only=False, level=logging.INFO):
+              console_only=False, level=logging.INFO, async_mode=False,
+              queue_size=10000, overflow="drop_debug",
+              max_bytes=100 * 1024 * 1024, backup_count=10):
   """Initializes and configures the loggers.
 
+  In async mode, logging threads only push the records into a bounded queue
+  and a background thread writes them to console and file in batches, rotating
+  the file on size and at midnight.
+
   Args:
     log_dir (str): The log folder where the logs will be created
                   Default is under $AutoKitePath/logs
@@ -106,6 +136,17 @@ def configure(log_dir=None, log_file='autokite.log',
                          Defaults to False.
     level (str): The log level.
                  Defaults to 'INFO'
+    async_mode (bool): Whether to write the logs from a background thread.
+                       Defaults to False.
+    queue_size (int): Maximum records queued in async mode.
+                      Defaults to 10000.
+    overflow (str): What to do when the queue is full in async mode
+                    ("drop_debug", "drop_new", "block").
+                    Defaults to "drop_debug".
+    max_bytes (int): Log file size after which it's rotated in async mode.
+                     Defaults to 100MB.
+    backup_count (int): Number of rotated log files kept in async mode.
+                        Defaults to 10.
   """
 
   # Create the loggers
@@ -113,6 +154,9 @@ def configure(log_dir=None, log_file='autokite.log',
 
   # Remove all existing handlers
   logging.autokite_logger.handlers = []
+  stop_async_logging()
+  if isinstance(sys.stderr, Tee):
+    sys.stderr = sys.stderr.stream1
 
   # Disable the root logger
   logging.getLogger().disabled = True
@@ -134,6 +178,10 @@ def configure(log_dir=None, log_file='autokite.log',
     os.environ['AUTOKITE_LOGDIR'] = log_dir
     os.environ['AUTOKITE_LOGFILE'] = log_file
 
+  if async_mode:
+    _configure_async(None if console_only else os.path.join(log_dir, log_file),
+                     queue_size, overflow, max_bytes, backup_count)
+  elif not console_only:
     # Add appropriate file_handler file path and formatter.
     fh = logging.FileHandler(os.path.join(log_dir, log_file), 'a')
     formatter = _get_autokite_formatter()
@@ -141,7 +189,51 @@ def configure(log_dir=None, log_file='autokite.log',
     fh.set_name('primary')
     logging.autokite_logger.addHandler(fh)
     sys.stderr = Tee(sys.stderr, fh.stream)
-    set_level(level)
+  set_level(level)
+
+def stop_async_logging():
+  """Write the queued records and stop the async log listener, if running.
+  """
+  listener = getattr(logging, 'autokite_listener', None)
+  if listener is not None:
+    logging.autokite_listener = None
+    listener.stop()
+
+def get_dropped_records():
+  """Get the number of records dropped in async mode.
+
+  Returns:
+    (dict): Dropped records per level name.
+  """
+  for handler in _get_logger().handlers:
+    if isinstance(handler, BoundedQueueHandler):
+      return dict(handler.dropped)
+  return {}
+
+def _configure_async(log_path, queue_size, overflow, max_bytes, backup_count):
+  """Replace the console handler with a queue handler and start the async
+  listener which writes to console and log file.
+
+  Args:
+    log_path (str): Log file path, None to log to console only.
+    queue_size (int): Maximum records queued.
+    overflow (str): Overflow policy of the queue.
+    max_bytes (int): Log file size after which it's rotated.
+    backup_count (int): Number of rotated log files kept.
+  """
+  console = logging.autokite_logger.handlers[0]
+  log_queue = queue.Queue(maxsize=queue_size)
+  listener = AsyncLogListener(log_queue, _get_autokite_formatter(),
+                              log_path=log_path, console_stream=console.stream,
+                              max_bytes=max_bytes, backup_count=backup_count)
+  listener.start()
+  logging.autokite_listener = listener
+
+  handler = BoundedQueueHandler(log_queue, overflow=overflow)
+  handler.set_name('async')
+  logging.autokite_logger.handlers = [handler]
+  if log_path:
+    sys.stderr = Tee(sys.stderr, QueueStream(log_queue))
 
 # Private class to write the stderr to both console and log file
 class Tee(object):
@@ -163,12 +255,16 @@ class Tee(object):
       msg(str): Message to be written.
     """
     self.stream1.write(msg)
-    self.stream2.write(msg)
+    # The file is closed by logging.shutdown() at exit.
+    if not self.stream2.closed:
+      self.stream2.write(msg)
 
   def flush(self):
     """Flush the messages written so far.
     """
-    self.stream2.flush()
+    self.stream1.flush()
+    if not self.stream2.closed:
+      self.stream2.flush()
 
 def set_level(level):
   """Sets the logging level to the desired one.
@@ -179,19 +275,22 @@ def set_level(level):
   Returns:
     None
   """
-  logging.autokite_logger.setLevel(level)
+  _get_logger().setLevel(level)
 
 def __extra():
-  """Function to pass the callers name and line number.
-  
+  """Function to pass the callers name, line number and thread details.
+
+  Must be called directly from a logging function, the caller of which is
+  looked up with a single frame hop.
+
   Returns:
-    A dictionary with 'file_line' details.
+    A dictionary with 'file_line' and 'thread_prefix' details.
   """
-  frame = traceback.extract_stack()[-3]
-  file_name = frame[0].split("/")[-1]
-  file_line = frame[1]
+  frame = sys._getframe(2)
   return {
-    'file_line': "%s:%s" % (file_name, file_line)
+    'file_line': "%s:%d" % (os.path.basename(frame.f_code.co_filename),
+                            frame.f_lineno),
+    'thread_prefix': concat_thread_name("")
   }
 
 def __set_default_config(level=logging.INFO):
@@ -219,7 +318,8 @@ def _get_autokite_formatter():
   
   # The formatter uses localtime for logging.
   formatter = logging.Formatter('%(asctime)s %(levelname)-5s %(file_line)s '
-                                '%(message)s', datefmt='%Y-%m-%d %H:%M:%S')
+                                '%(thread_prefix)s%(message)s',
+                                datefmt='%Y-%m-%d %H:%M:%S')
   return formatter
 
 def _get_sublogger(name):
@@ -233,4 +333,45 @@ def _get_sublogger(name):
   """
   return logging.getLogger("autokite-" + name)
 
-configure()
\ No newline at end of file
+def _positional_sublogger(msg, args, sublogger_name):
+  """Support the old (msg, sublogger_name) call form of the logging
+  functions, i.e. a single argument to a message without placeholders.
+
+  Args:
+    msg (str): The message to be logged.
+    args (tuple): Arguments of the logging function.
+    sublogger_name (str): sublogger_name of the logging function.
+
+  Returns:
+    (tuple): (args, sublogger_name) to log with.
+  """
+  if (sublogger_name is None and isinstance(args[0], str) and
+      not (isinstance(msg, str) and "%" in msg)):
+    warnings.warn("Pass sublogger_name as a keyword argument, the positional "
+                  "form is deprecated", DeprecationWarning, stacklevel=3)
+    return (), args[0]
+  return args, sublogger_name
+
+def _get_logger(sublogger_name=None):
+  """Obtain the AutoKite logger or a sub-logger to it.
+
+  The AutoKite logger is configured on first use, so that importing the
+  framework has no side effects. Logs go to console only if AUTOKITE_PATH
+  environment variable is not defined.
+
+  Args:
+    sublogger_name (str): Name of the sub-logger.
+
+  Returns:
+    logging.Logger
+  """
+  if sublogger_name is not None:
+    return _get_sublogger(name=sublogger_name)
+  logger = getattr(logging, 'autokite_logger', None)
+  if logger is None:
+    configure(console_only=not os.environ.get('AUTOKITE_PATH'))
+    logger = logging.autokite_logger
+  return logger
+
+# Write the queued records before exit in async mode.
+atexit.register(stop_async_logging)
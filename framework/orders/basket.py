@@ -0,0 +1,223 @@
+"""This modules contains parallel placement of basket orders.
+
+All legs of a basket are validated up front against the cached instrument
+master, then sent concurrently within the order rate limit, so a basket is
+entered in about one round trip instead of one per leg:
+
+  legs = [OrderSpec("NIFTY26OCTFUT", "buy", 75, exchange="NFO"),
+          OrderSpec("INFY", "sell", 10)]
+  for leg in place_basket(kite, legs):
+    print(leg.spec.instrument, leg.order_id, leg.error, leg.latency_ms)
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import concurrent.futures
+import time
+
+from collections import namedtuple
+
+from kiteconnect import KiteConnect
+
+from config.orders_config import (ORDER_RATE_LIMIT, BASKET_WORKERS,
+                                  FREEZE_QUANTITIES)
+from framework.common.instruments import get_instrument_master
+from framework.common.metrics import METRICS, measure
+from framework.common.rate_limiter import RateLimiter, call_with_backoff
+from framework.logging.events import EVENT
+from framework.logging.logger import ERROR, INFO
+from framework.orders.orders import EXCHANGE_MAP, TRANSACTION_TYPE_MAP
+
+# Order of a basket leg. type is "buy" or "sell", price is required for
+# LIMIT/SL and trigger_price for SL/SL-M orders.
+OrderSpec = namedtuple("OrderSpec", [
+  "instrument", "type", "quantity", "exchange", "order_type", "price",
+  "trigger_price", "product", "variety", "tag"])
+OrderSpec.__new__.__defaults__ = ("NSE", KiteConnect.ORDER_TYPE_MARKET, None,
+                                  None, KiteConnect.PRODUCT_MIS,
+                                  KiteConnect.VARIETY_REGULAR, None)
+
+# Result of a basket leg. order_id is None if the leg failed with error.
+# send_time and ack_time are epoch seconds, None if the leg wasn't sent.
+LegResult = namedtuple("LegResult", ["spec", "order_id", "error", "send_time",
+                                     "ack_time", "latency_ms"])
+
+# Rate limiter shared by all order requests.
+_order_limiter = RateLimiter(ORDER_RATE_LIMIT)
+METRICS.register_limiter("orders", _order_limiter)
+
+def place_basket(kite, orders, validate=True, all_or_none=True,
+                 workers=BASKET_WORKERS):
+  """Place the legs of a basket concurrently.
+
+  Args:
+    kite(obj): KiteConnect object.
+    orders(list): OrderSpecs or dicts with OrderSpec fields.
+    validate(bool): Whether to validate the legs against the instrument
+                    master before sending any.
+                    Default: True
+    all_or_none(bool): Whether to send nothing if any leg is invalid.
+                       Default: True
+    workers(int): Maximum legs in flight at once.
+                  Default: BASKET_WORKERS
+
+  Returns:
+    (list): LegResult of every leg, in the order of the legs.
+
+  """
+  specs = [order if isinstance(order, OrderSpec) else OrderSpec(**order)
+           for order in orders]
+  errors = [None] * len(specs)
+  if validate:
+    exchanges = tuple(sorted({spec.exchange for spec in specs}))
+    master = get_instrument_master(kite, exchanges)
+    errors = [validate_order(master, spec) for spec in specs]
+    invalid = sum(error is not None for error in errors)
+    if invalid:
+      ERROR("%s of %s basket legs are invalid: %s", invalid, len(specs),
+            [error for error in errors if error])
+      if all_or_none:
+        return [LegResult(spec, None, error or "Basket not sent", None, None,
+                          None) for spec, error in zip(specs, errors)]
+
+  results = [LegResult(spec, None, error, None, None, None)
+             for spec, error in zip(specs, errors)]
+  pending = [i for i, error in enumerate(errors) if error is None]
+  if not pending:
+    return results
+
+  start = time.perf_counter()
+  with concurrent.futures.ThreadPoolExecutor(
+      max_workers=min(workers, len(pending))) as executor:
+    futures = {i: executor.submit(_place_leg, kite, specs[i]) for i in pending}
+    for i, future in futures.items():
+      results[i] = future.result()
+  placed = sum(result.order_id is not None for result in results)
+  INFO("Placed %s of %s basket legs in %.1f ms", placed, len(specs),
+       (time.perf_counter() - start) * 1000)
+  return results
+
+def validate_order(master, spec):
+  """Validate an order against the instrument master.
+
+  Args:
+    master(InstrumentMaster): Loaded instrument master.
+    spec(OrderSpec): Order to validate.
+
+  Returns:
+    (str): Error message, None if the order is valid.
+
+  """
+  if spec.type not in TRANSACTION_TYPE_MAP:
+    return f"{spec.instrument}: unknown transaction type {spec.type}"
+  try:
+    instrument = master.by_symbol(spec.instrument, spec.exchange)
+  except KeyError:
+    return f"{spec.exchange}:{spec.instrument}: unknown instrument"
+
+  lot_size = int(instrument.get("lot_size") or 1)
+  if spec.quantity <= 0 or spec.quantity % lot_size:
+    return (f"{spec.instrument}: quantity {spec.quantity} is not a multiple "
+            f"of lot size {lot_size}")
+  freeze_quantity = FREEZE_QUANTITIES.get(instrument.get("name"))
+  if (freeze_quantity and spec.exchange in ("NFO", "BFO") and
+      spec.quantity > freeze_quantity):
+    return (f"{spec.instrument}: quantity {spec.quantity} exceeds freeze "
+            f"quantity {freeze_quantity}")
+
+  if spec.order_type in (KiteConnect.ORDER_TYPE_LIMIT,
+                         KiteConnect.ORDER_TYPE_SL) and not spec.price:
+    return f"{spec.instrument}: price is required for {spec.order_type} order"
+  if spec.order_type in (KiteConnect.ORDER_TYPE_SL,
+                         KiteConnect.ORDER_TYPE_SLM) and not spec.trigger_price:
+    return (f"{spec.instrument}: trigger price is required for "
+            f"{spec.order_type} order")
+  tick_size = float(instrument.get("tick_size") or 0)
+  for name, price in (("price", spec.price),
+                      ("trigger price", spec.trigger_price)):
+    if price and tick_size and not _is_multiple(price, tick_size):
+      return (f"{spec.instrument}: {name} {price} is not a multiple of tick "
+              f"size {tick_size}")
+  return None
+
+def _place_leg(kite, spec):
+  """Place a leg within the order rate limit, retrying if throttled.
+
+  Args:
+    kite(obj): KiteConnect object.
+    spec(OrderSpec): Order to place.
+
+  Returns:
+    (LegResult): Result of the leg.
+
+  """
+  instrument = f"{spec.exchange}:{spec.instrument}"
+  params = {"variety": spec.variety, "tradingsymbol": spec.instrument,
+            "exchange": EXCHANGE_MAP.get(spec.exchange, spec.exchange),
+            "transaction_type": TRANSACTION_TYPE_MAP[spec.type],
+            "quantity": spec.quantity, "order_type": spec.order_type,
+            "product": spec.product, "price": spec.price,
+            "trigger_price": spec.trigger_price, "tag": spec.tag}
+  params = {key: value for key, value in params.items() if value is not None}
+
+  # Send time of the last attempt.
+  sent = [None]
+  try:
+    order_id = call_with_backoff(_send_order, kite, params, sent, tries=3)
+  except Exception as ex:
+    ack_time = time.time()
+    send_time = sent[0]
+    latency_ms = (ack_time - send_time) * 1000 if send_time else None
+    ERROR("Error while placing basket leg %s: %s", instrument, ex)
+    EVENT("order_failed", instrument=instrument, latency_ms=latency_ms,
+          error=str(ex), tag=spec.tag)
+    return LegResult(spec, None, str(ex), send_time, ack_time, latency_ms)
+
+  ack_time = time.time()
+  send_time = sent[0]
+  latency_ms = (ack_time - send_time) * 1000
+  EVENT("order_placed", instrument=instrument, order_id=order_id,
+        latency_ms=latency_ms, type=spec.type, quantity=spec.quantity,
+        tag=spec.tag)
+  return LegResult(spec, order_id, None, send_time, ack_time, latency_ms)
+
+def _send_order(kite, params, sent):
+  """Send an order once it's allowed by the order rate limiter.
+
+  Args:
+    kite(obj): KiteConnect object.
+    params(dict): Arguments of kite.place_order.
+    sent(list): Its only item is set to the send time in epoch seconds.
+
+  Returns:
+    (str): order_id.
+
+  """
+  _order_limiter.acquire()
+  sent[0] = time.time()
+  with measure("place_order"):
+    resp = kite.place_order(**params)
+
+  # Unwrap the response if the client returns the status envelope.
+  if isinstance(resp, dict):
+    if resp.get("status", "success") != "success":
+      raise Exception(f"Status:{resp['status']}, "
+                      f"Error:{resp.get('error_type')}, "
+                      f"Error Message:{resp.get('message')}")
+    resp = resp.get("data", resp)["order_id"]
+  return resp
+
+def _is_multiple(value, step):
+  """Check whether a price is a multiple of the tick size.
+
+  Args:
+    value(float): Price.
+    step(float): Tick size.
+
+  Returns:
+    (bool): True if value is a multiple of step.
+
+  """
+  ratio = value / step
+  return abs(ratio - round(ratio)) < 1e-6
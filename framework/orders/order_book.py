@@ -0,0 +1,236 @@
+"""This modules contains the live in-memory order book.
+
+The order book is kept current from the order update postbacks of the
+KiteTicker websocket, and reconciled with get_orders only when the websocket
+(re)connects, so strategies wait on fills instead of polling the REST API:
+
+  book = OrderBook(kite)
+  book.attach(kws)
+  order_id = place_mis_market_order(kite, "INFY", "buy", 1)
+  order = book.wait_for_fill(order_id, timeout=5)
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import concurrent.futures
+import threading
+
+from framework.logging.logger import DEBUG, ERROR, INFO
+from framework.portfolio.portfolio import get_orders
+
+# Statuses after which an order doesn't change.
+TERMINAL_STATUSES = ("COMPLETE", "REJECTED", "CANCELLED")
+
+class OrderBook(object):
+  """Thread-safe order book indexed by order_id and tag.
+  """
+  def __init__(self, kite=None):
+    """Initialize OrderBook object.
+
+    Args:
+      kite(obj): KiteConnect object used to reconcile with get_orders.
+                 Default: None (never reconciled)
+    """
+    self.kite = kite
+    self._orders = {}
+    self._by_tag = {}
+    self._futures = {}
+    self._callbacks = []
+    self._lock = threading.RLock()
+
+  def attach(self, kws):
+    """Consume the order updates of a ticker and reconcile on every connect.
+    Callbacks already set on the ticker are still called.
+
+    Args:
+      kws(KiteTicker): Ticker streaming the order updates.
+    """
+    on_order_update, on_connect = kws.on_order_update, kws.on_connect
+
+    def order_update(ws, data):
+      self.update(data)
+      if on_order_update:
+        on_order_update(ws, data)
+
+    def connect(ws, response):
+      # Updates may have been missed while disconnected. Reconcile off the
+      # ticker thread so that ticks keep flowing meanwhile.
+      if self.kite is not None:
+        threading.Thread(target=self._reconcile_safely,
+                         name="OrderBookReconcile", daemon=True).start()
+      if on_connect:
+        on_connect(ws, response)
+
+    kws.on_order_update = order_update
+    kws.on_connect = connect
+
+  def reconcile(self):
+    """Update the book from get_orders.
+
+    Returns:
+      (int): Number of orders received.
+
+    """
+    orders = get_orders(self.kite)
+    for order in orders:
+      self.update(order)
+    INFO("Reconciled order book with %s orders", len(orders))
+    return len(orders)
+
+  def update(self, order):
+    """Apply an order update postback or an order of get_orders.
+
+    Stale updates, which arrive after a later one, are ignored: a terminal
+    order doesn't go back to an open status and the filled quantity doesn't
+    decrease.
+
+    Args:
+      order(dict): Order details with at least order_id and status.
+
+    Returns:
+      (bool): True if the book changed.
+
+    """
+    order_id = order["order_id"]
+    with self._lock:
+      current = self._orders.get(order_id)
+      if current is not None and _is_stale(current, order):
+        DEBUG("Ignoring stale update of order %s: %s", order_id,
+              order.get("status"))
+        return False
+
+      order = dict(order)
+      self._orders[order_id] = order
+      tag = order.get("tag")
+      if tag:
+        self._by_tag.setdefault(tag, set()).add(order_id)
+      futures = (self._futures.pop(order_id, [])
+                 if order.get("status") in TERMINAL_STATUSES else [])
+      callbacks = list(self._callbacks)
+
+    for future in futures:
+      future.set_result(order)
+    for callback in callbacks:
+      try:
+        callback(order)
+      except Exception as ex:
+        ERROR("Error in order update callback for %s: %s", order_id, ex)
+    return True
+
+  def get(self, order_id):
+    """Get the latest state of an order.
+
+    Args:
+      order_id(str): Order id.
+
+    Returns:
+      (dict): Order details, None if unknown.
+
+    """
+    return self._orders.get(order_id)
+
+  def by_tag(self, tag):
+    """Get the orders placed with a tag.
+
+    Args:
+      tag(str): Order tag.
+
+    Returns:
+      (list): Order details.
+
+    """
+    with self._lock:
+      return [self._orders[order_id]
+              for order_id in self._by_tag.get(tag, ())]
+
+  def open_orders(self):
+    """Get the orders which are not complete, rejected or cancelled.
+
+    Returns:
+      (list): Order details.
+
+    """
+    with self._lock:
+      return [order for order in self._orders.values()
+              if order.get("status") not in TERMINAL_STATUSES]
+
+  def future(self, order_id):
+    """Get a future resolved with the order once it's complete, rejected or
+    cancelled.
+
+    Args:
+      order_id(str): Order id.
+
+    Returns:
+      (concurrent.futures.Future): Future of the final order details.
+
+    """
+    future = concurrent.futures.Future()
+    with self._lock:
+      order = self._orders.get(order_id)
+      if order is not None and order.get("status") in TERMINAL_STATUSES:
+        future.set_result(order)
+      else:
+        self._futures.setdefault(order_id, []).append(future)
+    return future
+
+  def wait_for_fill(self, order_id, timeout=None):
+    """Wait till an order is complete, rejected or cancelled.
+
+    Args:
+      order_id(str): Order id.
+      timeout(float): Maximum seconds to wait.
+                      Default: None (no limit)
+
+    Returns:
+      (dict): Final order details, check its status for the outcome.
+
+    """
+    future = self.future(order_id)
+    try:
+      return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+      # The order may never finish, e.g. an unknown order id, so the future
+      # isn't kept waiting for it.
+      with self._lock:
+        futures = self._futures.get(order_id, [])
+        if future in futures:
+          futures.remove(future)
+        if not futures:
+          self._futures.pop(order_id, None)
+      raise TimeoutError(f"Order {order_id} not filled in {timeout}s")
+
+  def add_callback(self, callback):
+    """Call a function with the order details on every order update.
+
+    Args:
+      callback(callable): Called from the ticker thread.
+    """
+    with self._lock:
+      self._callbacks.append(callback)
+
+  def _reconcile_safely(self):
+    """Reconcile with get_orders, logging instead of raising errors.
+    """
+    try:
+      self.reconcile()
+    except Exception as ex:
+      ERROR("Error occurred while reconciling order book:%s", ex)
+
+def _is_stale(current, update):
+  """Check whether an order update is older than the current state.
+
+  Args:
+    current(dict): Current order details.
+    update(dict): Order update.
+
+  Returns:
+    (bool): True if the update should be ignored.
+
+  """
+  if (current.get("status") in TERMINAL_STATUSES and
+      update.get("status") not in TERMINAL_STATUSES):
+    return True
+  return (update.get("filled_quantity") or 0) < (current.get(
+    "filled_quantity") or 0)
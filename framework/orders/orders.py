@@ -4,14 +4,20 @@ Date Created: 12-Sept-2020
 Author: Nikunj Soni (nks141197@gmail.com)
 """
 
+import time
+
 from kiteconnect import KiteConnect
 
+from framework.common.metrics import measure
+from framework.logging.events import EVENT
 from framework.logging.logger import INFO, ERROR
 
 # Market exchange map.
 EXCHANGE_MAP = {
   "BSE": KiteConnect.EXCHANGE_BSE,
-  "NSE": KiteConnect.EXCHANGE_NSE
+  "NSE": KiteConnect.EXCHANGE_NSE,
+  "BFO": KiteConnect.EXCHANGE_BFO,
+  "NFO": KiteConnect.EXCHANGE_NFO
 }
 
 # Transaction type map.
@@ -20,6 +26,9 @@ TRANSACTION_TYPE_MAP = {
   "sell": KiteConnect.TRANSACTION_TYPE_SELL
 }
 
+# Bracket order variety, not defined by recent kiteconnect releases.
+VARIETY_BO = getattr(KiteConnect, "VARIETY_BO", "bo")
+
 def place_mis_market_order(kite, instrument, type, quantity, exchange="NSE"):
   """Places an intraday market order.
 
@@ -40,25 +49,36 @@ def place_mis_market_order(kite, instrument, type, quantity, exchange="NSE"):
   exchange = EXCHANGE_MAP[exchange]
 
   # Place market order.
+  start = time.perf_counter()
   try:
-    resp = kite.place_order(tradingsymbol=instrument, exchange=exchange,
-                            transaction_type=type, quantity=quantity,
-                            order_type=KiteConnect.ORDER_TYPE_MARKET,
-                            product=KiteConnect.PRODUCT_MIS,
-                            variety=KiteConnect.VARIETY_REGULAR)
+    with measure("place_order"):
+      resp = kite.place_order(tradingsymbol=instrument, exchange=exchange,
+                              transaction_type=type, quantity=quantity,
+                              order_type=KiteConnect.ORDER_TYPE_MARKET,
+                              product=KiteConnect.PRODUCT_MIS,
+                              variety=KiteConnect.VARIETY_REGULAR)
+    latency_ms = (time.perf_counter() - start) * 1000
     if resp["status"] == "success":
-      INFO(f"Order placed successfully: Instrument:{exchange}:{instrument}, "
-           f"Type:{type}, Quantity:{quantity}")
-      return resp["data"]["order_id"]
+      order_id = resp["data"]["order_id"]
     else:
-      ERROR(f"Error while placing response")
+      ERROR("Error while placing response")
       return -1
 
   except Exception as ex:
     # If any exception occurred, catch it and return an error response.
-    ERROR(f"Error while placing order for {instrument}: {ex}")
+    ERROR("Error while placing order for %s: %s", instrument, ex)
+    EVENT("order_failed", instrument=f"{exchange}:{instrument}",
+          latency_ms=(time.perf_counter() - start) * 1000, error=str(ex))
     return -1
 
+  # The order is placed, so nothing after this point may fail the call.
+  INFO("Order placed successfully: Instrument:%s:%s, Type:%s, Quantity:%s",
+       exchange, instrument, type, quantity)
+  EVENT("order_placed", instrument=f"{exchange}:{instrument}",
+        order_id=order_id, latency_ms=latency_ms, type=type,
+        quantity=quantity)
+  return order_id
+
 def place_mis_bracket_order(kite, instrument, type, price, quantity, target_points,
                             stoploss_points, trailing_stoploss, exchange="NSE"):
   """Places an intraday bracket order.
@@ -85,24 +105,36 @@ def place_mis_bracket_order(kite, instrument, type, price, quantity, target_poin
   exchange = EXCHANGE_MAP[exchange]
 
   # Place bracket order.
+  start = time.perf_counter()
   try:
-    resp = kite.place_order(tradingsymbol=instrument, exchange=exchange,
-                            transaction_type=type, quantity=quantity,
-                            order_type=KiteConnect.ORDER_TYPE_LIMIT, price=price,
-                            product=KiteConnect.PRODUCT_MIS,
-                            variety=KiteConnect.VARIETY_BO,
-                            squareoff=target_points,stoploss=stoploss_points,
-                            trailing_stoploss=trailing_stoploss)
-
+    with measure("place_order"):
+      resp = kite.place_order(tradingsymbol=instrument, exchange=exchange,
+                              transaction_type=type, quantity=quantity,
+                              order_type=KiteConnect.ORDER_TYPE_LIMIT,
+                              price=price, product=KiteConnect.PRODUCT_MIS,
+                              variety=VARIETY_BO,
+                              squareoff=target_points,
+                              stoploss=stoploss_points,
+                              trailing_stoploss=trailing_stoploss)
+
+    latency_ms = (time.perf_counter() - start) * 1000
     if resp["status"] == "success":
-      INFO(f"Order placed successfully: Instrument:{exchange}:{instrument}, "
-           f"Type:{type}, Quantity:{quantity}")
-      return resp["data"]["order_id"]
+      order_id = resp["data"]["order_id"]
     else:
-      ERROR(f"Error while placing order for {instrument}")
+      ERROR("Error while placing order for %s", instrument)
       return -1
 
   except Exception as ex:
     # If any exception occurred, catch it and return an error response.
-    ERROR(f"Error while placing order for {instrument}: {ex}")
+    ERROR("Error while placing order for %s: %s", instrument, ex)
+    EVENT("order_failed", instrument=f"{exchange}:{instrument}",
+          latency_ms=(time.perf_counter() - start) * 1000, error=str(ex))
     return -1
+
+  # The order is placed, so nothing after this point may fail the call.
+  INFO("Order placed successfully: Instrument:%s:%s, Type:%s, Quantity:%s",
+       exchange, instrument, type, quantity)
+  EVENT("order_placed", instrument=f"{exchange}:{instrument}",
+        order_id=order_id, latency_ms=latency_ms, type=type,
+        quantity=quantity)
+  return order_id
@@ -0,0 +1,335 @@
+"""This modules contains the incremental position and P&L engine.
+
+Positions and holdings are loaded once over REST into NumPy vectors indexed
+by a per-token slot. Every tick then only moves the running totals by the
+price change times the slot's quantity, so the portfolio P&L and exposure
+are available in O(1) on every tick:
+
+  engine = PnlEngine().load(kite)
+  session.add_tick_handler(engine.on_ticks)
+  book.add_callback(engine.on_order_update)
+  engine.snapshot().pnl
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import threading
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from framework.logging.logger import INFO
+from framework.portfolio.portfolio import (get_holdings, get_orders,
+                                          get_positions)
+
+# Portfolio totals. Position P&L is as reported by Kite:
+# (sell_value - buy_value) + quantity * last_price * multiplier.
+PnlSnapshot = namedtuple("PnlSnapshot", ["pnl", "positions_pnl",
+                                         "holdings_pnl", "exposure"])
+
+# Slot vectors, the position P&L of a slot is pos_cash + pos_weight * ltp.
+_VECTORS = ("ltp", "pos_qty", "pos_cash", "pos_weight", "multiplier",
+            "hold_qty", "hold_cost")
+
+class PnlEngine(object):
+  """Array-backed per-token position state with running P&L totals.
+  """
+  def __init__(self, capacity=256):
+    """Initialize PnlEngine object.
+
+    Args:
+      capacity(int): Initial number of token slots, grown as required.
+                     Default: 256
+    """
+    self._slots = {}
+    self._symbols = []
+    self.tokens = np.zeros(capacity, dtype=np.int64)
+    for name in _VECTORS:
+      setattr(self, name, np.zeros(capacity, dtype=np.float64))
+    self.multiplier[:] = 1.0
+    # Running totals, moved by every tick.
+    self._positions_pnl = 0.0
+    self._holdings_pnl = 0.0
+    self._exposure = 0.0
+    # Filled quantity and average price already applied per order_id.
+    self._fills = {}
+    self._lock = threading.Lock()
+
+  def load(self, kite):
+    """Load the net positions and the holdings over REST. The fills of the
+    orders of the day which are in the positions are recorded as applied, so
+    the order updates replaying them are ignored.
+
+    Args:
+      kite(obj): KiteConnect object.
+
+    Returns:
+      (PnlEngine): self.
+
+    """
+    # Orders are read after the positions, so they have every fill of the
+    # positions. Fills in between are then left out of _fills by comparing
+    # with the day positions, and are applied by their order updates.
+    positions = get_positions(kite)
+    holdings = get_holdings(kite)
+    orders = get_orders(kite)
+    fills = _applied_fills(orders, positions["day"])
+    with self._lock:
+      self._fills = fills
+      for name in ("pos_qty", "pos_cash", "pos_weight", "hold_qty",
+                   "hold_cost"):
+        getattr(self, name)[:] = 0.0
+      for position in positions["net"]:
+        slot = self._slot(position["instrument_token"],
+                          position.get("tradingsymbol"))
+        multiplier = float(position.get("multiplier") or 1)
+        self.multiplier[slot] = multiplier
+        self.pos_qty[slot] = position["quantity"]
+        self.pos_cash[slot] = position["sell_value"] - position["buy_value"]
+        self.pos_weight[slot] = position["quantity"] * multiplier
+        self.ltp[slot] = position.get("last_price") or 0.0
+      for holding in holdings:
+        slot = self._slot(holding["instrument_token"],
+                          holding.get("tradingsymbol"))
+        quantity = holding["quantity"] + holding.get("t1_quantity", 0)
+        self.hold_qty[slot] = quantity
+        self.hold_cost[slot] = quantity * holding["average_price"]
+        if not self.ltp[slot]:
+          self.ltp[slot] = holding.get("last_price") or 0.0
+      self._recompute()
+    INFO("Loaded %s positions and %s holdings into P&L engine",
+         len(positions["net"]), len(holdings))
+    return self
+
+  def on_ticks(self, ticks):
+    """Move the totals by the price change of every ticked token.
+
+    Args:
+      ticks(list): Tick dicts with instrument_token and last_price, or Ticks
+                   of CompactTicker.
+    """
+    slots = self._slots
+    # Last price of every ticked slot, later ticks of a token win.
+    prices = {}
+    for tick in ticks:
+      if isinstance(tick, dict):
+        slot = slots.get(tick["instrument_token"])
+        if slot is not None:
+          prices[slot] = tick["last_price"]
+      else:
+        slot = slots.get(tick.token)
+        if slot is not None:
+          prices[slot] = tick.price
+    if prices:
+      count = len(prices)
+      self.on_prices(np.fromiter(prices.keys(), dtype=np.int64, count=count),
+                     np.fromiter(prices.values(), dtype=np.float64,
+                                 count=count))
+
+  def on_prices(self, slots, prices):
+    """Move the totals by the price change of given slots.
+
+    Args:
+      slots(ndarray): Unique slots.
+      prices(ndarray): New last prices of the slots.
+    """
+    with self._lock:
+      delta = prices - self.ltp[slots]
+      self._positions_pnl += float(delta @ self.pos_weight[slots])
+      self._holdings_pnl += float(delta @ self.hold_qty[slots])
+      self._exposure += float(delta @ (np.abs(self.pos_weight[slots]) +
+                                       np.abs(self.hold_qty[slots])))
+      self.ltp[slots] = prices
+
+  def apply_trade(self, token, quantity, price, multiplier=None,
+                  tradingsymbol=None):
+    """Apply a fill to the position of a token.
+
+    Args:
+      token(int): instrument token.
+      quantity(int): Filled quantity, negative for sells.
+      price(float): Fill price.
+      multiplier(float): Contract multiplier.
+                         Default: None (keep the token's multiplier)
+      tradingsymbol(str): Trading symbol of a new token.
+                          Default: None
+    """
+    with self._lock:
+      slot = self._slot(token, tradingsymbol)
+      if multiplier is not None:
+        self.multiplier[slot] = multiplier
+      self.pos_qty[slot] += quantity
+      self.pos_cash[slot] -= quantity * price * self.multiplier[slot]
+      self.pos_weight[slot] = self.pos_qty[slot] * self.multiplier[slot]
+      if not self.ltp[slot]:
+        self.ltp[slot] = price
+      self._recompute()
+
+  def on_order_update(self, order):
+    """Apply the newly filled quantity of an order update, e.g. as an
+    OrderBook callback.
+
+    Args:
+      order(dict): Order details with order_id, instrument_token,
+                   transaction_type, filled_quantity and average_price.
+    """
+    filled = order.get("filled_quantity") or 0
+    average_price = order.get("average_price") or 0.0
+    with self._lock:
+      prev_filled, prev_average = self._fills.get(order["order_id"],
+                                                  (0, 0.0))
+      if filled <= prev_filled:
+        return
+      self._fills[order["order_id"]] = (filled, average_price)
+
+    # Price of the new fills out of the change in the order's average price.
+    quantity = filled - prev_filled
+    price = (filled * average_price - prev_filled * prev_average) / quantity
+    sign = 1 if order["transaction_type"] == "BUY" else -1
+    self.apply_trade(order["instrument_token"], sign * quantity, price,
+                     tradingsymbol=order.get("tradingsymbol"))
+
+  def snapshot(self):
+    """Get the portfolio totals in O(1).
+
+    Returns:
+      (PnlSnapshot): P&L and exposure.
+
+    """
+    with self._lock:
+      return PnlSnapshot(self._positions_pnl + self._holdings_pnl,
+                         self._positions_pnl, self._holdings_pnl,
+                         self._exposure)
+
+  def pnl(self, token):
+    """Get the P&L of a token in O(1).
+
+    Args:
+      token(int): instrument token.
+
+    Returns:
+      (float): Position plus holding P&L.
+
+    """
+    slot = self._slots[token]
+    with self._lock:
+      ltp = self.ltp[slot]
+      return float(self.pos_cash[slot] + self.pos_weight[slot] * ltp +
+                   self.hold_qty[slot] * ltp - self.hold_cost[slot])
+
+  def per_instrument(self):
+    """Get the P&L and exposure of every token.
+
+    Returns:
+      (DataFrame): Per-instrument state indexed by instrument_token.
+
+    """
+    count = len(self._slots)
+    with self._lock:
+      data = {name: getattr(self, name)[:count].copy() for name in _VECTORS}
+      tokens = self.tokens[:count].copy()
+    data["tradingsymbol"] = self._symbols[:count]
+    frame = pd.DataFrame(data, index=pd.Index(tokens, name="instrument_token"))
+    ltp = frame["ltp"]
+    frame["positions_pnl"] = frame["pos_cash"] + frame["pos_weight"] * ltp
+    frame["holdings_pnl"] = frame["hold_qty"] * ltp - frame["hold_cost"]
+    frame["pnl"] = frame["positions_pnl"] + frame["holdings_pnl"]
+    frame["exposure"] = (frame["pos_weight"].abs() +
+                         frame["hold_qty"].abs()) * ltp
+    return frame
+
+  def _slot(self, token, tradingsymbol=None):
+    """Get the slot of a token, allocating one if required. Caller holds the
+    lock or is loading.
+
+    Args:
+      token(int): instrument token.
+      tradingsymbol(str): Trading symbol of the token.
+                          Default: None
+
+    Returns:
+      (int): Slot index.
+
+    """
+    token = int(token)
+    slot = self._slots.get(token)
+    if slot is not None:
+      return slot
+    slot = len(self._slots)
+    if slot == len(self.tokens):
+      self._grow()
+    self.tokens[slot] = token
+    self._symbols.append(tradingsymbol)
+    self._slots[token] = slot
+    return slot
+
+  def _grow(self):
+    """Double the capacity of the slot vectors.
+    """
+    capacity = len(self.tokens)
+    self.tokens = np.concatenate([self.tokens,
+                                  np.zeros(capacity, dtype=np.int64)])
+    for name in _VECTORS:
+      setattr(self, name, np.concatenate([getattr(self, name),
+                                          np.zeros(capacity)]))
+    self.multiplier[capacity:] = 1.0
+
+  def _recompute(self):
+    """Recompute the running totals from the slot vectors. Caller holds the
+    lock.
+    """
+    count = len(self._slots)
+    ltp = self.ltp[:count]
+    pos_weight = self.pos_weight[:count]
+    hold_qty = self.hold_qty[:count]
+    self._positions_pnl = float(self.pos_cash[:count].sum() + pos_weight @ ltp)
+    self._holdings_pnl = float(hold_qty @ ltp - self.hold_cost[:count].sum())
+    self._exposure = float((np.abs(pos_weight) + np.abs(hold_qty)) @ ltp)
+
+def _applied_fills(orders, day_positions):
+  """Get the fills of the orders which are in the day positions. Orders read
+  after the positions may have more fills than the positions, the excess is
+  taken off the latest orders of the token and side.
+
+  Args:
+    orders(list): Orders of the day, read after the positions.
+    day_positions(list): Day positions with buy_quantity and sell_quantity.
+
+  Returns:
+    (dict): Filled quantity and average price applied per order_id.
+
+  """
+  in_positions = {}
+  for position in day_positions:
+    token = position["instrument_token"]
+    for side in ("BUY", "SELL"):
+      quantity = position.get(f"{side.lower()}_quantity") or 0
+      in_positions[token, side] = in_positions.get((token, side), 0) + quantity
+
+  fills = {}
+  filled = {}
+  for order in orders:
+    quantity = order.get("filled_quantity") or 0
+    fills[order["order_id"]] = (quantity, order.get("average_price") or 0.0)
+    key = (order["instrument_token"], order["transaction_type"])
+    filled[key] = filled.get(key, 0) + quantity
+
+  # Latest orders first, their fills are the ones missing from the positions.
+  # The orders are listed oldest first, which orders equal timestamps.
+  orders = sorted(reversed(orders), reverse=True, key=lambda order: str(
+    order.get("exchange_update_timestamp") or
+    order.get("exchange_timestamp") or order.get("order_timestamp") or ""))
+  for order in orders:
+    key = (order["instrument_token"], order["transaction_type"])
+    excess = filled.get(key, 0) - in_positions.get(key, 0)
+    quantity, average_price = fills[order["order_id"]]
+    if excess <= 0 or not quantity:
+      continue
+    taken = min(excess, quantity)
+    filled[key] -= taken
+    # The excess is priced at the order's average price when applied.
+    fills[order["order_id"]] = (quantity - taken, average_price)
+  return fills
@@ -6,9 +6,11 @@ Author: Nikunj Soni (nks141197@gmail.com)
 
 from retry import retry
 
-from framework.logging.logger import INFO, ERROR
+from framework.common.metrics import instrumented
+from framework.logging.logger import DEBUG, INFO, ERROR
 
 @retry(tries=3, delay=5)
+@instrumented("orders")
 def get_orders(kite):
   """get current orders.
 
@@ -25,17 +27,20 @@ def get_orders(kite):
 
     # Return if success else raise exception.
     if resp["status"] == "success":
-      INFO(f"Current orders are: {resp['data']}")
+      # The order list can be long, log it in full only for debugging.
+      INFO("Got %s current orders", len(resp['data']))
+      DEBUG("Current orders are: %s", resp['data'])
     else:
       raise Exception(f"Status:{resp['status']}, Error:{resp['error_type']}, "
                       f"Error Message:{resp['message']}")
 
   except Exception as ex:
-    ERROR(f"Error occurred while getting orders:{ex}")
+    ERROR("Error occurred while getting orders:%s", ex)
     raise
   return resp["data"]
 
 @retry(tries=3, delay=5)
+@instrumented("positions")
 def get_positions(kite):
   """get current positions.
 
@@ -52,17 +57,18 @@ def get_positions(kite):
 
     # Return if success else raise exception.
     if resp["status"] == "success":
-      INFO(f"Current positions are: {resp['data']}")
+      INFO("Current positions are: %s", resp['data'])
     else:
       raise Exception(f"Status:{resp['status']}, Error:{resp['error_type']}, "
                       f"Error Message:{resp['message']}")
 
   except Exception as ex:
-    ERROR(f"Error occurred while getting positions:{ex}")
+    ERROR("Error occurred while getting positions:%s", ex)
     raise
   return resp["data"]
 
 @retry(tries=3, delay=5)
+@instrumented("holdings")
 def get_holdings(kite):
   """get current holdings for given kite object.
 
@@ -79,12 +85,12 @@ def get_holdings(kite):
 
     # Return if success else raise exception.
     if resp["status"] == "success":
-      INFO(f"Current holdings are: {resp['data']}")
+      INFO("Current holdings are: %s", resp['data'])
     else:
       raise Exception(f"Status:{resp['status']}, Error:{resp['error_type']}, "
                       f"Error Message:{resp['message']}")
 
   except Exception as ex:
-    ERROR(f"Error occurred while getting holdings:{ex}")
+    ERROR("Error occurred while getting holdings:%s", ex)
     raise
   return resp["data"]
@@ -0,0 +1,363 @@
+"""This modules contains the real-time bar aggregator of the tick stream.
+
+OHLCV bars of several intervals are built per token from the ticks, in
+preallocated ring buffers of the last bars. A bar is closed, and the bar
+close callbacks are called, when the first tick of a later bar arrives or
+when close_due() is called after its end. Bars are aligned to the market
+open (09:15, 09:20 ... for 5minute) like the historical candles, and are
+returned and persisted in the fetch_historical_ohlc() format:
+
+  aggregator = BarAggregator(tokens.values(), intervals=("minute", "5minute"))
+  session.add_tick_handler(aggregator.on_ticks)
+  aggregator.add_callback(lambda token, interval, bar: ...)
+  candles = history_with_live(kite, aggregator, token, "5minute", "01-10-2026")
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from config.market_calendar_config import MARKET_OPEN
+from framework.historical.candle_cache import CandleCache
+from framework.historical.historical_data import CANDLE_COLUMNS
+from framework.logging.logger import ERROR, INFO
+
+# Seconds of each supported bar interval, named as the historical data API.
+BAR_INTERVALS = {
+  "minute": 60,
+  "3minute": 180,
+  "5minute": 300,
+  "10minute": 600,
+  "15minute": 900,
+  "30minute": 1800,
+  "60minute": 3600
+}
+
+# Exchange timezone of the bar timestamps.
+EXCHANGE_TZ = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_OHLCV = ("open", "high", "low", "close", "volume")
+
+class _BarRing(object):
+  """Current and completed bars of one interval for all token slots.
+  """
+  def __init__(self, seconds, slots, history):
+    """Initialize _BarRing object.
+
+    Args:
+      seconds(int): Bar interval in seconds.
+      slots(int): Number of token slots.
+      history(int): Completed bars kept per token.
+    """
+    self.seconds = seconds
+    self.history = history
+    # Completed bars, bar i of a slot is at column i % history.
+    self.start = np.zeros((slots, history), dtype=np.int64)
+    self.ohlcv = np.zeros((slots, history, 5), dtype=np.float64)
+    self.count = np.zeros(slots, dtype=np.int64)
+    # Bar in progress, start is -1 if no tick arrived yet.
+    self.cur_start = np.full(slots, -1, dtype=np.int64)
+    self.cur = np.zeros((slots, 5), dtype=np.float64)
+    # Start of the last closed bar, -1 before the first one.
+    self.closed_start = np.full(slots, -1, dtype=np.int64)
+    # Cumulative day volume at the end of the previous bar.
+    self.volume_base = np.full(slots, np.nan)
+
+class BarAggregator(object):
+  """Builds OHLCV bars of multiple intervals per token from ticks.
+  """
+  def __init__(self, tokens, intervals=("minute",), history=1000):
+    """Initialize BarAggregator object.
+
+    Args:
+      tokens(list): instrument tokens to aggregate.
+      intervals(list): Bar intervals, keys of BAR_INTERVALS.
+                       Default: ("minute",)
+      history(int): Completed bars kept per token and interval.
+                    Default: 1000
+    """
+    self.tokens = [int(token) for token in tokens]
+    self._slots = {token: slot for slot, token in enumerate(self.tokens)}
+    unknown = set(intervals) - set(BAR_INTERVALS)
+    if unknown:
+      raise Exception(f"Unsupported bar intervals:{sorted(unknown)}")
+    self.intervals = list(intervals)
+    self._rings = {interval: _BarRing(BAR_INTERVALS[interval],
+                                      len(self.tokens), history)
+                   for interval in self.intervals}
+    # Bars are aligned to the market open, in seconds since midnight.
+    hour, minute = MARKET_OPEN.split(":")
+    self._anchor = int(hour) * 3600 + int(minute) * 60
+    self._callbacks = []
+    self._lock = threading.Lock()
+
+  def add_callback(self, callback):
+    """Call a function on every bar close.
+
+    Args:
+      callback(callable): Called with (token, interval, bar) where bar is a
+                          dict of date and OHLCV, from the ticker thread.
+    """
+    self._callbacks.append(callback)
+
+  def on_ticks(self, ticks):
+    """Update the bars with a batch of ticks.
+
+    Args:
+      ticks(list): Tick dicts of KiteTicker or Ticks of CompactTicker.
+    """
+    closed = []
+    with self._lock:
+      for tick in ticks:
+        if isinstance(tick, dict):
+          token, price = tick["instrument_token"], tick["last_price"]
+          when = tick.get("exchange_timestamp") or tick.get("timestamp")
+          volume = tick.get("volume_traded", tick.get("volume"))
+        else:
+          token, price, when = tick.token, tick.price, tick.ts
+          volume = tick.volume
+        slot = self._slots.get(token)
+        if slot is None:
+          continue
+        seconds = _seconds(when or datetime.datetime.now())
+        self._update(slot, seconds, price, volume, closed)
+    self._notify(closed)
+
+  def close_due(self, now=None):
+    """Close the bars which ended, even if no later tick arrived, e.g. from a
+    timer or at session close.
+
+    Args:
+      now(datetime): Current exchange time.
+                     Default: None (now)
+    """
+    now = _seconds(now or datetime.datetime.now())
+    closed = []
+    with self._lock:
+      for interval, ring in self._rings.items():
+        due = np.flatnonzero((ring.cur_start >= 0) &
+                             (ring.cur_start + ring.seconds <= now))
+        for slot in due:
+          closed.append(self._close(interval, ring, slot))
+    self._notify(closed)
+
+  def bars(self, token, interval, include_current=False):
+    """Get the completed bars of a token.
+
+    Args:
+      token(int): instrument token.
+      interval(str): Bar interval.
+      include_current(bool): Whether to include the bar in progress.
+                             Default: False
+
+    Returns:
+      (DataFrame): Bars indexed by date with (open, high, low, close, volume)
+                   columns, as returned by fetch_historical_ohlc().
+
+    """
+    ring = self._rings[interval]
+    slot = self._slots[int(token)]
+    with self._lock:
+      count = int(ring.count[slot])
+      kept = min(count, ring.history)
+      order = np.arange(count - kept, count) % ring.history
+      starts = ring.start[slot, order]
+      values = ring.ohlcv[slot, order]
+      if include_current and ring.cur_start[slot] >= 0:
+        starts = np.append(starts, ring.cur_start[slot])
+        values = np.vstack([values, ring.cur[slot]])
+    return _to_frame(starts, values)
+
+  def persist(self, store=None):
+    """Append the completed bars of all tokens to an on-disk store, in the
+    same format as the historical candle cache with a synthetic column,
+    False for live bars and True for backfilled candles(GapRecovery).
+
+    Args:
+      store(CandleCache): Store of the bars.
+                          Default: None ($AUTOKITE_PATH/db/bars)
+
+    Returns:
+      (CandleCache): Store of the bars.
+
+    """
+    store = store or live_bar_store()
+    for interval in self.intervals:
+      for token in self.tokens:
+        data = self.bars(token, interval)
+        if not data.empty:
+          store.append(token, interval, data.assign(synthetic=False))
+    INFO("Persisted live bars of %s tokens to %s", len(self.tokens),
+         store.cache_dir)
+    return store
+
+  def _update(self, slot, seconds, price, volume, closed):
+    """Apply a tick to the bars of every interval. Caller holds the lock.
+
+    Args:
+      slot(int): Token slot.
+      seconds(int): Tick time in seconds since epoch of exchange wall clock.
+      price(float): Last traded price.
+      volume(int): Cumulative day volume, None if not in the tick.
+      closed(list): Closed bars are appended to it.
+    """
+    for interval, ring in self._rings.items():
+      start = seconds - (seconds - self._anchor) % ring.seconds
+      cur_start = ring.cur_start[slot]
+      if start < cur_start or start <= ring.closed_start[slot]:
+        # Late tick of a closed bar.
+        continue
+      cur = ring.cur[slot]
+      if start > cur_start:
+        if cur_start >= 0:
+          closed.append(self._close(interval, ring, slot))
+        ring.cur_start[slot] = start
+        cur[:4] = price
+        cur[4] = 0.0
+      else:
+        if price > cur[1]:
+          cur[1] = price
+        if price < cur[2]:
+          cur[2] = price
+        cur[3] = price
+      if volume is not None:
+        if np.isnan(ring.volume_base[slot]):
+          ring.volume_base[slot] = volume
+        cur[4] = volume - ring.volume_base[slot]
+
+  def _close(self, interval, ring, slot):
+    """Move the bar in progress of a slot to the ring buffer. Caller holds
+    the lock.
+
+    Args:
+      interval(str): Bar interval.
+      ring(_BarRing): Bars of the interval.
+      slot(int): Token slot.
+
+    Returns:
+      (tuple): (token, interval, bar dict) of the closed bar.
+
+    """
+    column = ring.count[slot] % ring.history
+    ring.start[slot, column] = ring.cur_start[slot]
+    ring.ohlcv[slot, column] = ring.cur[slot]
+    ring.count[slot] += 1
+    if not np.isnan(ring.volume_base[slot]):
+      ring.volume_base[slot] += ring.cur[slot, 4]
+    bar = dict(zip(_OHLCV, ring.cur[slot].tolist()))
+    bar["date"] = _to_datetime(ring.cur_start[slot])
+    ring.closed_start[slot] = ring.cur_start[slot]
+    ring.cur_start[slot] = -1
+    return self.tokens[slot], interval, bar
+
+  def _notify(self, closed):
+    """Call the bar close callbacks outside the lock.
+
+    Args:
+      closed(list): (token, interval, bar) of the closed bars.
+    """
+    for token, interval, bar in closed:
+      for callback in self._callbacks:
+        try:
+          callback(token, interval, bar)
+        except Exception as ex:
+          ERROR("Error in bar close callback for %s %s: %s", token, interval,
+                ex)
+
+def live_bar_store(store_dir=None):
+  """Get the on-disk store of live bars.
+
+  Args:
+    store_dir(str): Directory of the bars.
+                    Default: None ($AUTOKITE_PATH/db/bars)
+
+  Returns:
+    (CandleCache): Store of the bars.
+
+  """
+  if not store_dir:
+    try:
+      store_dir = os.path.join(os.environ.get('AUTOKITE_PATH'), 'db', 'bars')
+    except Exception:
+      raise Exception("AUTOKITE_PATH environment variable is not defined")
+  return CandleCache(store_dir)
+
+def history_with_live(kite, aggregator, token, interval, start_date):
+  """Get the historical candles of a token followed by the live bars, live
+  bars replacing candles of the same time.
+
+  Args:
+    kite(obj): KiteConnect object.
+    aggregator(BarAggregator): Live bar aggregator of the token.
+    token(int): instrument token.
+    interval(str): Bar interval.
+    start_date(str): date in format (dd-mm-yyyy).
+
+  Returns:
+    (DataFrame): Candles in fetch_historical_ohlc() format.
+
+  """
+  # Imported here as historical data is not needed for live bars alone.
+  from framework.historical.historical_data import fetch_historical_ohlc
+
+  history = fetch_historical_ohlc(kite, token, start_date, interval)
+  live = aggregator.bars(token, interval, include_current=True)
+  if live.empty:
+    return history
+  if history.empty:
+    return live
+  if history.index.tz is not None:
+    live.index = live.index.tz_convert(history.index.tz)
+  data = pd.concat([history, live])
+  return data[~data.index.duplicated(keep="last")].sort_index()
+
+def _seconds(when):
+  """Convert a naive exchange time to seconds since epoch of the wall clock.
+
+  Args:
+    when(datetime): Exchange time.
+
+  Returns:
+    (int): Seconds.
+
+  """
+  if when.tzinfo is not None:
+    when = when.astimezone(EXCHANGE_TZ).replace(tzinfo=None)
+  return int((when - _EPOCH).total_seconds())
+
+def _to_datetime(seconds):
+  """Convert seconds since epoch of the wall clock to exchange time.
+
+  Args:
+    seconds(int): Seconds.
+
+  Returns:
+    (datetime): Exchange timezone aware time.
+
+  """
+  return (_EPOCH + datetime.timedelta(seconds=int(seconds))).replace(
+    tzinfo=EXCHANGE_TZ)
+
+def _to_frame(starts, values):
+  """Build a candles DataFrame out of bar arrays.
+
+  Args:
+    starts(ndarray): Bar start seconds.
+    values(ndarray): OHLCV rows.
+
+  Returns:
+    (DataFrame): Candles indexed by date.
+
+  """
+  index = pd.DatetimeIndex(pd.to_datetime(starts, unit="s"), name="date")
+  data = pd.DataFrame(values.reshape(-1, 5), columns=CANDLE_COLUMNS[1:],
+                      index=index.tz_localize(EXCHANGE_TZ))
+  data["volume"] = data["volume"].astype("int64")
+  return data
@@ -0,0 +1,523 @@
+"""This modules contains an append-only columnar tick store.
+
+Ticks are written into per-day, per-instrument Arrow IPC segment files:
+
+  <root_dir>/<yyyy-mm-dd>/<token>/<index>_<first_ts>_<last_ts>.arrow
+
+A segment is written in the Arrow IPC stream format as <index>.arrow.part
+and renamed with its time range once it is rolled (on size or age) or the
+store is closed. Open segments are readable up to their last complete record
+batch, and segments left open by a crash are completed when the store is
+opened again, so a single store may write a root directory. Readers
+memory-map the segments, hence column buffers are used in place without
+copying, and completed segments outside the requested time range are skipped
+by their file name.
+
+Requires pyarrow.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import glob
+import os
+import time
+
+try:
+  import pyarrow as pa
+  import pyarrow.compute as pc
+except ImportError:
+  pa = pc = None
+
+from framework.logging.logger import DEBUG, INFO, WARN
+from framework.streaming.bar_aggregator import EXCHANGE_TZ
+from framework.streaming.tick_store import TICK_COLUMNS, tick_to_row
+
+# Arrow type of each tick column.
+_COLUMN_TYPES = {
+  "token": "int64", "seq": "int32", "last_qty": "int64", "volume": "int64",
+  "buy_qty": "int64", "sell_qty": "int64", "oi": "int64",
+  "oi_day_high": "int64", "oi_day_low": "int64", "bid_qty": "int64",
+  "ask_qty": "int64", "depth_bid_qty": "int64", "depth_ask_qty": "int64",
+  "ts": "timestamp", "last_trade_time": "timestamp"
+}
+
+def tick_schema():
+  """Get the arrow schema of the tick segments.
+
+  Returns:
+    (pyarrow.Schema): Schema with TICK_COLUMNS.
+
+  """
+  _check_pyarrow()
+  fields = []
+  for column in TICK_COLUMNS:
+    kind = _COLUMN_TYPES.get(column, "float64")
+    arrow_type = pa.timestamp("us") if kind == "timestamp" else kind
+    fields.append(pa.field(column, arrow_type))
+  return pa.schema(fields)
+
+def read_columnar_ticks(root_dir, tokens=None, start=None, end=None,
+                        columns=None):
+  """Read stored ticks of given tokens between start and end.
+
+  Args:
+    root_dir(str): Root directory of the columnar tick store.
+    tokens(list): instrument tokens to read.
+                  Default: None (all tokens)
+    start(datetime): Inclusive start time, timezone aware times are
+                     converted to exchange time.
+                     Default: None (from the first tick)
+    end(datetime): Exclusive end time, as start.
+                   Default: None (till the last tick)
+    columns(list): Columns to read, token and ts are always included.
+                   Default: None (all columns)
+
+  Returns:
+    (DataFrame): Ticks ordered by (token, ts, seq).
+
+  """
+  _check_pyarrow()
+  columns = ["token", "ts"] + [c for c in (columns or TICK_COLUMNS)
+                               if c not in ("token", "ts")]
+  # Ticks are stored in naive exchange time.
+  start = _exchange_time(start) if start is not None else None
+  end = _exchange_time(end) if end is not None else None
+  start_us = _to_micros(start) if start is not None else None
+  end_us = _to_micros(end) if end is not None else None
+
+  tables = []
+  for path in _find_segments(root_dir, tokens, start, end):
+    first_us, last_us = _segment_range(path)
+    if first_us is not None and (
+        (start_us is not None and last_us < start_us) or
+        (end_us is not None and first_us >= end_us)):
+      continue
+
+    table = _read_segment(path)
+    if table is None:
+      continue
+    table = table.select(columns)
+    if ((start_us is not None and (first_us is None or first_us < start_us))
+        or (end_us is not None and (last_us is None or last_us >= end_us))):
+      table = table.filter(_time_mask(table.column("ts"), start_us, end_us))
+    tables.append(table)
+
+  DEBUG("Read %s tick segments from %s", len(tables), root_dir)
+  if not tables:
+    return tick_schema().empty_table().select(columns).to_pandas()
+  table = pa.concat_tables(tables)
+  sort_keys = [("token", "ascending"), ("ts", "ascending")]
+  if "seq" in columns:
+    sort_keys.append(("seq", "ascending"))
+  return table.sort_by(sort_keys).to_pandas()
+
+class ColumnarTickStore(object):
+  """Tick store which appends ticks to per-day, per-instrument segments.
+
+  A tick identical to the last stored tick of its token, e.g. the quote sent
+  again after a reconnect, is a duplicate delivery and isn't stored.
+
+  The store is opened and written from the tick writer thread only.
+  """
+  def __init__(self, root_dir, segment_size=64 * 1024 * 1024,
+               segment_age=900):
+    """Initialize ColumnarTickStore object.
+
+    Args:
+      root_dir(str): Root directory of the columnar tick store.
+      segment_size(int): Segment size in bytes after which it's rolled.
+                         Default: 64MB
+      segment_age(int): Seconds after which a segment is rolled.
+                        Default: 900
+    """
+    _check_pyarrow()
+    self.root_dir = root_dir
+    self.segment_size = segment_size
+    self.segment_age = segment_age
+    self._schema = None
+    # Open segment for each (day, token).
+    self._segments = {}
+    # Last row stored of every token seen, read from disk on first sight.
+    self._last_rows = {}
+    # Last seq of ticks of a batch older than the last row of their token.
+    self._late_seq = {}
+    self.duplicates = 0
+
+  def open(self):
+    """Create the root directory and complete the segments left open by a
+    crash.
+    """
+    os.makedirs(self.root_dir, exist_ok=True)
+    self._schema = tick_schema()
+    for path in sorted(glob.glob(os.path.join(self.root_dir, "*-*-*", "*",
+                                              "*.arrow.part"))):
+      _recover_segment(path, self._schema)
+    INFO("Opened columnar tick store:%s", self.root_dir)
+
+  def write(self, ticks):
+    """Append ticks to the segments of their day and token.
+
+    Args:
+      ticks(list): list of json which has quotes for token.
+
+    Returns:
+      (int): Number of ticks stored, duplicates are counted in duplicates.
+
+    """
+    received_at = datetime.datetime.now()
+    rows_by_segment = {}
+    for tick in ticks:
+      row = self._with_seq(tick_to_row(tick), received_at)
+      if row is None:
+        self.duplicates += 1
+      else:
+        rows_by_segment.setdefault((row[1].date(), row[0]), []).append(row)
+    # The rows are on disk for the next batch, its late ticks look their seq
+    # up there.
+    self._late_seq.clear()
+
+    for key, rows in rows_by_segment.items():
+      segment = self._segments.get(key)
+      if segment is None:
+        segment = self._segments[key] = _Segment(self._segment_dir(*key),
+                                                 self._schema)
+      segment.write(pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type)
+         for values, field in zip(zip(*rows), self._schema)],
+        schema=self._schema))
+      if (segment.size() >= self.segment_size or
+          segment.age() >= self.segment_age):
+        segment.close()
+        del self._segments[key]
+    return sum(len(rows) for rows in rows_by_segment.values())
+
+  def close(self):
+    """Complete all open segments.
+    """
+    for segment in self._segments.values():
+      segment.close()
+    self._segments = {}
+
+  def _segment_dir(self, day, token):
+    """Get the segment directory of a day and token.
+
+    Args:
+      day(date): Trading day.
+      token(int): instrument token.
+
+    Returns:
+      (str): Segment directory path.
+
+    """
+    return os.path.join(self.root_dir, day.isoformat(), str(token))
+
+  def _with_seq(self, row, received_at):
+    """Insert the seq column in a row.
+
+    The seq numbers ticks of a token sharing the same timestamp, continuing
+    after the ticks already stored, e.g. by an earlier run.
+
+    Args:
+      row(tuple): Row values in TICK_COLUMNS order, seq excluded.
+      received_at(datetime): Time used for ticks without a timestamp.
+
+    Returns:
+      (tuple): Row values in TICK_COLUMNS order, None for a duplicate.
+
+    """
+    token, ts, values = row[0], row[1] or received_at, row[2:]
+    last = self._last_rows.get(token)
+    if last is None:
+      last = _last_stored_row(self._segment_dir(ts.date(), token))
+    if last is None or ts > last[1]:
+      seq = 0
+    elif ts == last[1]:
+      if values == last[3:]:
+        return None
+      seq = last[2] + 1
+    else:
+      # A late tick, numbered after the ticks of its timestamp.
+      key = (token, ts)
+      seq = self._late_seq.get(key)
+      if seq is None:
+        seq = _stored_seq(self._segment_dir(ts.date(), token), ts)
+      seq = self._late_seq[key] = seq + 1
+      self._last_rows[token] = last
+      return (token, ts, seq) + values
+    self._last_rows[token] = (token, ts, seq) + values
+    return self._last_rows[token]
+
+class _Segment(object):
+  """An open segment file of a day and token.
+  """
+  def __init__(self, segment_dir, schema):
+    """Initialize _Segment object.
+
+    Args:
+      segment_dir(str): Directory of the segment.
+      schema(pyarrow.Schema): Schema of the segment.
+    """
+    os.makedirs(segment_dir, exist_ok=True)
+    self.segment_dir = segment_dir
+    self.index = max((_segment_index(path) + 1 for path in
+                      glob.glob(os.path.join(segment_dir, "*.arrow*"))),
+                     default=0)
+    self.path = os.path.join(segment_dir, f"{self.index:05d}.arrow.part")
+    # Unbuffered, every record batch is on disk once written.
+    self._sink = pa.OSFile(self.path, "wb")
+    self._writer = pa.ipc.new_stream(self._sink, schema)
+    self._opened_at = time.monotonic()
+    self._first_us = None
+    self._last_us = None
+
+  def write(self, batch):
+    """Append a record batch to the segment.
+
+    Args:
+      batch(pyarrow.RecordBatch): Ticks of the segment's day and token.
+
+    """
+    self._writer.write_batch(batch)
+    # Timestamp scalars hold microseconds since epoch.
+    ts = pc.min_max(batch.column(1))
+    first_us, last_us = ts["min"].value, ts["max"].value
+    self._first_us = (first_us if self._first_us is None
+                      else min(self._first_us, first_us))
+    self._last_us = (last_us if self._last_us is None
+                     else max(self._last_us, last_us))
+
+  def size(self):
+    """Get the bytes written to the segment.
+
+    Returns:
+      (int): Segment size in bytes.
+
+    """
+    return self._sink.tell()
+
+  def age(self):
+    """Get the seconds since the segment was opened.
+
+    Returns:
+      (float): Segment age in seconds.
+
+    """
+    return time.monotonic() - self._opened_at
+
+  def close(self):
+    """Write the end of the stream and rename the segment with its time
+    range.
+    """
+    self._writer.close()
+    self._sink.close()
+    path = os.path.join(self.segment_dir, f"{self.index:05d}_{self._first_us}_"
+                                          f"{self._last_us}.arrow")
+    os.rename(self.path, path)
+    DEBUG("Completed tick segment:%s", path)
+
+def _find_segments(root_dir, tokens, start, end):
+  """Find the completed and open segments of given tokens and days.
+
+  Args:
+    root_dir(str): Root directory of the columnar tick store.
+    tokens(list): instrument tokens or None for all tokens.
+    start(datetime): Inclusive start time or None.
+    end(datetime): Exclusive end time or None.
+
+  Returns:
+    (list): Segment file paths.
+
+  """
+  paths = []
+  for day_dir in sorted(glob.glob(os.path.join(root_dir, "*-*-*"))):
+    day = datetime.date.fromisoformat(os.path.basename(day_dir))
+    if ((start is not None and day < start.date()) or
+        (end is not None and day > end.date())):
+      continue
+    token_dirs = ([os.path.join(day_dir, str(int(token))) for token in tokens]
+                  if tokens else glob.glob(os.path.join(day_dir, "*")))
+    for token_dir in token_dirs:
+      paths.extend(sorted(glob.glob(os.path.join(token_dir, "*.arrow*"))))
+  return paths
+
+def _segment_index(path):
+  """Get the index of a segment from its file name.
+
+  Args:
+    path(str): Segment file path.
+
+  Returns:
+    (int): Segment index.
+
+  """
+  return int(os.path.basename(path)[:5])
+
+def _segment_range(path):
+  """Get the time range of a segment from its file name.
+
+  Args:
+    path(str): Segment file path.
+
+  Returns:
+    (tuple): (first_ts, last_ts) in microseconds, (None, None) for an open
+             segment.
+
+  """
+  if path.endswith(".part"):
+    return None, None
+  _, first_us, last_us = os.path.basename(path)[:-len(".arrow")].split("_")
+  return int(first_us), int(last_us)
+
+def _read_segment(path):
+  """Memory map a segment and read its complete record batches, a batch
+  being written or cut off by a crash is left out.
+
+  Args:
+    path(str): Segment file path.
+
+  Returns:
+    (pyarrow.Table): Ticks of the segment, None if it has no schema yet.
+
+  """
+  # The record batches refer to the mapped pages.
+  source = pa.memory_map(path, "r")
+  try:
+    reader = pa.ipc.open_stream(source)
+  except pa.ArrowInvalid:
+    return None
+  batches = []
+  while True:
+    try:
+      batches.append(reader.read_next_batch())
+    except StopIteration:
+      break
+    except OSError:
+      # Truncated batch, ArrowInvalid is an OSError too.
+      break
+  return pa.Table.from_batches(batches, schema=reader.schema)
+
+def _recover_segment(path, schema):
+  """Complete a segment left open by a crash with its complete record
+  batches, or remove it if it has none.
+
+  Args:
+    path(str): Path of the open segment.
+    schema(pyarrow.Schema): Schema of the segment.
+  """
+  table = _read_segment(path)
+  if table is None or not table.num_rows:
+    os.remove(path)
+    WARN("Removed empty tick segment:%s", path)
+    return
+  # Rewritten as a new segment without the truncated tail, under a name
+  # readers don't pick up till it's complete.
+  segment_dir, index = os.path.dirname(path), _segment_index(path)
+  ts = pc.min_max(table.column("ts"))
+  target = os.path.join(segment_dir, f"{index:05d}_{ts['min'].value}_"
+                                     f"{ts['max'].value}.arrow")
+  temp = os.path.join(segment_dir, f"{index:05d}.recovering")
+  with pa.OSFile(temp, "wb") as sink:
+    with pa.ipc.new_stream(sink, schema) as writer:
+      writer.write_table(table.cast(schema))
+  os.rename(temp, target)
+  os.remove(path)
+  WARN("Recovered %s ticks of tick segment:%s", table.num_rows, target)
+
+def _last_stored_row(token_dir):
+  """Get the last stored tick of a token from its latest segment of a day.
+
+  Args:
+    token_dir(str): Segment directory of the day and token.
+
+  Returns:
+    (tuple): Row values in TICK_COLUMNS order, None if there are no ticks.
+
+  """
+  paths = glob.glob(os.path.join(token_dir, "*.arrow*"))
+  table = _read_segment(max(paths, key=_segment_index)) if paths else None
+  if table is None or not table.num_rows:
+    return None
+  table = table.sort_by([("ts", "descending"), ("seq", "descending")])
+  return tuple(table.slice(0, 1).to_pylist()[0][column]
+               for column in TICK_COLUMNS)
+
+def _stored_seq(token_dir, ts):
+  """Get the last seq stored for a timestamp of a token.
+
+  Args:
+    token_dir(str): Segment directory of the day and token.
+    ts(datetime): Timestamp of the ticks.
+
+  Returns:
+    (int): Last seq, -1 if there are no ticks of the timestamp.
+
+  """
+  ts_us = _to_micros(ts)
+  last = -1
+  for path in glob.glob(os.path.join(token_dir, "*.arrow*")):
+    first_us, last_us = _segment_range(path)
+    if first_us is not None and not first_us <= ts_us <= last_us:
+      continue
+    table = _read_segment(path)
+    if table is None:
+      continue
+    seq = pc.max(table.filter(_time_mask(table.column("ts"), ts_us,
+                                         ts_us + 1)).column("seq")).as_py()
+    if seq is not None:
+      last = max(last, seq)
+  return last
+
+def _time_mask(ts, start_us, end_us):
+  """Get the boolean mask of timestamps in [start, end).
+
+  Args:
+    ts(pyarrow.ChunkedArray): Timestamp column.
+    start_us(int): Inclusive start time in microseconds or None.
+    end_us(int): Exclusive end time in microseconds or None.
+
+  Returns:
+    (pyarrow.ChunkedArray): Boolean mask.
+
+  """
+  mask = None
+  if start_us is not None:
+    mask = pc.greater_equal(ts, pa.scalar(start_us, type=ts.type))
+  if end_us is not None:
+    upper = pc.less(ts, pa.scalar(end_us, type=ts.type))
+    mask = upper if mask is None else pc.and_(mask, upper)
+  return mask
+
+def _exchange_time(ts):
+  """Convert a timezone aware timestamp to naive exchange time.
+
+  Args:
+    ts(datetime): Timestamp, naive ones are in exchange time.
+
+  Returns:
+    (datetime): Naive exchange time.
+
+  """
+  if ts.tzinfo is not None:
+    ts = ts.astimezone(EXCHANGE_TZ).replace(tzinfo=None)
+  return ts
+
+def _to_micros(ts):
+  """Convert a naive timestamp to microseconds since epoch of the wall clock.
+
+  Args:
+    ts(datetime): Timestamp.
+
+  Returns:
+    (int): Microseconds since epoch.
+
+  """
+  delta = ts - datetime.datetime(1970, 1, 1)
+  return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+def _check_pyarrow():
+  """Raise an error if pyarrow isn't installed.
+  """
+  if pa is None:
+    raise ImportError("pyarrow is required for the columnar tick store")
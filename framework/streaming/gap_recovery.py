@@ -0,0 +1,242 @@
+"""This modules contains the gap recovery of the streaming pipeline.
+
+When the ticker connection drops, the outage of every token is recorded, from
+its last tick till the connection is back. KiteTicker retries the connection
+with exponential backoff and resubscribes by itself; once it gives up,
+connecting is restarted here with a backoff of its own. On reconnect the
+missed minutes of all tokens are backfilled in one bulk historical fetch and
+stored with the live bars, marked as synthetic:
+
+  recovery = GapRecovery(kite, tokens.values())
+  session.add_tick_handler(recovery.on_ticks)
+  recovery.attach(kws)
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import threading
+
+from collections import namedtuple
+
+import pandas as pd
+
+from config.streaming_config import (RECONNECT_BACKOFF_START,
+                                     RECONNECT_BACKOFF_MAX)
+from framework.historical.historical_data import fetch_historical_ohlc_bulk
+from framework.logging.events import EVENT
+from framework.logging.logger import ERROR, INFO, WARN
+from framework.streaming.bar_aggregator import EXCHANGE_TZ, live_bar_store
+
+# Outage of a token. last_tick is the exchange time of its last tick before
+# the disconnect, None if it had no ticks.
+Gap = namedtuple("Gap", ["token", "last_tick", "disconnected_at",
+                         "reconnected_at"])
+
+class GapRecovery(object):
+  """Records the outages of a ticker and backfills the missed candles.
+  """
+  def __init__(self, kite, tokens, store=None):
+    """Initialize GapRecovery object.
+
+    Args:
+      kite(obj): KiteConnect object used for the historical data.
+      tokens(list): instrument tokens streamed by the ticker.
+      store(CandleCache): Store of the backfilled minute candles.
+                          Default: None ($AUTOKITE_PATH/db/bars)
+    """
+    self.kite = kite
+    self.tokens = [int(token) for token in tokens]
+    self.store = store
+    self.gaps = []
+    self._last_tick = {}
+    self._disconnected_at = None
+    self._backoff = RECONNECT_BACKOFF_START
+    self._callbacks = []
+    self._attached = False
+    self._lock = threading.Lock()
+
+  def on_ticks(self, ticks):
+    """Record the time of the last tick of every token, e.g. as a
+    StreamingSession tick handler.
+
+    Args:
+      ticks(list): Tick dicts of KiteTicker or Ticks of CompactTicker.
+    """
+    last_tick = self._last_tick
+    for tick in ticks:
+      if isinstance(tick, dict):
+        ts = tick.get("exchange_timestamp")
+        if ts is not None:
+          last_tick[tick["instrument_token"]] = ts
+      elif tick.ts is not None:
+        last_tick[tick.token] = tick.ts
+
+  def attach(self, kws):
+    """Track the connection of a ticker. Callbacks already set on the ticker
+    are still called.
+
+    Args:
+      kws(KiteTicker): Ticker streaming the tokens.
+    """
+    on_connect, on_close = kws.on_connect, kws.on_close
+    on_noreconnect = kws.on_noreconnect
+
+    def connect(ws, response):
+      self._backoff = RECONNECT_BACKOFF_START
+      if on_connect:
+        on_connect(ws, response)
+      self._reconnected()
+
+    def close(ws, code, reason):
+      if self._attached:
+        self._disconnected()
+      if on_close:
+        on_close(ws, code, reason)
+
+    def noreconnect(ws):
+      if self._attached:
+        self._disconnected()
+        self._retry_connect(ws)
+      if on_noreconnect:
+        on_noreconnect(ws)
+
+    kws.on_connect = connect
+    kws.on_close = close
+    kws.on_noreconnect = noreconnect
+    self._attached = True
+
+  def detach(self):
+    """Stop tracking the connection before closing the ticker deliberately,
+    so that the close isn't recorded as an outage.
+    """
+    self._attached = False
+
+  def add_callback(self, callback):
+    """Call a function with the candles backfilled for a token.
+
+    Args:
+      callback(callable): Called with (token, candles) from the backfill
+                          thread, candles as returned by
+                          fetch_historical_ohlc().
+    """
+    self._callbacks.append(callback)
+
+  def backfill(self, gaps):
+    """Fetch the minute candles missed in the gaps of all tokens in one bulk
+    request and store them marked as synthetic.
+
+    Args:
+      gaps(list): Gaps to backfill.
+
+    Returns:
+      (dict): {token: DataFrame} of the backfilled candles.
+
+    """
+    gaps = {gap.token: gap for gap in gaps}
+    if not gaps:
+      return {}
+    starts = {token: _minute(gap.last_tick or gap.disconnected_at)
+              for token, gap in gaps.items()}
+    # Only the window of the gaps is requested, till the minute of the last
+    # reconnect, which is still streaming.
+    end_date = (max(_minute(gap.reconnected_at) for gap in gaps.values()) -
+                datetime.timedelta(seconds=1))
+    results = fetch_historical_ohlc_bulk(self.kite, list(gaps),
+                                         min(starts.values()), "minute",
+                                         end_date=end_date)
+
+    store = self.store or live_bar_store()
+    backfilled = {}
+    for token, data in results.items():
+      # The minute of the reconnect is still streaming, so it isn't complete.
+      start = pd.Timestamp(starts[token]).tz_localize(EXCHANGE_TZ)
+      end = pd.Timestamp(_minute(gaps[token].reconnected_at)).tz_localize(
+        EXCHANGE_TZ)
+      if not data.empty and data.index.tz is not None:
+        data = data.tz_convert(EXCHANGE_TZ)
+      candles = data[(data.index >= start) & (data.index < end)]
+      if candles.empty:
+        continue
+      store.append(token, "minute", candles.assign(synthetic=True))
+      backfilled[token] = candles
+      EVENT("gap_backfilled", instrument=token, candles=len(candles),
+            start=start.isoformat(), end=end.isoformat())
+      for callback in self._callbacks:
+        try:
+          callback(token, candles)
+        except Exception as ex:
+          ERROR("Error in backfill callback for %s: %s", token, ex)
+    INFO("Backfilled %s candles of %s tokens",
+         sum(len(candles) for candles in backfilled.values()), len(backfilled))
+    return backfilled
+
+  def _disconnected(self):
+    """Record the time the connection dropped, once per outage.
+    """
+    with self._lock:
+      if self._disconnected_at is not None:
+        return
+      self._disconnected_at = datetime.datetime.now()
+    WARN("Ticker disconnected at %s", self._disconnected_at)
+    EVENT("ticker_disconnected", tokens=len(self.tokens))
+
+  def _reconnected(self):
+    """Record the gaps of all tokens and backfill them off the ticker thread.
+    """
+    with self._lock:
+      disconnected_at, self._disconnected_at = self._disconnected_at, None
+    if disconnected_at is None:
+      return
+    reconnected_at = datetime.datetime.now()
+    gaps = [Gap(token, self._last_tick.get(token), disconnected_at,
+                reconnected_at) for token in self.tokens]
+    self.gaps.extend(gaps)
+    for gap in gaps:
+      EVENT("tick_gap", instrument=gap.token, last_tick=gap.last_tick,
+            disconnected_at=disconnected_at, reconnected_at=reconnected_at)
+    INFO("Ticker reconnected after %.1fs, backfilling %s tokens",
+         (reconnected_at - disconnected_at).total_seconds(), len(gaps))
+    threading.Thread(target=self._backfill_safely, args=(gaps,),
+                     name="GapBackfill", daemon=True).start()
+
+  def _backfill_safely(self, gaps):
+    """Backfill the gaps, logging instead of raising errors.
+
+    Args:
+      gaps(list): Gaps to backfill.
+    """
+    try:
+      self.backfill(gaps)
+    except Exception as ex:
+      ERROR("Error occurred while backfilling ticker gaps:%s", ex)
+
+  def _retry_connect(self, ws):
+    """Connect again after the ticker gave up retrying, doubling the delay
+    every time up to RECONNECT_BACKOFF_MAX.
+
+    Args:
+      ws(KiteTicker): Ticker which gave up.
+    """
+    # Called on the reactor thread, so the retry is scheduled on it too.
+    from twisted.internet import reactor
+
+    delay = self._backoff
+    self._backoff = min(self._backoff * 2, RECONNECT_BACKOFF_MAX)
+    WARN("Ticker gave up reconnecting, connecting again in %ss", delay)
+    reactor.callLater(delay, ws.connect, threaded=True)
+
+def _minute(when):
+  """Get the start of the minute of a time, as naive exchange time.
+
+  Args:
+    when(datetime): Time.
+
+  Returns:
+    (datetime): Start of the minute.
+
+  """
+  if when.tzinfo is not None:
+    when = when.astimezone(EXCHANGE_TZ).replace(tzinfo=None)
+  return when.replace(second=0, microsecond=0)
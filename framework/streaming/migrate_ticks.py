@@ -0,0 +1,76 @@
+"""This modules migrates per-token tick tables (TOKEN{token}) to the normalized
+ticks table.
+
+Usage:
+  python -m framework.streaming.migrate_ticks <src_db> [--dst <dst_db>] [--drop]
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import argparse
+import sqlite3
+
+from framework.logging.logger import INFO
+from framework.streaming.tick_store import TICKS_SCHEMA
+
+def migrate_per_token_db(src_file, dst_file=None, drop=False):
+  """Copy the rows of all TOKEN{token} tables into the ticks table.
+
+  Args:
+    src_file(str): Path of the db with per-token tables.
+    dst_file(str): Path of the db to migrate into.
+                   Default: None (migrate in place into src_file)
+    drop(bool): Whether to drop the per-token tables after migrating them.
+                Only allowed for in place migration.
+                Default: False
+
+  Returns:
+    (int): Number of rows migrated.
+
+  """
+  if drop and dst_file:
+    raise Exception("Per-token tables can be dropped only for in place "
+                    "migration")
+
+  db = sqlite3.connect(src_file)
+  target = "ticks"
+  if dst_file:
+    db.execute("ATTACH DATABASE ? AS dst", (dst_file,))
+    db.execute(TICKS_SCHEMA.replace("ticks (", "dst.ticks (", 1))
+    target = "dst.ticks"
+  else:
+    db.execute(TICKS_SCHEMA)
+
+  tables = [row[0] for row in db.execute(
+    "SELECT name FROM main.sqlite_master WHERE type='table' AND "
+    "name GLOB 'TOKEN[0-9]*'")]
+  INFO("Migrating %s per-token tables from %s", len(tables), src_file)
+
+  migrated = 0
+  try:
+    with db:
+      for table in tables:
+        # Per-token tables have one tick per second, so seq is always 0.
+        cur = db.execute(f"INSERT OR IGNORE INTO {target}(token,ts,seq,price,"
+                         f"volume) SELECT ?,ts,0,price,volume FROM {table}",
+                         (int(table[len("TOKEN"):]),))
+        migrated += cur.rowcount
+        if drop:
+          db.execute(f"DROP TABLE {table}")
+  finally:
+    db.close()
+
+  INFO("Migrated %s ticks into %s", migrated, dst_file or src_file)
+  return migrated
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(
+    description="Migrate per-token tick tables to the ticks table.")
+  parser.add_argument("src", help="db with TOKEN{token} tables")
+  parser.add_argument("--dst", default=None,
+                      help="db to migrate into (default: migrate in place)")
+  parser.add_argument("--drop", action="store_true",
+                      help="drop the per-token tables after migrating")
+  args = parser.parse_args()
+  migrate_per_token_db(args.src, args.dst, args.drop)
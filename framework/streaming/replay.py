@@ -0,0 +1,391 @@
+"""This modules contains the replay of stored ticks through the KiteTicker
+callback interface.
+
+ReplayTicker reads the tick store in time chunks, merges the ticks of all
+subscribed tokens into time order and calls on_ticks with one batch per
+timestamp, like the live ticker, at wall-clock, accelerated or maximum speed.
+Strategies and tick handlers written for KiteTicker run on it unchanged:
+
+  kws = ReplayTicker(db_file, start=day_start, end=day_end, speed=None)
+  kws.on_connect = lambda ws, response: ws.subscribe(tokens)
+  kws.on_ticks = session.on_ticks
+  kws.connect()
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import concurrent.futures
+import datetime
+import itertools
+import operator
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from config.streaming_config import COMPACT_TICKS, TICK_STORE_BACKEND
+from framework.logging.logger import INFO
+from framework.streaming.columnar_store import read_columnar_ticks
+from framework.streaming.compact_ticks import TICK_FIELDS, Tick
+
+# Time span of the ticks read from the store at once.
+REPLAY_CHUNK = datetime.timedelta(minutes=30)
+
+class ReplayTicker(object):
+  """Simulated KiteTicker which streams stored ticks.
+  """
+  MODE_FULL = "full"
+  MODE_QUOTE = "quote"
+  MODE_LTP = "ltp"
+
+  def __init__(self, db_file, start=None, end=None, speed=1.0,
+               backend=TICK_STORE_BACKEND, compact=COMPACT_TICKS,
+               chunk=REPLAY_CHUNK):
+    """Initialize ReplayTicker object.
+
+    Args:
+      db_file(str): Path of the sqlite tick database or root directory of
+                    the columnar tick store.
+      start(datetime): Inclusive start time.
+                       Default: None (from the first tick)
+      end(datetime): Exclusive end time.
+                     Default: None (till the last tick)
+      speed(float): Replay speed relative to wall-clock, e.g. 60 replays a
+                    minute per second. None replays at maximum speed.
+                    Default: 1.0
+      backend(str): Tick storage backend("sqlite", "columnar").
+                    Default: TICK_STORE_BACKEND
+      compact(bool): Whether ticks are passed as Tick objects instead of
+                     dicts.
+                     Default: COMPACT_TICKS
+      chunk(timedelta): Time span of the ticks read at once.
+                        Default: REPLAY_CHUNK
+    """
+    self.db_file = db_file
+    self.start = start
+    self.end = end
+    self.speed = speed
+    self.backend = backend
+    self.compact = compact
+    self.chunk = chunk
+    self.subscribed_tokens = {}
+
+    # Placeholders for callbacks, as in KiteTicker.
+    self.on_ticks = None
+    self.on_connect = None
+    self.on_close = None
+    self.on_order_update = None
+
+    self.ticks = 0
+    self.batches = 0
+    self._stop_event = threading.Event()
+    self._thread = None
+    self._connected = False
+
+  def connect(self, threaded=False):
+    """Call on_connect and replay the ticks of the subscribed tokens.
+
+    Args:
+      threaded(bool): Whether to replay in a background thread.
+                      Default: False
+    """
+    self._stop_event.clear()
+    if threaded:
+      self._thread = threading.Thread(target=self._run, name="ReplayTicker",
+                                      daemon=True)
+      self._thread.start()
+    else:
+      self._run()
+
+  def subscribe(self, instrument_tokens):
+    """Subscribe to tokens, in quote mode as KiteTicker does.
+
+    Args:
+      instrument_tokens(list): instrument tokens.
+
+    Returns:
+      (bool): True.
+
+    """
+    for token in instrument_tokens:
+      self.subscribed_tokens[int(token)] = self.MODE_QUOTE
+    return True
+
+  def unsubscribe(self, instrument_tokens):
+    """Unsubscribe from tokens.
+
+    Args:
+      instrument_tokens(list): instrument tokens.
+
+    Returns:
+      (bool): True.
+
+    """
+    for token in instrument_tokens:
+      self.subscribed_tokens.pop(int(token), None)
+    return True
+
+  def set_mode(self, mode, instrument_tokens):
+    """Set the streaming mode of tokens. Ticks in ltp mode only have the
+    token, time and price.
+
+    Args:
+      mode(str): Streaming mode.
+      instrument_tokens(list): instrument tokens.
+
+    Returns:
+      (bool): True.
+
+    """
+    for token in instrument_tokens:
+      self.subscribed_tokens[int(token)] = mode
+    return True
+
+  def is_connected(self):
+    """Check whether the replay is running.
+
+    Returns:
+      (bool): True while replaying.
+
+    """
+    return self._connected
+
+  def close(self, code=None, reason=None):
+    """Stop the replay.
+    """
+    self._stop_event.set()
+
+  def stop(self):
+    """Stop the replay, as KiteTicker.stop() stops the reactor.
+    """
+    self.close()
+
+  def _run(self):
+    """Replay loop, reading the next chunk while the current one plays.
+    """
+    self._connected = True
+    if self.on_connect:
+      self.on_connect(self, None)
+    tokens = sorted(self.subscribed_tokens)
+    started = time.perf_counter()
+    clock = None
+    try:
+      with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        chunks = iter(self._chunk_ranges(tokens))
+        window = next(chunks, None)
+        pending = (executor.submit(self._read, tokens, *window)
+                   if window else None)
+        while pending is not None and not self._stop_event.is_set():
+          data = pending.result()
+          window = next(chunks, None)
+          pending = (executor.submit(self._read, tokens, *window)
+                     if window else None)
+          clock = self._play(data, clock)
+    finally:
+      self._connected = False
+      INFO("Replayed %s ticks in %s batches in %.2fs", self.ticks,
+           self.batches, time.perf_counter() - started)
+      if self.on_close:
+        self.on_close(self, 1000, "Replay finished")
+
+  def _chunk_ranges(self, tokens):
+    """Split the replayed time range into chunks.
+
+    Args:
+      tokens(list): instrument tokens.
+
+    Yields:
+      (tuple): (start, end) datetimes of a chunk.
+    """
+    start, end = self.start, self.end
+    if start is None or end is None:
+      first, last = self._bounds(tokens)
+      if first is None:
+        return
+      start = start or first
+      end = end or last + datetime.timedelta(microseconds=1)
+    while start < end:
+      chunk_end = min(start + self.chunk, end)
+      yield start, chunk_end
+      start = chunk_end
+
+  def _bounds(self, tokens):
+    """Get the time of the first and last stored tick of tokens.
+
+    Args:
+      tokens(list): instrument tokens.
+
+    Returns:
+      (tuple): (first, last) datetimes, (None, None) without ticks.
+
+    """
+    if self.backend == "columnar":
+      data = read_columnar_ticks(self.db_file, tokens=tokens or None,
+                                 columns=["ts"])
+      if data.empty:
+        return None, None
+      return (data["ts"].min().to_pydatetime(),
+              data["ts"].max().to_pydatetime())
+
+    query = "SELECT MIN(ts), MAX(ts) FROM ticks"
+    if tokens:
+      query += f" WHERE token IN ({','.join('?' * len(tokens))})"
+    db = sqlite3.connect(self.db_file)
+    try:
+      first, last = db.execute(query, tokens).fetchone()
+    finally:
+      db.close()
+    if first is None:
+      return None, None
+    return (datetime.datetime.fromisoformat(first),
+            datetime.datetime.fromisoformat(last))
+
+  def _read(self, tokens, start, end):
+    """Read the ticks of a chunk in time order across tokens.
+
+    Args:
+      tokens(list): instrument tokens.
+      start(datetime): Inclusive start time.
+      end(datetime): Exclusive end time.
+
+    Returns:
+      (list): Rows in TICK_FIELDS order, ordered by (ts, token, seq).
+
+    """
+    if self.backend == "columnar":
+      data = read_columnar_ticks(self.db_file, tokens=tokens or None,
+                                 start=start, end=end)
+      # The ticks are sorted per token, a stable sort on ts merges the runs.
+      order = np.argsort(data["ts"].values, kind="stable")
+      return _to_rows(data.iloc[order])
+
+    # Rows are read straight from the cursor, a DataFrame in between costs
+    # as much as the read itself.
+    query = (f"SELECT {','.join(TICK_FIELDS)} FROM ticks"
+             f" WHERE ts >= ? AND ts < ?")
+    params = [start.isoformat(" "), end.isoformat(" ")]
+    if tokens:
+      query += f" AND token IN ({','.join('?' * len(tokens))})"
+      params.extend(tokens)
+    # Reading in primary key order and merging the token runs with a stable
+    # sort on ts is faster than ordering by ts in sqlite.
+    query += " ORDER BY token, ts, seq"
+    db = sqlite3.connect(self.db_file)
+    try:
+      rows = db.execute(query, params).fetchall()
+    finally:
+      db.close()
+    rows.sort(key=operator.itemgetter(1))
+
+    # Timestamps repeat across tokens, so each text is parsed once.
+    parsed = {None: None}
+    def to_datetime(text):
+      value = parsed.get(text)
+      if value is None and text is not None:
+        value = parsed[text] = datetime.datetime.fromisoformat(text)
+      return value
+
+    return [(row[0], to_datetime(row[1])) + row[2:15]
+            + (to_datetime(row[15]),) + row[16:] for row in rows]
+
+  def _play(self, rows, clock):
+    """Call on_ticks with the ticks of every timestamp of a chunk.
+
+    Args:
+      rows(list): Rows ordered by ts.
+      clock(tuple): (first tick time, perf_counter at it) of the replay,
+                    None before the first chunk.
+
+    Returns:
+      (tuple): Replay clock.
+
+    """
+    if not rows:
+      return clock
+    if clock is None:
+      clock = (rows[0][1], time.perf_counter())
+    ltp_tokens = {token for token, mode in self.subscribed_tokens.items()
+                  if mode == self.MODE_LTP}
+    convert = Tick if self.compact else _to_dict
+    # Ticks of the same timestamp form one batch.
+    for ts, batch in itertools.groupby(rows, key=operator.itemgetter(1)):
+      if self._stop_event.is_set():
+        break
+      if self.speed:
+        elapsed = (ts - clock[0]).total_seconds() / self.speed
+        delay = clock[1] + elapsed - time.perf_counter()
+        if delay > 0:
+          time.sleep(delay)
+      if ltp_tokens:
+        ticks = [convert(*(row[:3] if row[0] in ltp_tokens else row))
+                 for row in batch]
+      else:
+        ticks = [convert(*row) for row in batch]
+      self.ticks += len(ticks)
+      self.batches += 1
+      if self.on_ticks:
+        self.on_ticks(self, ticks)
+    return clock
+
+def _to_rows(data):
+  """Convert a DataFrame of ticks to rows of Python values.
+
+  Args:
+    data(DataFrame): Ticks with TICK_COLUMNS.
+
+  Returns:
+    (list): Rows in TICK_FIELDS order, missing values as None.
+
+  """
+  columns = []
+  for name in TICK_FIELDS:
+    if name not in data:
+      columns.append(itertools.repeat(None, len(data)))
+      continue
+    column = data[name]
+    if name in ("ts", "last_trade_time"):
+      column = pd.to_datetime(column)
+      values = column.dt.to_pydatetime()
+      values[column.isna().values] = None
+      columns.append(values.tolist())
+    elif column.isna().any():
+      columns.append(column.astype(object).where(column.notna(),
+                                                 None).tolist())
+    else:
+      columns.append(column.tolist())
+  return list(zip(*columns))
+
+def _to_dict(*row):
+  """Convert a tick store row to a KiteTicker tick dict. Market depth isn't
+  stored, so only the best bid and ask are included as a single level.
+
+  Args:
+    row(tuple): Row values in TICK_FIELDS order, only the first three in ltp
+                mode.
+
+  Returns:
+    (dict): Tick.
+
+  """
+  tick = {"instrument_token": row[0], "last_price": row[2],
+          "exchange_timestamp": row[1]}
+  if len(row) == 3:
+    return tick
+  tick.update({
+    "last_traded_quantity": row[3], "average_traded_price": row[4],
+    "volume_traded": row[5], "total_buy_quantity": row[6],
+    "total_sell_quantity": row[7],
+    "ohlc": {"open": row[8], "high": row[9], "low": row[10],
+             "close": row[11]},
+    "oi": row[12], "oi_day_high": row[13], "oi_day_low": row[14],
+    "last_trade_time": row[15]})
+  if row[16] is not None or row[18] is not None:
+    tick["depth"] = {
+      "buy": ([{"price": row[16], "quantity": row[17], "orders": None}]
+              if row[16] is not None else []),
+      "sell": ([{"price": row[18], "quantity": row[19], "orders": None}]
+               if row[18] is not None else [])}
+  return tick
@@ -0,0 +1,96 @@
+"""This modules contains the market-hours session scheduler for streaming.
+
+The scheduler sleeps till the next session opens, runs the open callback once,
+sleeps till the session closes and then runs the close callback.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import threading
+
+from framework.logging.logger import INFO
+
+# Longest single sleep, so that wall-clock changes and suspend/resume are
+# noticed without polling.
+_MAX_SLEEP = 60
+
+class SessionScheduler(object):
+  """Runs callbacks at open and close of trading sessions.
+  """
+  def __init__(self, calendar, on_open, on_close, pre_open=False):
+    """Initialize SessionScheduler object.
+
+    Args:
+      calendar(TradingCalendar): Exchange trading calendar.
+      on_open(callable): Called with the Session when it opens.
+      on_close(callable): Called with the Session when it closes.
+      pre_open(bool): Whether to open at start of pre-open window.
+                      Default: False
+    """
+    self.calendar = calendar
+    self.on_open = on_open
+    self.on_close = on_close
+    self.pre_open = pre_open
+    self._stop_event = threading.Event()
+
+  def run_session(self):
+    """Run the session in progress or the next one.
+
+    Returns:
+      (bool): False if the scheduler was stopped before the session opened.
+
+    """
+    session = self.calendar.next_session()
+    start = (session.pre_open if self.pre_open and session.pre_open
+             else session.open)
+    INFO("Next session opens at %s, closes at %s", start, session.close)
+    if not self._sleep_until(start):
+      return False
+
+    INFO("Session opened at %s", datetime.datetime.now())
+    self.on_open(session)
+    try:
+      self._sleep_until(session.close)
+    finally:
+      INFO("Session closed at %s", datetime.datetime.now())
+      self.on_close(session)
+    return True
+
+  def run(self, sessions=None):
+    """Run sessions till stopped.
+
+    Args:
+      sessions(int): Number of sessions to run.
+                     Default: None (till stopped)
+    """
+    count = 0
+    while not self._stop_event.is_set():
+      if not self.run_session():
+        break
+      count += 1
+      if sessions is not None and count >= sessions:
+        break
+
+  def stop(self):
+    """Wake up the scheduler and end the current session.
+    """
+    self._stop_event.set()
+
+  def _sleep_until(self, when):
+    """Sleep till given time or till the scheduler is stopped.
+
+    Args:
+      when(datetime): Time to wake up at.
+
+    Returns:
+      (bool): True if the time was reached, False if stopped.
+
+    """
+    while not self._stop_event.is_set():
+      remaining = (when - datetime.datetime.now()).total_seconds()
+      if remaining <= 0:
+        return True
+      self._stop_event.wait(min(remaining, _MAX_SLEEP))
+    return False
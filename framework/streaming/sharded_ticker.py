@@ -0,0 +1,417 @@
+"""This modules contains the sharded multi-connection ticker.
+
+The tokens are partitioned across several KiteTicker connections, balanced by
+their expected tick rate, so that more instruments than one connection allows
+can be streamed. All connections of a process share the Twisted reactor
+thread, so with processes=True every shard runs in its own worker process,
+which decodes its ticks in parallel and sends them to the parent. Either way
+the ticks of all shards are merged into one on_ticks callback, and the health
+and lag of every shard is tracked:
+
+  ticker = ShardedTicker(api_key, access_token, tokens, shards=3,
+                         rates=estimate_tick_rates(db_file))
+  ticker.on_ticks = lambda ws, ticks: writer.put(ticks)
+  ticker.connect(threaded=True)
+  ticker.health()
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import heapq
+import multiprocessing
+import queue
+import sqlite3
+import threading
+import time
+
+from kiteconnect import KiteTicker
+
+from config.streaming_config import (COMPACT_TICKS, TICKER_MAX_CONNECTIONS,
+                                     TICKER_MAX_TOKENS, TICKER_QUEUE_SIZE)
+from framework.common.metrics import METRICS
+from framework.logging.logger import ERROR, INFO, WARN
+from framework.streaming.compact_ticks import CompactTicker
+
+# Seconds to wait for the reactor thread to start on the first connection.
+_REACTOR_START_TIMEOUT = 10
+
+class ShardedTicker(object):
+  """KiteTicker-like manager of several ticker connections with a merged
+  tick stream. The tokens are subscribed by the shards on every (re)connect.
+  """
+  def __init__(self, api_key, access_token, tokens, shards=1, rates=None,
+               mode=KiteTicker.MODE_FULL, processes=False,
+               compact=COMPACT_TICKS, max_tokens=TICKER_MAX_TOKENS):
+    """Initialize ShardedTicker object.
+
+    Args:
+      api_key(str): Kite API key.
+      access_token(str): Access token of the session.
+      tokens(list): instrument tokens to stream.
+      shards(int): Number of connections.
+                   Default: 1
+      rates(dict): Expected ticks per second by token, used to balance the
+                   shards. Tokens missing in it are assumed to tick at the
+                   median rate.
+                   Default: None (equal rates)
+      mode(str): Streaming mode of the tokens.
+                 Default: KiteTicker.MODE_FULL
+      processes(bool): Whether each shard runs in its own worker process.
+                       Default: False
+      compact(bool): Whether ticks are decoded into Tick objects.
+                     Default: COMPACT_TICKS
+      max_tokens(int): Maximum tokens of one connection.
+                       Default: TICKER_MAX_TOKENS
+    """
+    if shards > TICKER_MAX_CONNECTIONS:
+      raise Exception(f"At most {TICKER_MAX_CONNECTIONS} ticker connections "
+                      f"are allowed, got {shards} shards")
+    self.api_key = api_key
+    self.access_token = access_token
+    self.mode = mode
+    self.processes = processes
+    self.compact = compact
+    self.partitions = partition_tokens(tokens, shards, rates, max_tokens)
+    self.on_ticks = None
+    self._shards = [_ShardState(i, partition)
+                    for i, partition in enumerate(self.partitions)]
+    self._tickers = []
+    self._workers = []
+    self._queue = None
+    self._stop_event = None
+    self._merger = None
+    for shard in self._shards:
+      labels = {"shard": str(shard.shard_id)}
+      METRICS.register_gauge("ticker_connected",
+                             lambda s=shard: int(s.connected), **labels)
+      METRICS.register_gauge("ticker_ticks", lambda s=shard: s.ticks, **labels)
+      METRICS.register_gauge(
+        "ticker_lag_ms", lambda s=shard: (float("nan") if s.lag_ms is None
+                                          else s.lag_ms), **labels)
+      METRICS.register_gauge("ticker_dropped", lambda s=shard: s.dropped,
+                             **labels)
+
+  def connect(self, threaded=True):
+    """Connect all shards. Returns at once, the ticks arrive on the reactor
+    thread or, with processes, on the merger thread.
+
+    Args:
+      threaded(bool): Kept for KiteTicker compatibility, shards always run
+                      in the background.
+                      Default: True
+    """
+    if self.processes:
+      self._start_workers()
+    else:
+      self._connect_threads()
+    INFO("Connecting %s ticker shards with %s tokens", len(self._shards),
+         [len(shard.tokens) for shard in self._shards])
+
+  def close(self):
+    """Close all connections.
+    """
+    for kws in self._tickers:
+      kws.close()
+    if self._stop_event is not None:
+      self._stop_event.set()
+      for worker in self._workers:
+        worker.join(5)
+        if worker.is_alive():
+          worker.terminate()
+      self._workers = []
+      if self._merger is not None:
+        self._merger.join(5)
+        self._merger = None
+    INFO("Closed ticker shards: %s", self.health())
+
+  def stop(self):
+    """Stop the reactor of the in-process shards, like KiteTicker.stop().
+    """
+    if self._tickers:
+      self._tickers[0].stop()
+
+  def health(self):
+    """Get the health and lag of every shard.
+
+    Returns:
+      (list): Dict per shard with shard, tokens, connected, ticks,
+              reconnects, dropped, last_tick_age (seconds since the last
+              ticks, None before the first) and lag_ms (receive time minus
+              exchange time of the latest ticks).
+
+    """
+    return [shard.health() for shard in self._shards]
+
+  def _connect_threads(self):
+    """Connect a KiteTicker per shard on the shared reactor thread.
+    """
+    ticker = CompactTicker if self.compact else KiteTicker
+    # Twisted isn't thread safe, once the reactor runs further connections
+    # are made from its thread.
+    from twisted.internet import reactor
+
+    for shard in self._shards:
+      kws = ticker(self.api_key, self.access_token)
+      _set_callbacks(kws, shard.tokens, self.mode,
+                     lambda ticks, s=shard: self._dispatch(s, ticks),
+                     lambda status, s=shard: s.update(status))
+      self._tickers.append(kws)
+      if reactor.running:
+        reactor.callFromThread(kws.connect, threaded=True)
+        continue
+      kws.connect(threaded=True)
+      deadline = time.monotonic() + _REACTOR_START_TIMEOUT
+      while not reactor.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+  def _start_workers(self):
+    """Start a worker process per shard and the thread merging their ticks.
+    """
+    # Spawned, as forking copies the parent's threads and reactor state.
+    context = multiprocessing.get_context("spawn")
+    self._queue = context.Queue(maxsize=TICKER_QUEUE_SIZE)
+    self._stop_event = context.Event()
+    for shard in self._shards:
+      worker = context.Process(
+        target=_run_shard, name=f"TickerShard{shard.shard_id}", daemon=True,
+        args=(shard.shard_id, self.api_key, self.access_token, shard.tokens,
+              self.mode, self.compact, self._queue, self._stop_event))
+      worker.start()
+      self._workers.append(worker)
+    self._merger = threading.Thread(target=self._merge, name="TickerMerger",
+                                    daemon=True)
+    self._merger.start()
+
+  def _merge(self):
+    """Merger thread loop, passes the ticks of all workers downstream.
+    """
+    while not self._stop_event.is_set() or not self._queue.empty():
+      try:
+        shard_id, kind, data = self._queue.get(timeout=0.5)
+      except queue.Empty:
+        continue
+      shard = self._shards[shard_id]
+      if kind == "ticks":
+        self._dispatch(shard, data)
+      else:
+        shard.update(data)
+
+  def _dispatch(self, shard, ticks):
+    """Record the ticks of a shard and pass them downstream.
+
+    Args:
+      shard(_ShardState): Shard which received the ticks.
+      ticks(list): Ticks of the shard.
+    """
+    shard.record(ticks)
+    if self.on_ticks is not None:
+      try:
+        self.on_ticks(self, ticks)
+      except Exception as ex:
+        ERROR("Error in on_ticks of ticker shard %s: %s", shard.shard_id, ex)
+
+class _ShardState(object):
+  """Health counters of a shard, updated from the reactor or merger thread.
+  """
+  def __init__(self, shard_id, tokens):
+    """Initialize _ShardState object.
+
+    Args:
+      shard_id(int): Index of the shard.
+      tokens(list): instrument tokens of the shard.
+    """
+    self.shard_id = shard_id
+    self.tokens = tokens
+    self.connected = False
+    self.ticks = 0
+    self.reconnects = 0
+    self.dropped = 0
+    self.lag_ms = None
+    self.last_tick = None
+
+  def record(self, ticks):
+    """Count a batch of ticks and measure its lag.
+
+    Args:
+      ticks(list): Tick dicts or Ticks.
+    """
+    now = time.time()
+    self.ticks += len(ticks)
+    self.last_tick = now
+    latest = None
+    for tick in ticks:
+      ts = (tick.get("exchange_timestamp") if isinstance(tick, dict)
+            else tick.ts)
+      if ts is not None and (latest is None or ts > latest):
+        latest = ts
+    if latest is not None:
+      self.lag_ms = (datetime.datetime.now() - latest).total_seconds() * 1000
+
+  def update(self, status):
+    """Apply a connection status change.
+
+    Args:
+      status(dict): Any of connected, reconnect and dropped.
+    """
+    if "connected" in status:
+      self.connected = status["connected"]
+    if status.get("reconnect"):
+      self.reconnects += 1
+    self.dropped = status.get("dropped", self.dropped)
+
+  def health(self):
+    """Get the health of the shard.
+
+    Returns:
+      (dict): Health as described in ShardedTicker.health().
+
+    """
+    age = time.time() - self.last_tick if self.last_tick else None
+    return {"shard": self.shard_id, "tokens": len(self.tokens),
+            "connected": self.connected, "ticks": self.ticks,
+            "reconnects": self.reconnects, "dropped": self.dropped,
+            "last_tick_age": age, "lag_ms": self.lag_ms}
+
+def partition_tokens(tokens, shards, rates=None, max_tokens=TICKER_MAX_TOKENS):
+  """Partition tokens into shards of about equal total tick rate, busiest
+  tokens first onto the least loaded shard with room.
+
+  Args:
+    tokens(list): instrument tokens.
+    shards(int): Number of shards.
+    rates(dict): Expected ticks per second by token.
+                 Default: None (equal rates)
+    max_tokens(int): Maximum tokens of a shard.
+                     Default: TICKER_MAX_TOKENS
+
+  Returns:
+    (list): Token list of every shard.
+
+  """
+  tokens = list(dict.fromkeys(int(token) for token in tokens))
+  if len(tokens) > shards * max_tokens:
+    raise Exception(f"{len(tokens)} tokens don't fit in {shards} shards of "
+                    f"{max_tokens} tokens")
+  rates = rates or {}
+  known = sorted(rates.values())
+  default_rate = known[len(known) // 2] if known else 1.0
+  weighted = sorted(tokens, key=lambda token: rates.get(token, default_rate),
+                    reverse=True)
+
+  partitions = [[] for _ in range(shards)]
+  # Heap of (load, shard), full shards are not pushed back.
+  loads = [(0.0, i) for i in range(shards)]
+  for token in weighted:
+    load, i = heapq.heappop(loads)
+    partitions[i].append(token)
+    if len(partitions[i]) < max_tokens:
+      heapq.heappush(loads, (load + rates.get(token, default_rate), i))
+  return partitions
+
+def estimate_tick_rates(db_file, start=None):
+  """Estimate the tick rate of every token from the sqlite tick store.
+
+  Args:
+    db_file(str): Path of the sqlite tick database.
+    start(datetime): Count ticks from this time.
+                     Default: None (all stored ticks)
+
+  Returns:
+    (dict): Ticks per second by token over the counted window, from start
+            till now or over the span of all stored ticks.
+
+  """
+  db = sqlite3.connect(db_file)
+  try:
+    query = "SELECT token, count(*), min(ts), max(ts) FROM ticks"
+    params = []
+    if start is not None:
+      query += " WHERE ts >= ?"
+      params.append(str(start))
+    rows = db.execute(query + " GROUP BY token", params).fetchall()
+  finally:
+    db.close()
+
+  if not rows:
+    return {}
+  # Every token is counted over the same window, so that a token ticking in
+  # a short burst doesn't look as busy as one ticking all day.
+  if start is not None:
+    first = start
+    last = datetime.datetime.now()
+  else:
+    first = min(datetime.datetime.fromisoformat(row[2]) for row in rows)
+    last = max(datetime.datetime.fromisoformat(row[3]) for row in rows)
+  seconds = max((last - first).total_seconds(), 1.0)
+  return {token: count / seconds for token, count, _, _ in rows}
+
+def _set_callbacks(kws, tokens, mode, on_ticks, on_status):
+  """Set the callbacks of a shard's ticker.
+
+  Args:
+    kws(KiteTicker): Ticker of the shard.
+    tokens(list): instrument tokens of the shard.
+    mode(str): Streaming mode of the tokens.
+    on_ticks(callable): Called with the ticks.
+    on_status(callable): Called with connection status changes.
+  """
+  def connect(ws, response):
+    ws.subscribe(tokens)
+    ws.set_mode(mode, tokens)
+    on_status({"connected": True})
+    INFO("Ticker shard subscribed to %s instruments", len(tokens))
+
+  def close(ws, code, reason):
+    on_status({"connected": False})
+    WARN("Ticker shard closed: %s %s", code, reason)
+
+  def reconnect(ws, attempts_count):
+    on_status({"connected": False, "reconnect": True})
+
+  kws.on_ticks = lambda ws, ticks: on_ticks(ticks)
+  kws.on_connect = connect
+  kws.on_close = close
+  kws.on_reconnect = reconnect
+
+def _run_shard(shard_id, api_key, access_token, tokens, mode, compact,
+               out_queue, stop_event):
+  """Worker process of a shard, streams its tokens into the merge queue.
+
+  Args:
+    shard_id(int): Index of the shard.
+    api_key(str): Kite API key.
+    access_token(str): Access token of the session.
+    tokens(list): instrument tokens of the shard.
+    mode(str): Streaming mode of the tokens.
+    compact(bool): Whether ticks are decoded into Tick objects.
+    out_queue(Queue): Queue of (shard_id, kind, data) to the parent, kind is
+                      "ticks" or "status".
+    stop_event(Event): Set by the parent to stop the worker.
+  """
+  # Ticks dropped so far and the count last reported to the parent.
+  dropped = [0]
+  reported = [0]
+
+  def on_ticks(ticks):
+    # Ticks are dropped rather than blocking the reactor if the parent lags.
+    # The drops are reported as soon as the queue has room again.
+    try:
+      if dropped[0] != reported[0]:
+        out_queue.put_nowait((shard_id, "status", {"dropped": dropped[0]}))
+        reported[0] = dropped[0]
+      out_queue.put_nowait((shard_id, "ticks", ticks))
+    except queue.Full:
+      dropped[0] += len(ticks)
+
+  def on_status(status):
+    status["dropped"] = reported[0] = dropped[0]
+    out_queue.put((shard_id, "status", status))
+
+  kws = (CompactTicker if compact else KiteTicker)(api_key, access_token)
+  _set_callbacks(kws, tokens, mode, on_ticks, on_status)
+  kws.connect(threaded=True)
+  stop_event.wait()
+  kws.close()
+  kws.stop()
@@ -0,0 +1,473 @@
+"""This modules contains the shared-memory tick fan-out to local processes.
+
+The streamer publishes every tick batch into one shared-memory segment, which
+any number of strategy processes on the box map and read without a socket,
+serialization or a lock:
+
+  * a latest-tick array with a slot per token, every slot guarded by a
+    seqlock, i.e. its seq is odd while being written and readers retry till
+    they copy a slot with the same even seq before and after.
+  * a ring buffer of tick events written by the single publisher, every
+    record stamped with its event number after being written, so readers
+    detect records overwritten while they were copying them.
+
+  publisher = TickPublisher(tokens.values())        # in the streamer
+  session.add_tick_handler(publisher.publish)
+
+  subscriber = TickSubscriber()                     # in a strategy process
+  subscriber.price(token)
+  subscriber.latest(token)["volume"]
+  for event in subscriber.wait(timeout=1.0): ...
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import os
+import time
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config.streaming_config import SHM_NAME, SHM_READ_RETRIES, SHM_RING_SIZE
+from framework.logging.logger import INFO
+from framework.streaming.tick_store import tick_to_row
+
+# Record of a tick in the latest array and ring buffer. ts is the exchange
+# time and recv_ns the publish time, both epoch based. Missing values are NaN.
+TICK_DTYPE = np.dtype([
+  ("seq", "u8"), ("token", "i8"), ("ts", "i8"), ("recv_ns", "i8"),
+  ("price", "f8"), ("volume", "f8"), ("last_qty", "f8"), ("oi", "f8"),
+  ("bid_price", "f8"), ("bid_qty", "f8"), ("ask_price", "f8"),
+  ("ask_qty", "f8"), ("open", "f8"), ("high", "f8"), ("low", "f8"),
+  ("close", "f8")])
+
+# Header words, head is the number of events published.
+_MAGIC = 0x4b495445
+_VERSION = 1
+_HEADER = ("magic", "version", "slots", "ring_size", "head", "pid")
+_HEAD = _HEADER.index("head")
+_PID = _HEADER.index("pid")
+_HEADER_BYTES = 64
+
+# 8 byte words of a record, and word index of seq and price in it.
+_WORDS = TICK_DTYPE.itemsize // 8
+_SEQ_WORD = TICK_DTYPE.fields["seq"][1] // 8
+_PRICE_WORD = TICK_DTYPE.fields["price"][1] // 8
+
+class _TickSegment(object):
+  """NumPy views of the header, token directory, latest array and ring
+  buffer of a shared-memory segment.
+  """
+  def __init__(self, shm, slots, ring_size):
+    """Initialize _TickSegment object.
+
+    Args:
+      shm(SharedMemory): Mapped segment.
+      slots(int): Number of token slots.
+      ring_size(int): Number of ring buffer records.
+    """
+    self.shm = shm
+    buf = shm.buf
+    self.header = np.ndarray(len(_HEADER), dtype=np.int64, buffer=buf)
+    offset = _HEADER_BYTES
+    self.tokens = np.ndarray(slots, dtype=np.int64, buffer=buf, offset=offset)
+    offset += slots * 8
+    self.latest = np.ndarray(slots, dtype=TICK_DTYPE, buffer=buf,
+                             offset=offset)
+    # Plain memoryviews of the latest array, indexing them is far cheaper
+    # than indexing a structured array for single fields.
+    self.latest_bytes = buf[offset:offset + slots * TICK_DTYPE.itemsize]
+    self.latest_words = self.latest_bytes.cast("Q")
+    self.latest_floats = self.latest_bytes.cast("d")
+    offset += slots * TICK_DTYPE.itemsize
+    self.ring = np.ndarray(ring_size, dtype=TICK_DTYPE, buffer=buf,
+                           offset=offset)
+
+  @staticmethod
+  def size(slots, ring_size):
+    """Get the segment size of a layout.
+
+    Args:
+      slots(int): Number of token slots.
+      ring_size(int): Number of ring buffer records.
+
+    Returns:
+      (int): Size in bytes.
+
+    """
+    return (_HEADER_BYTES + slots * 8 +
+            (slots + ring_size) * TICK_DTYPE.itemsize)
+
+  def release(self):
+    """Drop the views so that the segment can be closed.
+    """
+    for view in (self.latest_words, self.latest_floats, self.latest_bytes):
+      view.release()
+    self.header = self.tokens = self.latest = self.ring = None
+    self.latest_bytes = self.latest_words = self.latest_floats = None
+
+class TickPublisher(object):
+  """Single writer of the latest ticks and the tick event ring buffer.
+  """
+  def __init__(self, tokens, ring_size=SHM_RING_SIZE, name=SHM_NAME):
+    """Initialize TickPublisher object, creating the segment. A segment left
+    behind by a crashed publisher is replaced, one of a running publisher
+    raises an exception.
+
+    Args:
+      tokens(list): instrument tokens published, others are ignored.
+      ring_size(int): Number of ring buffer records.
+                      Default: SHM_RING_SIZE
+      name(str): Name of the shared-memory segment.
+                 Default: SHM_NAME
+    """
+    tokens = [int(token) for token in dict.fromkeys(tokens)]
+    self.name = name
+    self._slots = {token: slot for slot, token in enumerate(tokens)}
+    size = _TickSegment.size(len(tokens), ring_size)
+    try:
+      shm = shared_memory.SharedMemory(name, create=True, size=size)
+    except FileExistsError:
+      _unlink_stale(name)
+      shm = shared_memory.SharedMemory(name, create=True, size=size)
+    self._segment = _TickSegment(shm, len(tokens), ring_size)
+    self._segment.tokens[:] = tokens
+    self._segment.latest[:] = np.zeros(1, dtype=TICK_DTYPE)
+    self._segment.latest["token"] = tokens
+    self._segment.ring["seq"] = 0
+    self._head = 0
+    # Written last, subscribers check the magic before trusting the layout.
+    self._segment.header[:] = (_MAGIC, _VERSION, len(tokens), ring_size, 0,
+                               os.getpid())
+    INFO("Publishing ticks of %s tokens to shared memory %s (%s bytes)",
+         len(tokens), name, size)
+
+  def publish(self, ticks):
+    """Publish a batch of ticks, e.g. as a StreamingSession tick handler.
+
+    Args:
+      ticks(list): Tick dicts of KiteTicker or Ticks of CompactTicker.
+    """
+    recv_ns = time.time_ns()
+    slots = self._slots
+    records = []
+    for tick in ticks:
+      row = tick_to_row(tick)
+      slot = slots.get(row[0])
+      if slot is not None:
+        records.append(_to_record(row, recv_ns))
+    if not records:
+      return
+    batch = np.array(records, dtype=TICK_DTYPE)
+    self._write_ring(batch)
+    self._write_latest(batch)
+
+  def close(self, unlink=True):
+    """Close the segment.
+
+    Args:
+      unlink(bool): Whether to remove the segment, subscribers keep their
+                    mapping till they close.
+                    Default: True
+    """
+    if self._segment is None:
+      return
+    shm = self._segment.shm
+    self._segment.release()
+    self._segment = None
+    shm.close()
+    if unlink:
+      shm.unlink()
+    INFO("Closed shared memory tick segment %s", self.name)
+
+  def _write_ring(self, batch):
+    """Append tick events to the ring buffer, oldest events are overwritten.
+
+    Args:
+      batch(ndarray): TICK_DTYPE records.
+    """
+    ring = self._segment.ring
+    size = len(ring)
+    # Events which don't fit are overwritten by the same batch.
+    skipped = max(len(batch) - size, 0)
+    batch = batch[skipped:]
+    first = self._head + skipped + 1
+    events = np.arange(first, first + len(batch), dtype=np.uint64)
+    index = (events - 1) % size
+    # Invalidate the records before overwriting them, then stamp them with
+    # their event numbers once complete.
+    ring["seq"][index] = 0
+    batch["seq"] = 0
+    ring[index] = batch
+    ring["seq"][index] = events
+    self._head = int(events[-1])
+    self._segment.header[_HEAD] = self._head
+
+  def _write_latest(self, batch):
+    """Update the latest tick of every token under its seqlock.
+
+    Args:
+      batch(ndarray): TICK_DTYPE records, later records of a token win.
+    """
+    # Last record of every token in the batch.
+    tokens = batch["token"]
+    _, last = np.unique(tokens[::-1], return_index=True)
+    batch = batch[len(batch) - 1 - last]
+    slots = np.fromiter((self._slots[token] for token in batch["token"]),
+                        dtype=np.int64, count=len(batch))
+
+    latest = self._segment.latest
+    seq = latest["seq"][slots]
+    latest["seq"][slots] = seq + 1
+    batch["seq"] = seq + 1
+    latest[slots] = batch
+    latest["seq"][slots] = seq + 2
+
+class TickSubscriber(object):
+  """Reader of the ticks published to shared memory, any number of them can
+  read concurrently.
+  """
+  def __init__(self, name=SHM_NAME, from_start=False,
+               read_retries=SHM_READ_RETRIES):
+    """Initialize TickSubscriber object, mapping the segment.
+
+    Args:
+      name(str): Name of the shared-memory segment.
+                 Default: SHM_NAME
+      from_start(bool): Whether poll() starts from the oldest event in the
+                        ring buffer instead of the next one.
+                        Default: False
+      read_retries(int): Attempts to read a tick being written before
+                         latest() and price() raise an exception.
+                         Default: SHM_READ_RETRIES
+    """
+    shm = _attach(name)
+    header = np.ndarray(len(_HEADER), dtype=np.int64, buffer=shm.buf)
+    if header[0] != _MAGIC or header[1] != _VERSION:
+      del header
+      shm.close()
+      raise Exception(f"Shared memory {name} is not a tick segment")
+    slots, ring_size = int(header[2]), int(header[3])
+    del header
+    self.name = name
+    self._segment = _TickSegment(shm, slots, ring_size)
+    self.tokens = self._segment.tokens.tolist()
+    self._slots = {token: slot for slot, token in enumerate(self.tokens)}
+    head = int(self._segment.header[_HEAD])
+    self._cursor = max(head - ring_size, 0) if from_start else head
+    self._read_retries = read_retries
+    self.lost = 0
+
+  def latest(self, token):
+    """Get the latest tick of a token.
+
+    Args:
+      token(int): instrument token.
+
+    Returns:
+      (np.void): TICK_DTYPE record copy, seq is 0 if no tick arrived yet.
+
+    """
+    start = self._slots[token] * TICK_DTYPE.itemsize
+    seq_word = start // 8 + _SEQ_WORD
+    words = self._segment.latest_words
+    data = self._segment.latest_bytes
+    for _ in range(self._read_retries):
+      seq = words[seq_word]
+      if not seq & 1:
+        record = bytes(data[start:start + TICK_DTYPE.itemsize])
+        if words[seq_word] == seq:
+          return np.frombuffer(record, dtype=TICK_DTYPE)[0]
+      # Let the publisher finish the write.
+      time.sleep(0)
+    raise Exception(f"Tick of {token} in shared memory {self.name} is still "
+                    f"being written after {self._read_retries} reads")
+
+  def price(self, token):
+    """Get the latest price of a token, the fastest read.
+
+    Args:
+      token(int): instrument token.
+
+    Returns:
+      (float): Last traded price, 0.0 if no tick arrived yet.
+
+    """
+    word = self._slots[token] * _WORDS
+    words = self._segment.latest_words
+    floats = self._segment.latest_floats
+    for _ in range(self._read_retries):
+      seq = words[word + _SEQ_WORD]
+      if not seq & 1:
+        price = floats[word + _PRICE_WORD]
+        if words[word + _SEQ_WORD] == seq:
+          return price
+      time.sleep(0)
+    raise Exception(f"Price of {token} in shared memory {self.name} is still "
+                    f"being written after {self._read_retries} reads")
+
+  def snapshot(self):
+    """Get the latest tick of every token.
+
+    Returns:
+      (ndarray): TICK_DTYPE records, one per token in tokens order.
+
+    """
+    latest = self._segment.latest
+    records = latest.copy()
+    # Retry the slots which were being written while copied.
+    torn = np.flatnonzero((records["seq"] & 1).astype(bool) |
+                          (records["seq"] != latest["seq"]))
+    for slot in torn:
+      records[slot] = self.latest(self.tokens[slot])
+    return records
+
+  def poll(self, max_events=None):
+    """Get the tick events published since the last poll, without waiting.
+
+    Args:
+      max_events(int): Maximum events returned.
+                       Default: None (all new events)
+
+    Returns:
+      (ndarray): TICK_DTYPE records in publish order, seq is the event number.
+                 Events overwritten before being read are counted in lost.
+
+    """
+    ring = self._segment.ring
+    size = len(ring)
+    head = int(self._segment.header[_HEAD])
+    if head - self._cursor > size:
+      self.lost += head - self._cursor - size
+      self._cursor = head - size
+    end = head if max_events is None else min(head, self._cursor + max_events)
+    if end <= self._cursor:
+      return ring[:0].copy()
+
+    events = np.arange(self._cursor + 1, end + 1, dtype=np.uint64)
+    index = (events - 1) % size
+    records = ring[index]
+    # Records overwritten or being written during the copy have another seq,
+    # before or after it.
+    valid = (records["seq"] == events) & (ring["seq"][index] == events)
+    if not valid.all():
+      self.lost += int((~valid).sum())
+      records = records[valid]
+    self._cursor = end
+    return records
+
+  def wait(self, timeout=None, max_events=None, interval=0.0001):
+    """Wait for tick events published since the last poll.
+
+    Args:
+      timeout(float): Maximum seconds to wait.
+                      Default: None (no limit)
+      max_events(int): Maximum events returned.
+                       Default: None (all new events)
+      interval(float): Seconds to sleep between polls.
+                       Default: 0.0001
+
+    Returns:
+      (ndarray): TICK_DTYPE records, empty on timeout.
+
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+      records = self.poll(max_events)
+      if len(records) or (deadline is not None and
+                          time.monotonic() >= deadline):
+        return records
+      time.sleep(interval)
+
+  def close(self):
+    """Unmap the segment.
+    """
+    if self._segment is None:
+      return
+    shm = self._segment.shm
+    self._segment.release()
+    self._segment = None
+    shm.close()
+
+def _unlink_stale(name):
+  """Remove a segment left behind by a publisher which is no longer running.
+
+  Args:
+    name(str): Name of the shared-memory segment.
+  """
+  stale = shared_memory.SharedMemory(name)
+  header = np.ndarray(len(_HEADER), dtype=np.int64, buffer=stale.buf)
+  magic, pid = int(header[0]), int(header[_PID])
+  del header
+  stale.close()
+  # The header is written last, a zero magic is a publisher which died while
+  # creating the segment.
+  if magic not in (0, _MAGIC):
+    raise Exception(f"Shared memory {name} exists and is not a tick segment")
+  if magic == _MAGIC and _is_running(pid):
+    raise Exception(f"Shared memory {name} is in use by publisher process "
+                    f"{pid}")
+  INFO("Removing shared memory %s of stopped publisher process %s", name, pid)
+  stale.unlink()
+
+def _is_running(pid):
+  """Check whether a process is running.
+
+  Args:
+    pid(int): Process id.
+
+  Returns:
+    (bool): True if the process exists.
+
+  """
+  if os.name == "nt":
+    # Windows removes a segment with its last handle, so it is still in use,
+    # and os.kill would terminate the process.
+    return True
+  try:
+    os.kill(pid, 0)
+  except ProcessLookupError:
+    return False
+  except PermissionError:
+    # Running as another user.
+    return True
+  return True
+
+def _attach(name):
+  """Map an existing segment without handing it to the resource tracker,
+  which would remove it when the subscriber exits.
+
+  Args:
+    name(str): Name of the shared-memory segment.
+
+  Returns:
+    (SharedMemory): Mapped segment.
+
+  """
+  try:
+    return shared_memory.SharedMemory(name, track=False)
+  except TypeError:
+    # Python < 3.13 always tracks the segment.
+    from multiprocessing import resource_tracker
+    shm = shared_memory.SharedMemory(name)
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+def _to_record(row, recv_ns):
+  """Convert a tick store row to a TICK_DTYPE record.
+
+  Args:
+    row(tuple): Row values in TICK_COLUMNS order, seq excluded.
+    recv_ns(int): Publish time in epoch nanoseconds.
+
+  Returns:
+    (tuple): Record values in TICK_DTYPE order.
+
+  """
+  ts = row[1]
+  # None of missing fields is stored as NaN.
+  return (0, row[0], int(ts.timestamp() * 1000000) if ts is not None else 0,
+          recv_ns, row[2], row[5], row[3], row[12], row[16], row[17],
+          row[18], row[19], row[8], row[9], row[10], row[11])
@@ -1,131 +1,280 @@
 """This modules contains web socket streaming methods to get live market quotes.
 
+Importing this module has no side effects, the instrument tokens are resolved,
+the tick store is opened and the ticker connects only when a StreamingSession
+is started.
+
 Date Created: 20-Sept-2020
 Author: Nikunj Soni (nks141197@gmail.com)
 """
 
 import datetime
 import os
-import sqlite3
 
 from kiteconnect import KiteTicker
 
-from config.streaming_config import tickers
+from config.streaming_config import (tickers, TICK_QUEUE_SIZE,
+                                     TICK_FLUSH_BATCH_SIZE,
+                                     TICK_FLUSH_INTERVAL, TICK_STORE_BACKEND,
+                                     COLUMNAR_SEGMENT_SIZE, STREAM_PRE_OPEN,
+                                     COMPACT_TICKS, TICKER_SHARDS,
+                                     TICKER_PROCESSES, SHM_FANOUT,
+                                     GAP_BACKFILL)
 from framework.common.generic import get_instrument_tokens
+from framework.common.market_calendar import TradingCalendar
 from framework.connection.credentials import CREDENTIALS
+from framework.logging.logger import ERROR, INFO
+from framework.streaming.columnar_store import ColumnarTickStore
+from framework.streaming.compact_ticks import CompactTicker
+from framework.streaming.gap_recovery import GapRecovery
+from framework.streaming.scheduler import SessionScheduler
+from framework.streaming.shm_fanout import TickPublisher
+from framework.streaming.sharded_ticker import (ShardedTicker,
+                                                estimate_tick_rates)
+from framework.streaming.tick_store import SqliteTickStore
+from framework.streaming.tick_writer import TickWriter
 
-# Get the instrument tokens for tickes and store it.
-tokens = get_instrument_tokens(tickers)
+class StreamingSession(object):
+  """Lazily initialized web socket streaming session which stores the live
+  market quotes of tickers.
+  """
+  def __init__(self, kite, symbols=tickers, exchange="NSE", db_file=None,
+               backend=TICK_STORE_BACKEND, compact=COMPACT_TICKS,
+               shards=TICKER_SHARDS, processes=TICKER_PROCESSES,
+               fanout=SHM_FANOUT, backfill=GAP_BACKFILL):
+    """Initialize StreamingSession object. Nothing is resolved, opened or
+    connected till setup()/start() is called.
 
-def on_ticks(ws, ticks):
-  """Callback to receive ticks.
+    Args:
+      kite(obj): KiteConnect object.
+      symbols(list): Symbols to stream.
+                     Default: tickers from config/streaming_config.py
+      exchange(str): Market Exchange of the symbols.
+                     Default: "NSE"
+      db_file(str): Path where database will be created and streaming data
+                    will be stored. For "columnar" backend it's the root
+                    directory of the segment files.
+                    Default: None ($AUTOKITE_PATH/db/ticks[.db])
+      backend(str): Tick storage backend("sqlite", "columnar").
+                    Default: TICK_STORE_BACKEND
+      compact(bool): Whether ticks are decoded into Tick objects instead of
+                     dicts, tick handlers then receive lists of Tick.
+                     Default: COMPACT_TICKS
+      shards(int): Number of ticker connections the tokens are partitioned
+                   across, balanced by their tick rate in the sqlite store.
+                   Default: TICKER_SHARDS
+      processes(bool): Whether every connection runs in its own worker
+                       process.
+                       Default: TICKER_PROCESSES
+      fanout(bool): Whether the ticks are published to shared memory for
+                    local strategy processes(TickSubscriber).
+                    Default: SHM_FANOUT
+      backfill(bool): Whether the gaps of a single ticker connection are
+                      recorded and backfilled on reconnect(GapRecovery).
+                      Default: GAP_BACKFILL
+    """
+    self.kite = kite
+    self.symbols = symbols
+    self.exchange = exchange
+    self.db_file = db_file
+    self.backend = backend
+    self.compact = compact
+    self.shards = shards
+    self.processes = processes
+    self.fanout = fanout
+    self.publisher = None
+    self.backfill = backfill
+    self.recovery = None
+    self.tokens = None
+    self.writer = None
+    self.kws = None
+    self._scheduler = None
+    self._tick_handlers = []
 
-  Args:
-    ws(WebSocket): Websocket object used for streaming.
-    ticks(json): Quotes data.
+  def add_tick_handler(self, handler):
+    """Call a function with every batch of ticks, e.g. to update live
+    aggregates. Handlers run on the ticker thread, so they must be quick.
 
-  """
-  # Insert the ticks in DB.
-  _insert_ticks(ticks)
+    Args:
+      handler(callable): Called with the list of ticks.
+    """
+    self._tick_handlers.append(handler)
 
-def on_connect(ws, response):
-  """Callback when successful connection is established.
+  def setup(self):
+    """Resolve the instrument tokens, start the tick writer and create the
+    shared-memory tick segment.
+    """
+    if self.writer is not None:
+      return
 
-  Args:
-    ws(WebSocket): Websocket object used for streaming.
-    response(json): Response obtained for connection.
+    # Get the instrument tokens for tickers and store it.
+    self.tokens = get_instrument_tokens(self.kite, self.symbols, self.exchange)
 
-  """
-  # Subscribe to a list of instrument_tokens.
-  ws.subscribe(tokens)
-  ws.set_mode(ws.MODE_FULL, tokens)
+    self.db_file = self.db_file or _default_db_file(self.backend)
+    if self.backend == "columnar":
+      store = ColumnarTickStore(self.db_file,
+                                segment_size=COLUMNAR_SEGMENT_SIZE)
+    else:
+      store = SqliteTickStore(self.db_file)
 
-def setup_streaming(db_file):
-  """Setup for web socket streaming.
+    # Start the background writer which stores the ticks in batches.
+    self.writer = TickWriter(store, max_queue=TICK_QUEUE_SIZE,
+                             batch_size=TICK_FLUSH_BATCH_SIZE,
+                             flush_interval=TICK_FLUSH_INTERVAL)
+    self.writer.start()
 
-  Args:
-    db_file(str): Path where database will be created and streaming data
-                  will be stored.
+    if self.fanout and self.publisher is None:
+      self.publisher = TickPublisher(self.tokens.values())
+      self.add_tick_handler(self.publisher.publish)
 
-  """
-  # Create database directory and file.
-  if not db_file:
+  def start(self):
+    """ Start getting the live market quotes and storing it in db.
+
+    Sleeps till the next trading session opens, streams till it closes and
+    then flushes and closes the tick store.
+    """
+    self.setup()
+
+    # Create KiteTicker object and initialize the callbacks.
+    if self.shards > 1 or self.processes:
+      # The shards subscribe their own tokens on connect.
+      self.kws = ShardedTicker(CREDENTIALS['api_key'], self.kite.access_token,
+                               self.tokens.values(), shards=self.shards,
+                               rates=self._tick_rates(),
+                               processes=self.processes, compact=self.compact)
+    else:
+      ticker = CompactTicker if self.compact else KiteTicker
+      self.kws = ticker(CREDENTIALS['api_key'], self.kite.access_token)
+      self.kws.on_connect = self.on_connect
+      if self.backfill and self.recovery is None:
+        self.recovery = GapRecovery(self.kite, self.tokens.values())
+        self.add_tick_handler(self.recovery.on_ticks)
+      if self.recovery is not None:
+        self.recovery.attach(self.kws)
+    self.kws.on_ticks = self.on_ticks
+
+    # Stream only during market hours.
+    self._scheduler = SessionScheduler(TradingCalendar.from_config(),
+                                       self._on_open, self._on_close,
+                                       pre_open=STREAM_PRE_OPEN)
     try:
-      db_dir = os.path.join(os.environ.get('AUTOKITE_PATH'), 'db')
-    except Exception:
-      raise Exception("AUTOKITE_PATH environment variable is not defined")
+      self._scheduler.run_session()
+    finally:
+      # Flush the pending ticks and close the db after market closes and exit.
+      self.kws.stop()
+      self.writer.stop()
+      self.writer = None
+      if self.publisher is not None:
+        self._tick_handlers.remove(self.publisher.publish)
+        self.publisher.close()
+        self.publisher = None
+      if self.recovery is not None:
+        self._tick_handlers.remove(self.recovery.on_ticks)
+        self.recovery = None
 
-    if not os.path.exists(db_dir):
-      os.makedirs(db_dir)
-    db_file = os.path.join(db_dir, "ticks.db")
-    os.environ['AUTOKITE_DB_DIR'] = db_dir
-    os.environ['AUTOKITE_DB_FILE'] = db_file
+  def stop(self):
+    """Stop streaming before the session closes.
+    """
+    if self._scheduler is not None:
+      self._scheduler.stop()
 
-  # Connect to the database.
-  global db
-  db = sqlite3.connect(db_file)
-  _create_tables()
+  def on_ticks(self, ws, ticks):
+    """Callback to receive ticks.
 
-def start_streaming(kite):
-  """ Start getting the live market quotes and storing it in db.
+    Args:
+      ws(WebSocket): Websocket object used for streaming.
+      ticks(json): Quotes data.
 
-  Args:
-    kite(obj): KiteConnect object.
+    """
+    # Only enqueue the ticks, the tick writer stores them in DB.
+    self.writer.put(ticks)
+    for handler in self._tick_handlers:
+      try:
+        handler(ticks)
+      except Exception as ex:
+        ERROR("Error in tick handler %s: %s", handler, ex)
 
-  """
-  # Create KiteTicker object and initialize the callbacks.
-  kws = KiteTicker(CREDENTIALS['api_key'], kite.access_token)
-
-  # Start streaming only during market hours.
-  while True:
-    now = datetime.datetime.now()
-    if (now.hour >= 9 and now.minute >= 15):
-      kws.on_ticks = on_ticks
-      kws.on_connect = on_connect
-      kws.connect()
-    if (now.hour >= 15 and now.minute >= 30):
-      kws.stop()
-      break
-
-  # Close the db after market closes and exit.
-  db.close()
-
-def _create_tables():
-  """Create a table for each token.
-  """
-  cur = db.cursor()
+  def on_connect(self, ws, response):
+    """Callback when successful connection is established.
 
-  # Make (timestamp, ltp, volume) as columns of table.
-  for token in tokens:
-    cmd = f"CREATE TABLE IF NOT EXISTS TOKEN{token} (ts datetime primary key," \
-          f" price real(15,5), volume integer)"
-    cur.execute(cmd)
+    Args:
+      ws(WebSocket): Websocket object used for streaming.
+      response(json): Response obtained for connection.
 
-  try:
-    db.commit()
-  except:
-    db.rollback()
+    """
+    # Subscribe to a list of instrument_tokens.
+    tokens = list(self.tokens.values())
+    ws.subscribe(tokens)
+    ws.set_mode(ws.MODE_FULL, tokens)
+    INFO("Subscribed to %s instruments", len(tokens))
 
-def _insert_ticks(ticks):
-  """Insert the ticks for token into the db tables.
+  def _tick_rates(self):
+    """Estimate the tick rate of the tokens over the last week.
+
+    Returns:
+      (dict): Ticks per second by token, None if not stored in sqlite.
+
+    """
+    if self.backend != "sqlite" or not os.path.exists(self.db_file):
+      return None
+    since = datetime.datetime.now() - datetime.timedelta(days=7)
+    return estimate_tick_rates(self.db_file, start=since)
+
+  def _on_open(self, session):
+    """Connect the ticker when the session opens.
+
+    Args:
+      session(Session): Trading session timings.
+
+    """
+    # The ticker runs in its own thread till the session closes.
+    self.kws.connect(threaded=True)
+
+  def _on_close(self, session):
+    """Close the ticker connection when the session closes.
+
+    Args:
+      session(Session): Trading session timings.
+
+    """
+    # The session closing isn't an outage.
+    if self.recovery is not None:
+      self.recovery.detach()
+    self.kws.close()
+
+def start_streaming(kite, db_file=None):
+  """ Start getting the live market quotes of configured tickers and storing it
+  in db.
 
   Args:
-    ticks(list): list of json which has quotes for token.
+    kite(obj): KiteConnect object.
+    db_file(str): Path where database will be created and streaming data
+                  will be stored.
+                  Default: None ($AUTOKITE_PATH/db/ticks[.db])
 
   """
-  cur = db.cursor()
+  StreamingSession(kite, db_file=db_file).start()
 
-  # For each tick insert the data as a row in db.
-  for tick in ticks:
-    try:
-      tok = "TOKEN" + str(tick['instrument_token'])
-      vals = [tick['timestamp'], tick['last_price'], tick['volume']]
-      query = f"INSERT INTO {tok}(ts,price,volume) VALUES (?,?,?)"
-      cur.execute(query, vals)
-    except:
-      pass # If timestamp remains the same and an exception is raised, ignore it.
+def _default_db_file(backend):
+  """Get the default database path under $AUTOKITE_PATH, creating the
+  directory if required.
 
+  Args:
+    backend(str): Tick storage backend("sqlite", "columnar").
+
+  Returns:
+    (str): Database path.
+
+  """
   try:
-    db.commit()
-  except:
-    db.rollback()
+    db_dir = os.path.join(os.environ.get('AUTOKITE_PATH'), 'db')
+  except Exception:
+    raise Exception("AUTOKITE_PATH environment variable is not defined")
+
+  if not os.path.exists(db_dir):
+    os.makedirs(db_dir)
+  db_file = os.path.join(db_dir, "ticks" if backend == "columnar"
+                                 else "ticks.db")
+  os.environ['AUTOKITE_DB_DIR'] = db_dir
+  os.environ['AUTOKITE_DB_FILE'] = db_file
+  return db_file
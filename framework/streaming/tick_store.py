@@ -0,0 +1,273 @@
+"""This modules contains the sqlite storage schema for streamed ticks.
+
+All instruments are stored in a single `ticks` table clustered on
+(token, ts, seq), so bulk inserts and cross-instrument range queries are single
+statements and ticks sharing the same second are kept apart by `seq`.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import datetime
+import sqlite3
+
+import pandas as pd
+
+from framework.logging.logger import INFO
+
+# Columns of the ticks table in storage order.
+TICK_COLUMNS = ["token", "ts", "seq", "price", "last_qty", "avg_price",
+                "volume", "buy_qty", "sell_qty", "open", "high", "low",
+                "close", "oi", "oi_day_high", "oi_day_low", "last_trade_time",
+                "bid_price", "bid_qty", "ask_price", "ask_qty",
+                "depth_bid_qty", "depth_ask_qty"]
+
+# WITHOUT ROWID makes the (token, ts, seq) primary key the table itself, i.e.
+# every column is covered by the (token, ts) range scan.
+TICKS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ticks (
+  token integer NOT NULL,
+  ts datetime NOT NULL,
+  seq integer NOT NULL,
+  price real,
+  last_qty integer,
+  avg_price real,
+  volume integer,
+  buy_qty integer,
+  sell_qty integer,
+  open real,
+  high real,
+  low real,
+  close real,
+  oi integer,
+  oi_day_high integer,
+  oi_day_low integer,
+  last_trade_time datetime,
+  bid_price real,
+  bid_qty integer,
+  ask_price real,
+  ask_qty integer,
+  depth_bid_qty integer,
+  depth_ask_qty integer,
+  PRIMARY KEY (token, ts, seq)
+) WITHOUT ROWID
+"""
+
+# Index of last_trade_time in rows returned by tick_to_row().
+LAST_TRADE_TIME = TICK_COLUMNS.index("last_trade_time") - 1
+
+INSERT_TICK = (f"INSERT OR IGNORE INTO ticks({','.join(TICK_COLUMNS)}) "
+               f"VALUES ({','.join('?' * len(TICK_COLUMNS))})")
+
+def create_schema(db):
+  """Create the ticks table if it doesn't exist.
+
+  Args:
+    db(obj): sqlite3 connection.
+
+  """
+  db.execute(TICKS_SCHEMA)
+  db.commit()
+
+def tick_to_row(tick):
+  """Convert a KiteTicker tick to a ticks table row without the seq column.
+
+  Args:
+    tick(dict): Quote data of a token in any streaming mode, or a Tick.
+
+  Returns:
+    (tuple): Row values in TICK_COLUMNS order, seq excluded.
+
+  """
+  if not isinstance(tick, dict):
+    # Tick of a CompactTicker already holds the row.
+    return tick.to_row()
+  ts = tick.get('exchange_timestamp') or tick.get('timestamp')
+  ohlc = tick.get('ohlc', {})
+  depth = tick.get('depth')
+  bid_price = bid_qty = ask_price = ask_qty = None
+  depth_bid_qty = depth_ask_qty = None
+  if depth:
+    buy, sell = depth['buy'], depth['sell']
+    if buy:
+      bid_price, bid_qty = buy[0]['price'], buy[0]['quantity']
+      depth_bid_qty = sum(level['quantity'] for level in buy)
+    if sell:
+      ask_price, ask_qty = sell[0]['price'], sell[0]['quantity']
+      depth_ask_qty = sum(level['quantity'] for level in sell)
+
+  return (tick['instrument_token'], ts, tick['last_price'],
+          tick.get('last_traded_quantity', tick.get('last_quantity')),
+          tick.get('average_traded_price', tick.get('average_price')),
+          tick.get('volume_traded', tick.get('volume')),
+          tick.get('total_buy_quantity', tick.get('buy_quantity')),
+          tick.get('total_sell_quantity', tick.get('sell_quantity')),
+          ohlc.get('open'), ohlc.get('high'), ohlc.get('low'),
+          ohlc.get('close'), tick.get('oi'), tick.get('oi_day_high'),
+          tick.get('oi_day_low'), tick.get('last_trade_time'),
+          bid_price, bid_qty, ask_price, ask_qty, depth_bid_qty,
+          depth_ask_qty)
+
+def read_ticks(db_file, tokens=None, start=None, end=None, columns=None):
+  """Read stored ticks of given tokens between start and end.
+
+  Args:
+    db_file(str): Path of the sqlite tick database.
+    tokens(list): instrument tokens to read.
+                  Default: None (all tokens)
+    start(datetime): Inclusive start time.
+                     Default: None (from the first tick)
+    end(datetime): Exclusive end time.
+                   Default: None (till the last tick)
+    columns(list): Columns to read, token and ts are always included.
+                   Default: None (all columns)
+
+  Returns:
+    (DataFrame): Ticks ordered by (token, ts, seq).
+
+  """
+  columns = [c for c in (columns or TICK_COLUMNS) if c not in ("token", "ts")]
+  query = f"SELECT {','.join(['token', 'ts'] + columns)} FROM ticks"
+  conditions, params = [], []
+  if tokens:
+    conditions.append(f"token IN ({','.join('?' * len(tokens))})")
+    params.extend(int(token) for token in tokens)
+  if start is not None:
+    conditions.append("ts >= ?")
+    params.append(_to_text(start))
+  if end is not None:
+    conditions.append("ts < ?")
+    params.append(_to_text(end))
+  if conditions:
+    query += " WHERE " + " AND ".join(conditions)
+  query += " ORDER BY token, ts, seq"
+
+  db = sqlite3.connect(db_file)
+  try:
+    data = pd.read_sql_query(query, db, params=params)
+  finally:
+    db.close()
+  data["ts"] = pd.to_datetime(data["ts"])
+  return data
+
+class SqliteTickStore(object):
+  """Tick store which writes ticks into the normalized sqlite ticks table.
+
+  A tick identical to the last stored tick of its token, e.g. the quote sent
+  again after a reconnect, is a duplicate delivery and isn't stored.
+
+  The store is opened and written from the tick writer thread only.
+  """
+  def __init__(self, db_file):
+    """Initialize SqliteTickStore object.
+
+    Args:
+      db_file(str): Path of the sqlite database to write the ticks to.
+    """
+    self.db_file = db_file
+    self._db = None
+    # Last row stored of every token seen, read from db on first sight.
+    self._last_rows = {}
+    # Last seq of ticks of a batch older than the last row of their token.
+    self._late_seq = {}
+    self.duplicates = 0
+
+  def open(self):
+    """Open the db in WAL mode and create the schema.
+    """
+    self._db = sqlite3.connect(self.db_file)
+    self._db.execute("PRAGMA journal_mode=WAL")
+    self._db.execute("PRAGMA synchronous=NORMAL")
+    create_schema(self._db)
+    INFO("Opened sqlite tick store:%s", self.db_file)
+
+  def write(self, ticks):
+    """Write ticks in a single transaction.
+
+    Args:
+      ticks(list): list of json which has quotes for token.
+
+    Returns:
+      (int): Number of ticks stored, duplicates are counted in duplicates.
+
+    """
+    received_at = datetime.datetime.now()
+    rows = []
+    for tick in ticks:
+      row = self._with_seq(tick_to_row(tick), received_at)
+      if row is None:
+        self.duplicates += 1
+      else:
+        rows.append(row)
+    changes = self._db.total_changes
+    try:
+      with self._db:
+        self._db.executemany(INSERT_TICK, rows)
+    finally:
+      # The rows are in db now, later ticks look their seq up there.
+      self._late_seq.clear()
+    return self._db.total_changes - changes
+
+  def close(self):
+    """Close the db.
+    """
+    if self._db is not None:
+      self._db.close()
+      self._db = None
+
+  def _with_seq(self, row, received_at):
+    """Insert the seq column in a row.
+
+    The seq numbers ticks of a token sharing the same timestamp, continuing
+    after the ticks already stored, e.g. by an earlier run. Timestamps are
+    converted to the text format stored in db.
+
+    Args:
+      row(tuple): Row values in TICK_COLUMNS order, seq excluded.
+      received_at(datetime): Time used for ticks without a timestamp.
+
+    Returns:
+      (tuple): Row values in TICK_COLUMNS order, None for a duplicate.
+
+    """
+    token, ts = row[0], _to_text(row[1] or received_at)
+    values = (row[2:LAST_TRADE_TIME] + (_to_text(row[LAST_TRADE_TIME]),) +
+              row[LAST_TRADE_TIME + 1:])
+    last = self._last_rows.get(token)
+    if last is None:
+      last = self._db.execute(f"SELECT {','.join(TICK_COLUMNS)} FROM ticks "
+                              "WHERE token=? ORDER BY ts DESC, seq DESC "
+                              "LIMIT 1", (token,)).fetchone()
+    if last is None or ts > last[1]:
+      seq = 0
+    elif ts == last[1]:
+      if values == last[3:]:
+        return None
+      seq = last[2] + 1
+    else:
+      # A late tick, numbered after the ticks of its timestamp.
+      key = (token, ts)
+      seq = self._late_seq.get(key)
+      if seq is None:
+        seq = self._db.execute("SELECT MAX(seq) FROM ticks WHERE token=? AND "
+                               "ts=?", key).fetchone()[0]
+        seq = -1 if seq is None else seq
+      seq = self._late_seq[key] = seq + 1
+      self._last_rows[token] = last
+      return (token, ts, seq) + values
+    self._last_rows[token] = (token, ts, seq) + values
+    return self._last_rows[token]
+
+def _to_text(ts):
+  """Convert a timestamp to the text format stored in db.
+
+  Args:
+    ts(datetime): Timestamp.
+
+  Returns:
+    (str): Timestamp in format (yyyy-mm-dd hh:mm:ss[.ffffff]) or None.
+
+  """
+  if ts is None or isinstance(ts, str):
+    return ts
+  return ts.isoformat(" ")
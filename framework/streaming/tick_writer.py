@@ -0,0 +1,229 @@
+"""This modules contains a buffered, batched writer for storing streamed ticks.
+
+The websocket callback only enqueues ticks into a bounded in-memory buffer. A
+background thread drains the buffer and writes it to the tick store in batches,
+one transaction per flush, so the socket reader never blocks on disk.
+
+Date Created: 17-Oct-2026
+Author: Nikunj Soni (nks141197@gmail.com)
+"""
+
+import copy
+import datetime
+import queue
+import threading
+import time
+
+from framework.logging.logger import ERROR, INFO, WARN
+
+class TickWriter(object):
+  """Background writer which flushes queued ticks to a tick store in batches.
+
+  The store must provide open(), write(ticks) and close(), all of which are
+  called from the writer thread only. write() may return the number of ticks
+  stored, the rest are counted as dropped unless the store counts them in its
+  duplicates.
+  """
+  def __init__(self, store, max_queue=100000, batch_size=5000,
+               flush_interval=1.0):
+    """Initialize TickWriter object.
+
+    Args:
+      store(obj): Tick store to write the ticks to (SqliteTickStore).
+      max_queue(int): Maximum number of ticks buffered in memory. Ticks
+                      arriving when the buffer is full are dropped.
+                      Default: 100000
+      batch_size(int): Number of buffered ticks which triggers a flush.
+                       Default: 5000
+      flush_interval(float): Maximum seconds between two flushes.
+                             Default: 1.0
+    """
+    self.store = store
+    self.batch_size = batch_size
+    self.flush_interval = flush_interval
+    self._queue = queue.Queue(maxsize=max_queue)
+    self._stop_event = threading.Event()
+    self._thread = None
+
+    # Counters exposed through stats().
+    self._enqueued = 0
+    self._dropped = 0
+    self._written = 0
+    self._duplicates = 0
+    self._flushes = 0
+    self._last_flush_ms = 0.0
+    self._max_flush_ms = 0.0
+
+  def start(self):
+    """Start the background writer thread.
+    """
+    if self._thread is not None and self._thread.is_alive():
+      return
+    self._stop_event.clear()
+    self._thread = threading.Thread(target=self._run, name="TickWriter",
+                                    daemon=True)
+    self._thread.start()
+    INFO("Tick writer started for store:%s", type(self.store).__name__)
+
+  def put(self, ticks):
+    """Enqueue ticks for writing. Never blocks the caller.
+
+    Args:
+      ticks(list): list of json which has quotes for token.
+
+    Returns:
+      (int): Number of ticks accepted into the buffer.
+
+    """
+    accepted = 0
+    received_at = None
+    for tick in ticks:
+      if _timestamp(tick) is None:
+        # Ticks of ltp mode have no timestamp, they're stored at receipt.
+        received_at = received_at or datetime.datetime.now()
+        tick = _with_timestamp(tick, received_at)
+      try:
+        self._queue.put_nowait(tick)
+        accepted += 1
+      except queue.Full:
+        self._dropped += 1
+    self._enqueued += accepted
+    return accepted
+
+  def stop(self, timeout=None):
+    """Stop the writer thread after flushing the buffered ticks.
+
+    Args:
+      timeout(float): Seconds to wait for the final flush.
+                      Default: None (wait till done)
+    """
+    if self._thread is None:
+      return
+    self._stop_event.set()
+    self._thread.join(timeout)
+    self._thread = None
+    INFO("Tick writer stopped: %s", self.stats())
+
+  def stats(self):
+    """Get the writer counters.
+
+    Returns:
+      (dict): queue_depth, enqueued, dropped, written, duplicates,
+              flushes, last_flush_ms and max_flush_ms.
+
+    """
+    return {
+      "queue_depth": self._queue.qsize(),
+      "enqueued": self._enqueued,
+      "dropped": self._dropped,
+      "written": self._written,
+      "duplicates": self._duplicates,
+      "flushes": self._flushes,
+      "last_flush_ms": self._last_flush_ms,
+      "max_flush_ms": self._max_flush_ms
+    }
+
+  def _run(self):
+    """Writer thread loop, flushes on batch size or flush interval.
+    """
+    # sqlite connections can't be shared across threads, so the store is
+    # opened in the writer thread.
+    self.store.open()
+
+    try:
+      while True:
+        batch = self._collect_batch()
+        if batch:
+          self._flush(batch)
+        elif self._stop_event.is_set():
+          break
+    finally:
+      self.store.close()
+
+  def _collect_batch(self):
+    """Collect ticks from the buffer till batch size or flush interval.
+
+    Returns:
+      (list): list of ticks.
+
+    """
+    batch = []
+    deadline = time.monotonic() + self.flush_interval
+    while len(batch) < self.batch_size:
+      remaining = deadline - time.monotonic()
+      if remaining <= 0:
+        break
+      try:
+        if self._stop_event.is_set():
+          batch.append(self._queue.get_nowait())
+        else:
+          batch.append(self._queue.get(timeout=remaining))
+      except queue.Empty:
+        break
+    return batch
+
+  def _flush(self, batch):
+    """Write a batch of ticks to the store.
+
+    Args:
+      batch(list): list of ticks.
+
+    """
+    start = time.perf_counter()
+    duplicates = getattr(self.store, "duplicates", 0)
+    try:
+      written = self.store.write(batch)
+    except Exception as ex:
+      ERROR("Error occurred while writing %s ticks: %s", len(batch), ex)
+      self._dropped += len(batch)
+      return
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    duplicates = getattr(self.store, "duplicates", 0) - duplicates
+    if written is None:
+      written = len(batch) - duplicates
+    elif written + duplicates < len(batch):
+      WARN("Tick store ignored %s of %s ticks",
+           len(batch) - written - duplicates, len(batch))
+    self._dropped += len(batch) - written - duplicates
+    self._duplicates += duplicates
+    self._written += written
+    self._flushes += 1
+    self._last_flush_ms = elapsed_ms
+    self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+    if elapsed_ms > self.flush_interval * 1000:
+      WARN("Slow tick flush of %s ticks took %.1fms, queue depth:%s",
+           len(batch), elapsed_ms, self._queue.qsize())
+
+def _timestamp(tick):
+  """Get the exchange timestamp of a tick.
+
+  Args:
+    tick(dict): Quote data of a token, or a Tick.
+
+  Returns:
+    (datetime): Timestamp, None if the tick has none.
+
+  """
+  if isinstance(tick, dict):
+    return tick.get('exchange_timestamp') or tick.get('timestamp')
+  return tick.ts
+
+def _with_timestamp(tick, ts):
+  """Copy a tick with a timestamp, the tick itself is shared with the other
+  tick handlers.
+
+  Args:
+    tick(dict): Quote data of a token, or a Tick.
+    ts(datetime): Timestamp.
+
+  Returns:
+    (dict): Copy of the tick, or a Tick.
+
+  """
+  tick = copy.copy(tick)
+  if isinstance(tick, dict):
+    tick['timestamp'] = ts
+  else:
+    tick.ts = ts
+  return tick